@@ -1,9 +1,10 @@
-from typing import Generator
-from fastapi import Depends, HTTPException, status
+from typing import Generator, Optional
+from fastapi import Depends, HTTPException, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER
 from app.database import SessionLocal
 from app.crud.user import get_user
 from app.models.models import User
@@ -12,12 +13,18 @@ from app.schemas.token import TokenPayload
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 def get_db() -> Generator:
+    # La sesión toma la conexión de escritura recién al escribir (ver app.database.RoutingSession)
     try:
         db = SessionLocal()
         yield db
     finally:
         db.close()
 
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    # Las listas paginadas por clave informan el cursor de la página siguiente en un encabezado
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
 def get_current_user(
     db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
 ) -> User:
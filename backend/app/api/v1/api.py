@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, users, projects, chat, transactions, applications, credit_requests
+from app.api.v1.endpoints import auth, users, projects, chat, transactions, applications, credit_requests, ml, system
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
@@ -9,4 +9,6 @@ api_router.include_router(projects.router, prefix="/projects", tags=["projects"]
 api_router.include_router(applications.router, prefix="/applications", tags=["applications"])
 api_router.include_router(credit_requests.router, prefix="/credit-requests", tags=["credit-requests"])
 api_router.include_router(chat.router, prefix="/chat", tags=["chat"])
-api_router.include_router(transactions.router, prefix="/transactions", tags=["transactions"])
\ No newline at end of file
+api_router.include_router(transactions.router, prefix="/transactions", tags=["transactions"])
+api_router.include_router(ml.router, prefix="/ml", tags=["ml"])
+api_router.include_router(system.router, prefix="/system", tags=["system"])
\ No newline at end of file
@@ -1,6 +1,6 @@
 # app/api/v1/endpoints/chat.py
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from app.api import deps
 from app.crud import chat
@@ -48,11 +48,13 @@ def get_project_messages(
     db: Session = Depends(deps.get_db),
     project_id: int,
     current_user: User = Depends(deps.get_current_user),
-    skip: int = 0,
+    response: Response,
+    skip: int = Query(0, deprecated=True, description="Deprecated: use cursor"),
     limit: int = 100,
+    cursor: Optional[str] = None,
 ) -> Any:
     """
-    Get messages for a specific project.
+    Get messages for a specific project. The next page's cursor is returned in the X-Next-Cursor header.
     """
     # Verificar acceso al proyecto
     project = db.query(Project).filter(Project.id == project_id).first()
@@ -62,7 +64,12 @@ def get_project_messages(
     if current_user.id not in [project.client_id, project.freelancer_id]:
         raise HTTPException(status_code=403, detail="Not authorized for this project")
     
-    messages = chat.get_project_messages(db=db, project_id=project_id, skip=skip, limit=limit)
+    try:
+        messages = chat.get_project_messages(db=db, project_id=project_id, skip=skip, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # Antes del commit de mark_messages_as_read, que expira los mensajes cargados
+    deps.set_next_cursor(response, chat.messages_keyset.next_cursor(messages, limit))
     
     # Marcar mensajes como leídos
     chat.mark_messages_as_read(db=db, project_id=project_id, user_id=current_user.id)
@@ -1,13 +1,13 @@
 # app/api/v1/endpoints/credit_requests.py
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from app.api import deps
 from app.crud.credit_request import (
     get_credit_requests_by_user, get_all_credit_requests, get_pending_credit_requests,
     create_credit_request, approve_credit_request, reject_credit_request,
-    delete_credit_request, get_credit_request
+    delete_credit_request, get_credit_request, credit_requests_keyset
 )
 from app.models.models import User
 from app.schemas.credit_request import CreditRequest, CreditRequestCreate, CreditRequestDetail
@@ -83,18 +83,25 @@ def delete_my_credit_request(
 
 @router.get("/admin/all", response_model=List[CreditRequestDetail])
 def get_all_credit_requests_admin(
+    response: Response,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
+    skip: int = Query(0, deprecated=True, description="Deprecated: use cursor"),
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
     """
-    Get all credit requests (admin only).
+    Get all credit requests (admin only). The next page's cursor is returned in the X-Next-Cursor header.
     """
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    return get_all_credit_requests(db=db, skip=skip, limit=limit)
+    try:
+        requests = get_all_credit_requests(db=db, skip=skip, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    deps.set_next_cursor(response, credit_requests_keyset.next_cursor(requests, limit))
+    return requests
 
 @router.get("/admin/pending", response_model=List[CreditRequestDetail])
 def get_pending_credit_requests_admin(
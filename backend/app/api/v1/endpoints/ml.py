@@ -0,0 +1,72 @@
+# app/api/v1/endpoints/ml.py
+from typing import Any
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.api import deps
+from app.ml.batching import inference_batcher
+from app.ml.cache import (
+    freelancer_pool_generation, open_projects_generation, project_ranking_cache, recommendation_cache
+)
+from app.ml.registry import model_registry
+from app.models.models import User
+
+router = APIRouter()
+
+@router.get("/model")
+def get_model_info(
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Get the version and load time of the recommendation model in use.
+    """
+    return model_registry.info()
+
+@router.post("/model/reload")
+def reload_model(
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Reload the recommendation model from disk (admin only).
+    """
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    try:
+        model_registry.reload()
+    except Exception as e:
+        # El registro conserva la versión anterior del modelo
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error reloading model, still serving version {model_registry.version}: {str(e)}",
+        )
+    
+    return model_registry.info()
+
+@router.get("/cache")
+def get_cache_stats(
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Get hit/miss statistics of the recommendation cache (admin only).
+    """
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    return {
+        "recommendations": recommendation_cache.stats(),
+        "project_rankings": project_ranking_cache.stats(),
+        "freelancer_pool_generation": freelancer_pool_generation.value,
+        "open_projects_generation": open_projects_generation.value,
+    }
+
+@router.get("/batching")
+def get_batching_stats(
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Get throughput and queue-wait statistics of the inference batcher (admin only).
+    """
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    return inference_batcher.stats()
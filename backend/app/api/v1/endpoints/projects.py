@@ -1,24 +1,38 @@
-from typing import Any, List
-from fastapi import APIRouter, Body, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import logging
+import uuid
+from typing import Any, List, Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session, selectinload
 from app.api import deps
+from app.core.config import settings
+from app.core.pagination import decode_cursor, encode_cursor
 from app.crud.project import (
     get_project, get_projects, get_projects_by_client, get_projects_by_freelancer,
-    get_open_projects, create_project, update_project, assign_project
+    get_open_projects, get_projects_by_ids, create_project, update_project, assign_project, projects_keyset
+)
+from app.crud.user import (
+    get_freelancers_by_ids, get_freelancer_skill_match_rows, iter_freelancer_feature_chunks
 )
-from app.crud.user import get_freelancers
 from app.crud import transaction as crud_transaction
 from app.crud.application import (
     create_application, get_applications_by_project, get_application_by_project_and_freelancer
 )
-from app.ml.recommender import FreelancerRecommender
+from app.ml.cache import (
+    freelancer_pool_generation, open_projects_generation, project_ranking_cache, recommendation_cache
+)
+from app.ml.candidates import freelancer_index
+from app.ml.feature_store import freelancer_features
+from app.ml.features import skill_match_features, skill_vocabulary
+from app.ml.registry import model_registry
 from app.models.models import User, Project as ProjectModel, ProjectStatus
-from app.schemas.project import Project, ProjectCreate, ProjectUpdate, ProjectDetail
+from app.schemas.project import Project, ProjectCreate, ProjectUpdate, ProjectDetail, RecommendedProjectPage
 from app.schemas.user import User as UserSchema
 from app.schemas.application import ProjectApplicationCreate, ProjectApplication, ProjectApplicationDetail
 
 router = APIRouter()
 
+logger = logging.getLogger(__name__)
+
 def convert_project_to_dict(project: ProjectModel) -> dict:
     """Helper function to convert SQLAlchemy Project to dict"""
     skills_list = [skill.name for skill in project.skills_required]
@@ -39,30 +53,60 @@ def convert_project_to_dict(project: ProjectModel) -> dict:
         "skills_required": skills_list
     }
 
+def convert_freelancer_to_dict(freelancer: User) -> dict:
+    """Helper function to convert SQLAlchemy User (freelancer) to dict"""
+    return {
+        "id": freelancer.id,
+        "email": freelancer.email,
+        "username": freelancer.username,
+        "full_name": freelancer.full_name,
+        "is_active": freelancer.is_active,
+        "is_freelancer": freelancer.is_freelancer,
+        "is_client": freelancer.is_client,
+        "experience_years": freelancer.experience_years,
+        "hourly_rate": freelancer.hourly_rate,
+        "rating": freelancer.rating,
+        "area_expertise": freelancer.area_expertise,
+        "credits_balance": freelancer.credits_balance,
+        "skills": [skill.name for skill in freelancer.skills]
+    }
+
 @router.get("/", response_model=List[Project])
 def read_projects(
+    response: Response,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
+    skip: int = Query(0, deprecated=True, description="Deprecated: use cursor"),
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
     """
-    Retrieve projects.
+    Retrieve projects. The next page's cursor is returned in the X-Next-Cursor header.
     """
-    projects = get_projects(db, skip=skip, limit=limit)
+    try:
+        projects = get_projects(db, skip=skip, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    deps.set_next_cursor(response, projects_keyset.next_cursor(projects, limit))
     return [convert_project_to_dict(p) for p in projects]
 
 @router.get("/open", response_model=List[Project])
 def read_open_projects(
+    response: Response,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
+    skip: int = Query(0, deprecated=True, description="Deprecated: use cursor"),
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
     """
-    Retrieve open projects.
+    Retrieve open projects. The next page's cursor is returned in the X-Next-Cursor header.
     """
-    projects = get_open_projects(db, skip=skip, limit=limit)
+    try:
+        projects = get_open_projects(db, skip=skip, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    deps.set_next_cursor(response, projects_keyset.next_cursor(projects, limit))
     return [convert_project_to_dict(p) for p in projects]
 
 @router.get("/client/in-progress", response_model=List[Project])
@@ -78,7 +122,9 @@ def read_client_in_progress_projects(
     if not current_user.is_client:
         raise HTTPException(status_code=400, detail="Not a client")
     
-    projects = db.query(ProjectModel).filter(
+    projects = db.query(ProjectModel).options(
+        selectinload(ProjectModel.skills_required)
+    ).filter(
         ProjectModel.client_id == current_user.id,
         ProjectModel.status.in_(["assigned", "in_progress", "completed"])
     ).order_by(
@@ -123,6 +169,115 @@ def read_freelancer_projects(
     )
     return [convert_project_to_dict(p) for p in projects]
 
+def rank_open_projects_for_freelancer(db: Session, freelancer: User) -> List[tuple]:
+    """Puntúa en un solo lote los proyectos abiertos para un freelancer y devuelve el top-K como (id, probabilidad)"""
+    # Orden por id para que los empates del ranking sean deterministas
+    open_projects = sorted(
+        (p for p in get_open_projects(db=db, limit=None) if p.client_id != freelancer.id),
+        key=lambda p: p.id
+    )
+    
+    freelancer_dict = {
+        "id": freelancer.id,
+        "experience_years": freelancer.experience_years,
+        "hourly_rate": freelancer.hourly_rate,
+        "rating": freelancer.rating,
+        "area_expertise": freelancer.area_expertise,
+        "skills": [skill.name for skill in freelancer.skills]
+    }
+    project_list = [
+        {
+            "id": p.id,
+            "budget": p.budget,
+            "area": p.area,
+            "skills_required": [skill.name for skill in p.skills_required]
+        }
+        for p in open_projects
+    ]
+    
+    if not skill_vocabulary.loaded_from_db:
+        skill_vocabulary.load_from_db(db)
+    
+    recommender = model_registry.get_recommender()
+    recommendations = recommender.recommend_projects(
+        freelancer=freelancer_dict,
+        projects=project_list,
+        top_n=settings.PROJECT_RECOMMENDATIONS_TOP_K
+    )
+    return [(rec['project']['id'], rec['match_probability']) for rec in recommendations]
+
+@router.get("/recommended", response_model=RecommendedProjectPage)
+def read_recommended_projects(
+    db: Session = Depends(deps.get_db),
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Retrieve open projects ranked for the current user (freelancer), paginated with a cursor.
+    """
+    if not current_user.is_freelancer:
+        raise HTTPException(status_code=400, detail="Not a freelancer")
+    
+    limit = max(1, min(limit, 100))
+    
+    # El cursor apunta a un ranking ya calculado (snapshot); si expiró, se vuelve
+    # a rankear y se continúa después del último elemento entregado
+    position = 0
+    snapshot_id = None
+    last_seen = None
+    if cursor:
+        try:
+            state = decode_cursor(cursor)
+            snapshot_id = state["s"]
+            position = int(state["o"])
+            last_seen = (float(state["p"]), int(state["i"])) if state.get("i") is not None else None
+        except (ValueError, KeyError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    ranking = project_ranking_cache.get(("snapshot", snapshot_id)) if snapshot_id else None
+    if ranking is None:
+        ranking_key = (
+            "freelancer", current_user.id, model_registry.version,
+            freelancer_pool_generation.value, open_projects_generation.value
+        )
+        snapshot_id = project_ranking_cache.get(ranking_key)
+        ranking = project_ranking_cache.get(("snapshot", snapshot_id)) if snapshot_id else None
+        if ranking is None:
+            try:
+                ranking = rank_open_projects_for_freelancer(db, current_user)
+            except Exception:
+                # Un fallo del modelo no debe parecer "sin recomendaciones"
+                logger.exception("Error computing project recommendations for freelancer %s", current_user.id)
+                raise HTTPException(status_code=500, detail="Error computing recommendations")
+            snapshot_id = uuid.uuid4().hex
+            project_ranking_cache.set(("snapshot", snapshot_id), ranking)
+            project_ranking_cache.set(ranking_key, snapshot_id)
+        if last_seen is not None:
+            # Continuar justo después del último (probabilidad, id) entregado
+            position = sum(1 for project_id, score in ranking if (-score, project_id) <= (-last_seen[0], last_seen[1]))
+    
+    page = ranking[position:position + limit]
+    projects_by_id = {p.id: p for p in get_projects_by_ids(db=db, project_ids=[pid for pid, _ in page])}
+    
+    items = []
+    for project_id, score in page:
+        project = projects_by_id.get(project_id)
+        # Un proyecto pudo cerrarse desde que se calculó el ranking
+        if project is None or project.status != ProjectStatus.OPEN.value:
+            continue
+        item = convert_project_to_dict(project)
+        item["match_probability"] = score
+        items.append(item)
+    
+    next_cursor = None
+    end = position + len(page)
+    if end < len(ranking):
+        last_id, last_score = page[-1]
+        next_cursor = encode_cursor({"s": snapshot_id, "o": end, "p": last_score, "i": last_id})
+    
+    return {"items": items, "next_cursor": next_cursor}
+
 @router.post("/", response_model=Project)
 def create_project_endpoint(
     *,
@@ -298,9 +453,34 @@ def get_freelancer_recommendations(
     if project.client_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
     
+    # Una petición repetida sobre el mismo proyecto, modelo y conjunto de freelancers
+    # se resuelve desde la caché sin recorrer la base de datos ni evaluar el modelo.
+    # Editar las habilidades del proyecto no cambia updated_at (solo project_skills),
+    # pero sí open_projects_generation
+    cache_key = (
+        project.id, project.updated_at, open_projects_generation.value,
+        model_registry.version, freelancer_pool_generation.value
+    )
+    recommended_ids = recommendation_cache.get(cache_key)
+    if recommended_ids is not None:
+        freelancers = get_freelancers_by_ids(db=db, user_ids=recommended_ids)
+        freelancers_by_id = {f.id: f for f in freelancers}
+        return [
+            convert_freelancer_to_dict(freelancers_by_id[rec_id])
+            for rec_id in recommended_ids if rec_id in freelancers_by_id
+        ]
+    
     try:
-        # Obtener freelancers
-        freelancers = get_freelancers(db=db)
+        # Etapa de recuperación: solo un conjunto acotado de candidatos pasa por el modelo;
+        # sin límite se evalúa el conjunto completo de freelancers
+        candidate_ids = None
+        if settings.RECOMMENDER_CANDIDATE_LIMIT > 0:
+            freelancer_index.ensure_loaded(db)
+            candidate_ids = freelancer_index.candidates(
+                skill_ids=[skill.id for skill in project.skills_required],
+                area=project.area,
+                limit=settings.RECOMMENDER_CANDIDATE_LIMIT
+            )
         
         # Preparar datos para el recomendador
         project_dict = {
@@ -312,63 +492,49 @@ def get_freelancer_recommendations(
             "skills_required": [skill.name for skill in project.skills_required]
         }
         
-        freelancer_list = []
-        for f in freelancers:
-            freelancer_list.append({
-                "id": f.id,
-                "username": f.username,
-                "experience_years": f.experience_years,
-                "hourly_rate": f.hourly_rate,
-                "rating": f.rating,
-                "area_expertise": f.area_expertise,
-                "skills": [skill.name for skill in f.skills]
-            })
+        # Internar las habilidades existentes con ids densos (solo la primera vez)
+        if not skill_vocabulary.loaded_from_db:
+            skill_vocabulary.load_from_db(db)
         
-        # Obtener recomendaciones
-        recommender = FreelancerRecommender()
-        recommendations = recommender.recommend_freelancers(
-            project=project_dict, 
-            freelancers=freelancer_list, 
-            top_n=5
-        )
+        recommender = model_registry.get_recommender()
+        if settings.RECOMMENDER_FEATURE_SOURCE in ("store", "sql"):
+            if settings.RECOMMENDER_FEATURE_SOURCE == "store":
+                # Características desde los arreglos en memoria, sin consultar la base
+                freelancer_features.ensure_loaded(db)
+                freelancer_ids, features = freelancer_features.pair_features(project_dict, user_ids=candidate_ids)
+            else:
+                # Una consulta agregada: la base de datos cuenta las habilidades en común
+                rows = get_freelancer_skill_match_rows(
+                    db=db, skill_ids=[skill.id for skill in project.skills_required], user_ids=candidate_ids
+                )
+                freelancer_ids, features = skill_match_features(rows, project_dict)
+            recommendations = recommender.recommend_freelancers_from_features(
+                freelancer_ids, features, top_n=5, chunk_size=settings.RECOMMENDER_SCORING_CHUNK_SIZE
+            )
+        else:
+            # Los freelancers se leen y puntúan por bloques
+            recommendations = recommender.recommend_freelancers_streaming(
+                project=project_dict,
+                freelancer_chunks=iter_freelancer_feature_chunks(
+                    db=db, user_ids=candidate_ids, chunk_size=settings.RECOMMENDER_SCORING_CHUNK_SIZE
+                ),
+                top_n=5
+            )
         
         # Extraer IDs de freelancers recomendados
         recommended_ids = [rec['freelancer']['id'] for rec in recommendations]
+        recommendation_cache.set(cache_key, recommended_ids)
         
-        # Convertir freelancers a diccionarios compatibles con UserSchema
-        result = []
-        for f in freelancers:
-            if f.id in recommended_ids:
-                result.append({
-                    "id": f.id,
-                    "email": f.email,
-                    "username": f.username,
-                    "full_name": f.full_name,
-                    "is_active": f.is_active,
-                    "is_freelancer": f.is_freelancer,
-                    "is_client": f.is_client,
-                    "experience_years": f.experience_years,
-                    "hourly_rate": f.hourly_rate,
-                    "rating": f.rating,
-                    "area_expertise": f.area_expertise,
-                    "credits_balance": f.credits_balance,
-                    "skills": [skill.name for skill in f.skills]
-                })
-        
-        # Ordenar por el orden de las recomendaciones
-        sorted_result = []
-        for rec_id in recommended_ids:
-            for freelancer_dict in result:
-                if freelancer_dict["id"] == rec_id:
-                    sorted_result.append(freelancer_dict)
-                    break
+        # Convertir freelancers a diccionarios compatibles con UserSchema,
+        # en el orden de las recomendaciones
+        freelancers = get_freelancers_by_ids(db=db, user_ids=recommended_ids)
+        freelancers_by_id = {f.id: f for f in freelancers}
+        return [convert_freelancer_to_dict(freelancers_by_id[rec_id]) for rec_id in recommended_ids]
         
-        return sorted_result
-        
-    except Exception as e:
-        # En caso de error, retornar lista vacía
-        print(f"Error in recommendations: {e}")
-        return []
+    except Exception:
+        # Un fallo del modelo no debe parecer "sin recomendaciones"
+        logger.exception("Error computing recommendations for project %s", project_id)
+        raise HTTPException(status_code=500, detail="Error computing recommendations")
 
 @router.get("/{project_id}", response_model=ProjectDetail)
 def read_project(
@@ -0,0 +1,21 @@
+# app/api/v1/endpoints/system.py
+from typing import Any
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.api import deps
+from app.database import get_pool_status
+from app.models.models import User
+
+router = APIRouter()
+
+@router.get("/database")
+def get_database_stats(
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Get the database backend and connection-pool checkout/wait statistics (admin only).
+    """
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    return get_pool_status()
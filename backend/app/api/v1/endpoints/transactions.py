@@ -1,6 +1,6 @@
 # app/api/v1/endpoints/transactions.py
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from app.api import deps
 from app.crud import transaction as crud_transaction
@@ -122,13 +122,19 @@ def get_transactions(
     *,
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
-    skip: int = 0,
+    response: Response,
+    skip: int = Query(0, deprecated=True, description="Deprecated: use cursor"),
     limit: int = 100,
+    cursor: Optional[str] = None,
 ) -> Any:
     """
-    Get user's transaction history.
+    Get user's transaction history. The next page's cursor is returned in the X-Next-Cursor header.
     """
-    transactions = crud_transaction.get_user_transactions(
-        db=db, user_id=current_user.id, skip=skip, limit=limit
-    )
+    try:
+        transactions = crud_transaction.get_user_transactions(
+            db=db, user_id=current_user.id, skip=skip, limit=limit, cursor=cursor
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    deps.set_next_cursor(response, crud_transaction.transactions_keyset.next_cursor(transactions, limit))
     return transactions
\ No newline at end of file
@@ -1,15 +1,38 @@
 # app/api/v1/endpoints/users.py
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from app.api import deps
-from app.crud.user import get_user, get_users, get_freelancers
+from app.crud.user import get_user, get_users, get_freelancers, users_keyset
 from app.models.models import User
 from app.schemas.user import User as UserSchema
 
 router = APIRouter()
 
+def convert_user_to_dict(user: User) -> dict:
+    """Helper function to convert SQLAlchemy User to dict"""
+    # Convertir skills de relación a lista de strings
+    skills_list = [skill.name for skill in user.skills]
+    
+    # Crear diccionario con todos los datos del usuario
+    return {
+        "id": user.id,
+        "email": user.email,
+        "username": user.username,
+        "full_name": user.full_name,
+        "is_active": user.is_active,
+        "is_freelancer": user.is_freelancer,
+        "is_client": user.is_client,
+        "is_admin": user.is_admin,
+        "experience_years": user.experience_years,
+        "hourly_rate": user.hourly_rate,
+        "rating": user.rating,
+        "area_expertise": user.area_expertise,
+        "credits_balance": user.credits_balance,
+        "skills": skills_list
+    }
+
 @router.get("/me", response_model=UserSchema)
 def read_user_me(
     db: Session = Depends(deps.get_db),
@@ -18,41 +41,26 @@ def read_user_me(
     """
     Get current user.
     """
-    # Convertir skills de relación a lista de strings
-    skills_list = [skill.name for skill in current_user.skills]
-    
-    # Crear diccionario con todos los datos del usuario
-    user_data = {
-        "id": current_user.id,
-        "email": current_user.email,
-        "username": current_user.username,
-        "full_name": current_user.full_name,
-        "is_active": current_user.is_active,
-        "is_freelancer": current_user.is_freelancer,
-        "is_client": current_user.is_client,
-        "is_admin": current_user.is_admin,
-        "experience_years": current_user.experience_years,
-        "hourly_rate": current_user.hourly_rate,
-        "rating": current_user.rating,
-        "area_expertise": current_user.area_expertise,
-        "credits_balance": current_user.credits_balance,
-        "skills": skills_list
-    }
-    
-    return user_data
+    return convert_user_to_dict(current_user)
 
 @router.get("/", response_model=List[UserSchema])
 def read_users(
+    response: Response,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
+    skip: int = Query(0, deprecated=True, description="Deprecated: use cursor"),
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
     """
-    Retrieve users.
+    Retrieve users. The next page's cursor is returned in the X-Next-Cursor header.
     """
-    users = get_users(db, skip=skip, limit=limit)
-    return users
+    try:
+        users = get_users(db, skip=skip, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    deps.set_next_cursor(response, users_keyset.next_cursor(users, limit))
+    return [convert_user_to_dict(u) for u in users]
 
 @router.get("/{user_id}", response_model=UserSchema)
 def read_user_by_id(
@@ -69,4 +77,4 @@ def read_user_by_id(
             status_code=404,
             detail="The user with this username does not exist in the system",
         )
-    return user
\ No newline at end of file
+    return convert_user_to_dict(user)
\ No newline at end of file
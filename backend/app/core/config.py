@@ -6,6 +6,55 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     DATABASE_URL: str = "sqlite:///./app.db"
+    # Pool de conexiones para PostgreSQL (SQLite mantiene una conexión por sesión)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Tiempo máximo de una consulta en PostgreSQL (0 = sin límite)
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
+    # SQLite en modo de alta concurrencia (opcional): WAL, pragmas de rendimiento y una
+    # única conexión de escritura por la que pasan, en cola, las peticiones que modifican datos
+    SQLITE_HIGH_CONCURRENCY: bool = False
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE_BYTES: int = 268435456
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    SQLITE_WRITER_TIMEOUT_SECONDS: float = 30.0
+    # Agrega a cada respuesta el encabezado X-Query-Count con las consultas SQL de la petición
+    DB_QUERY_COUNT_HEADER: bool = False
+    
+    # Recomendador: cada cuántos segundos se revisa si cambió el archivo del modelo
+    # (un valor negativo desactiva la recarga automática)
+    MODEL_RELOAD_INTERVAL_SECONDS: float = 5.0
+    # Usar el modelo compilado a arreglos NumPy (app/ml/models/compiled) si existe
+    MODEL_USE_COMPILED: bool = True
+    # Hilos de predict_proba del modelo publicado: el servidor ya atiende peticiones en
+    # paralelo (y las agrupa en micro-lotes), así que cada predicción usa un solo núcleo
+    MODEL_SERVING_N_JOBS: int = 1
+    # Máximo de candidatos que pasan de la etapa de recuperación al modelo (0 = todos)
+    RECOMMENDER_CANDIDATE_LIMIT: int = 500
+    # Cada cuántos segundos se reconstruye el índice de candidatos desde la base de datos
+    RECOMMENDER_INDEX_REFRESH_SECONDS: float = 300.0
+    # Origen de las características de los freelancers al recomendar:
+    # "store" = arreglos en memoria (app/ml/feature_store.py), "sql" = una consulta
+    # agregada que cuenta la coincidencia de habilidades en la base de datos,
+    # "stream" = lectura por bloques de las columnas y habilidades de cada freelancer
+    RECOMMENDER_FEATURE_SOURCE: str = "store"
+    # Freelancers que se leen de la base de datos y se puntúan por bloque
+    RECOMMENDER_SCORING_CHUNK_SIZE: int = 1000
+    # Caché de recomendaciones por proyecto
+    RECOMMENDATION_CACHE_SIZE: int = 1024
+    RECOMMENDATION_CACHE_TTL_SECONDS: float = 300.0
+    # Ranking de proyectos recomendados por freelancer (top-K que se conserva por un tiempo corto)
+    PROJECT_RECOMMENDATIONS_TOP_K: int = 200
+    PROJECT_RANKING_CACHE_SIZE: int = 2048
+    PROJECT_RANKING_TTL_SECONDS: float = 120.0
+    # Micro-lotes de inferencia: milisegundos que se esperan para juntar peticiones
+    # concurrentes en una sola llamada al modelo (0 = cada petición llama al modelo directamente)
+    RECOMMENDER_BATCH_WAIT_MS: float = 2.0
+    RECOMMENDER_BATCH_MAX_ROWS: int = 20000
+    RECOMMENDER_BATCH_TIMEOUT_SECONDS: float = 30.0
     
     class Config:
         env_file = ".env"
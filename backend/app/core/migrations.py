@@ -0,0 +1,91 @@
+# app/core/migrations.py
+"""
+Migraciones versionadas y livianas del esquema.
+
+`Base.metadata.create_all` crea las tablas que faltan pero no modifica las
+existentes (por ejemplo, no agrega índices nuevos). Cada migración de
+MIGRATIONS se aplica una sola vez, en su propia transacción, y queda
+registrada en la tabla `schema_migrations`; al arrancar, el servidor aplica
+las pendientes. Las migraciones deben ser idempotentes: en una base nueva
+create_all ya dejó el esquema al día y solo se registra la versión.
+"""
+from datetime import datetime
+from typing import Callable, List, NamedTuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, exc, select
+from sqlalchemy.engine import Connection, Engine
+
+from app.database import Base, writer_engine
+from app.models import models  # noqa: F401  (registra las tablas en Base.metadata)
+
+# Fuera de Base.metadata: no es un modelo de la aplicación
+schema_migrations = Table(
+    "schema_migrations", MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("name", String),
+    Column("applied_at", DateTime),
+)
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    apply: Callable[[Connection], None]
+
+
+def create_indexes(*names: str) -> Callable[[Connection], None]:
+    """Migración que crea (si no existen) los índices declarados en los modelos con esos nombres."""
+    def apply(connection: Connection) -> None:
+        indexes = {index.name: index for table in Base.metadata.tables.values() for index in table.indexes}
+        missing = set(names) - set(indexes)
+        if missing:
+            raise ValueError(f"Índices no declarados en los modelos: {sorted(missing)}")
+        for name in names:
+            indexes[name].create(bind=connection, checkfirst=True)
+    return apply
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "indices compuestos para consultas frecuentes", create_indexes(
+        "ix_chat_messages_project_id_created_at",
+        "ix_chat_messages_receiver_id_status",
+        "ix_transactions_user_id_created_at",
+        "ix_project_applications_project_id_freelancer_id",
+        "ix_projects_status",
+        "ix_projects_client_id_updated_at",
+        "ix_projects_freelancer_id_updated_at",
+        "ix_credit_requests_status_created_at",
+    )),
+    Migration(2, "indice de solicitudes de creditos por fecha", create_indexes(
+        "ix_credit_requests_created_at",
+    )),
+]
+
+
+def applied_versions(engine: Engine = writer_engine) -> List[int]:
+    schema_migrations.create(bind=engine, checkfirst=True)
+    with engine.connect() as connection:
+        return sorted(connection.execute(select(schema_migrations.c.version)).scalars())
+
+
+def run_migrations(engine: Engine = writer_engine, migrations: List[Migration] = MIGRATIONS) -> List[int]:
+    """Aplica en orden las migraciones pendientes; devuelve las versiones aplicadas ahora."""
+    done = set(applied_versions(engine))
+    applied = []
+    for migration in sorted(migrations, key=lambda m: m.version):
+        if migration.version in done:
+            continue
+        try:
+            with engine.begin() as connection:
+                migration.apply(connection)
+                connection.execute(schema_migrations.insert().values(
+                    version=migration.version, name=migration.name, applied_at=datetime.utcnow()
+                ))
+        except exc.DBAPIError:
+            # Otro proceso (otro worker del servidor) pudo aplicarla al mismo tiempo
+            if migration.version in applied_versions(engine):
+                continue
+            raise
+        applied.append(migration.version)
+        print(f"Migración {migration.version} aplicada: {migration.name}")
+    return applied
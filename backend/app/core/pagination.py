@@ -0,0 +1,99 @@
+# app/core/pagination.py
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import DateTime, and_, or_
+
+# Encabezado con el cursor de la página siguiente en las listas paginadas por clave
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(data: Dict[str, Any]) -> str:
+    """Codifica el estado de paginación como un cursor opaco para el cliente."""
+    raw = json.dumps(data, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decodifica un cursor generado por `encode_cursor`. Lanza ValueError si es inválido."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(data, dict):
+        raise ValueError("Invalid cursor")
+    return data
+
+
+class Keyset:
+    """
+    Paginación por clave (keyset) sobre (columna de orden, id).
+
+    En lugar de saltar `skip` filas, cada página continúa después de la última
+    fila de la anterior, identificada en un cursor opaco: el costo no crece con
+    la profundidad de la página (se recorre el índice de la columna de orden) y
+    las filas insertadas mientras se pagina no hacen saltar ni repetir otras.
+    El id desempata las filas con el mismo valor de orden.
+    """
+
+    def __init__(self, id_column, sort_column=None, descending: bool = False):
+        self.id_column = id_column
+        self.sort_column = sort_column
+        self.descending = descending
+
+    @property
+    def columns(self) -> List[Any]:
+        return [self.sort_column, self.id_column] if self.sort_column is not None else [self.id_column]
+
+    def _decode(self, cursor: str) -> Tuple[Any, int]:
+        data = decode_cursor(cursor)
+        try:
+            last_id = int(data["i"])
+            if self.sort_column is None:
+                return None, last_id
+            value = data["k"]
+            if value is not None and isinstance(self.sort_column.type, DateTime):
+                value = datetime.fromisoformat(value)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError("Invalid cursor") from e
+        return value, last_id
+
+    def _after(self, value: Any, last_id: int):
+        """Condición de las filas que siguen a (value, last_id) en el orden de la paginación."""
+        if self.sort_column is None:
+            return self.id_column < last_id if self.descending else self.id_column > last_id
+        # Equivale a (sort, id) > (value, last_id), escrito para que se use el índice de `sort`
+        if self.descending:
+            return and_(self.sort_column <= value,
+                        or_(self.sort_column < value, self.id_column < last_id))
+        return and_(self.sort_column >= value,
+                    or_(self.sort_column > value, self.id_column > last_id))
+
+    def apply(self, query, cursor: Optional[str] = None, skip: int = 0, limit: Optional[int] = None):
+        """
+        Ordena la consulta y la restringe a una página. Con `cursor`, la página
+        sigue a la indicada por él; si no, se usa `skip` (obsoleto, solo por
+        compatibilidad). Lanza ValueError si el cursor es inválido.
+        """
+        query = query.order_by(*(column.desc() if self.descending else column.asc() for column in self.columns))
+        if cursor:
+            query = query.filter(self._after(*self._decode(cursor)))
+        elif skip:
+            query = query.offset(skip)
+        if limit is not None:
+            query = query.limit(limit)
+        return query
+
+    def next_cursor(self, rows: Sequence[Any], limit: Optional[int]) -> Optional[str]:
+        """Cursor de la página siguiente, o None si `rows` (modelos o diccionarios) fue la última."""
+        if not rows or limit is None or len(rows) < limit:
+            return None
+        last = rows[-1]
+        get = last.get if isinstance(last, dict) else lambda key: getattr(last, key)
+        data = {"i": get(self.id_column.key)}
+        if self.sort_column is not None:
+            data["k"] = get(self.sort_column.key)
+        return encode_cursor(data)
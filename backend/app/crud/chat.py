@@ -1,9 +1,13 @@
 # app/crud/chat.py
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from app.core.pagination import Keyset
 from app.models.models import ChatMessage, User
 from app.schemas.chat import ChatMessageCreate
 
+# Orden cronológico; usa el índice ix_chat_messages_project_id_created_at
+messages_keyset = Keyset(ChatMessage.id, ChatMessage.created_at)
+
 def create_message(db: Session, message: ChatMessageCreate, sender_id: int) -> ChatMessage:
     """Crear un nuevo mensaje de chat"""
     db_message = ChatMessage(
@@ -17,11 +21,11 @@ def create_message(db: Session, message: ChatMessageCreate, sender_id: int) -> C
     db.refresh(db_message)
     return db_message
 
-def get_project_messages(db: Session, project_id: int, skip: int = 0, limit: int = 100) -> List[ChatMessage]:
+def get_project_messages(db: Session, project_id: int, skip: int = 0, limit: int = 100,
+                         cursor: Optional[str] = None) -> List[ChatMessage]:
     """Obtener mensajes de un proyecto específico"""
-    return db.query(ChatMessage).filter(
-        ChatMessage.project_id == project_id
-    ).order_by(ChatMessage.created_at).offset(skip).limit(limit).all()
+    query = db.query(ChatMessage).filter(ChatMessage.project_id == project_id)
+    return messages_keyset.apply(query, cursor=cursor, skip=skip, limit=limit).all()
 
 def mark_messages_as_read(db: Session, project_id: int, user_id: int):
     """Marcar mensajes como leídos"""
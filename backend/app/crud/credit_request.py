@@ -1,11 +1,15 @@
 # app/crud/credit_request.py
 from typing import List, Optional
 from sqlalchemy.orm import Session
+from app.core.pagination import Keyset
 from sqlalchemy import and_, desc
 from app.models.models import CreditRequest, CreditRequestStatus, User
 from app.schemas.credit_request import CreditRequestCreate, CreditRequestUpdate
 from datetime import datetime
 
+# Más recientes primero; usa el índice ix_credit_requests_created_at
+credit_requests_keyset = Keyset(CreditRequest.id, CreditRequest.created_at, descending=True)
+
 def get_credit_request(db: Session, request_id: int) -> Optional[CreditRequest]:
     return db.query(CreditRequest).filter(CreditRequest.id == request_id).first()
 
@@ -14,9 +18,9 @@ def get_credit_requests_by_user(db: Session, user_id: int) -> List[CreditRequest
         CreditRequest.user_id == user_id
     ).order_by(desc(CreditRequest.created_at)).all()
 
-def get_all_credit_requests(db: Session, skip: int = 0, limit: int = 100) -> List[dict]:
+def get_all_credit_requests(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[dict]:
     """Obtener todas las solicitudes con información del usuario"""
-    requests = db.query(
+    query = db.query(
         CreditRequest,
         User.username,
         User.full_name,
@@ -24,9 +28,8 @@ def get_all_credit_requests(db: Session, skip: int = 0, limit: int = 100) -> Lis
         User.credits_balance
     ).join(
         User, CreditRequest.user_id == User.id
-    ).order_by(
-        desc(CreditRequest.created_at)
-    ).offset(skip).limit(limit).all()
+    )
+    requests = credit_requests_keyset.apply(query, cursor=cursor, skip=skip, limit=limit).all()
     
     result = []
     for req, username, full_name, email, credits_balance in requests:
@@ -120,7 +123,9 @@ def approve_credit_request(
     admin_id: int
 ) -> Optional[CreditRequest]:
     """Aprobar una solicitud de créditos"""
-    credit_request = db.query(CreditRequest).filter(CreditRequest.id == request_id).first()
+    # El estado y el saldo se leen y actualizan en la misma transacción de escritura
+    db.use_writer()
+    credit_request = db.query(CreditRequest).filter(CreditRequest.id == request_id).populate_existing().first()
     if not credit_request:
         return None
     
@@ -133,7 +138,7 @@ def approve_credit_request(
     credit_request.reviewed_at = datetime.utcnow()
     
     # Agregar créditos al usuario
-    user = db.query(User).filter(User.id == credit_request.user_id).first()
+    user = db.query(User).filter(User.id == credit_request.user_id).populate_existing().first()
     if user:
         user.credits_balance += credit_request.amount
     
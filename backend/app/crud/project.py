@@ -1,28 +1,47 @@
 # app/crud/project.py
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
+from app.core.pagination import Keyset
+from app.ml import sync  # noqa: F401  (invalida los rankings al confirmar cambios de proyectos)
 from app.models.models import Project, ProjectStatus, Skill
 from app.schemas.project import ProjectCreate, ProjectUpdate
 
+def _with_skills(query):
+    """Carga las habilidades requeridas de toda la página en una sola consulta extra (evita N+1)"""
+    return query.options(selectinload(Project.skills_required))
+
+# Paginación por id (clave primaria; con el filtro por estado, el índice ix_projects_status)
+projects_keyset = Keyset(Project.id)
+
 def get_project(db: Session, project_id: int) -> Optional[Project]:
     return db.query(Project).filter(Project.id == project_id).first()
 
-def get_projects(db: Session, skip: int = 0, limit: int = 100) -> List[Project]:
-    return db.query(Project).offset(skip).limit(limit).all()
+def get_projects(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Project]:
+    return projects_keyset.apply(_with_skills(db.query(Project)), cursor=cursor, skip=skip, limit=limit).all()
 
 def get_projects_by_client(db: Session, client_id: int, skip: int = 0, limit: int = 100) -> List[Project]:
-    return db.query(Project).filter(Project.client_id == client_id).offset(skip).limit(limit).all()
+    return _with_skills(db.query(Project)).filter(Project.client_id == client_id).offset(skip).limit(limit).all()
 
 def get_projects_by_freelancer(db: Session, freelancer_id: int, skip: int = 0, limit: int = 100) -> List[Project]:
     """Get all projects assigned to a freelancer (assigned, in_progress, completed)"""
-    return db.query(Project).filter(
+    return _with_skills(db.query(Project)).filter(
         Project.freelancer_id == freelancer_id
     ).order_by(
         Project.updated_at.desc()
     ).offset(skip).limit(limit).all()
 
-def get_open_projects(db: Session, skip: int = 0, limit: int = 100) -> List[Project]:
-    return db.query(Project).filter(Project.status == ProjectStatus.OPEN.value).offset(skip).limit(limit).all()
+def get_open_projects(db: Session, skip: int = 0, limit: Optional[int] = 100, cursor: Optional[str] = None) -> List[Project]:
+    query = _with_skills(db.query(Project)).filter(Project.status == ProjectStatus.OPEN.value)
+    return projects_keyset.apply(query, cursor=cursor, skip=skip, limit=limit).all()
+
+def get_projects_by_ids(db: Session, project_ids: List[int], chunk_size: int = 500) -> List[Project]:
+    """Obtener los proyectos con los ids dados (sin orden particular)"""
+    projects = []
+    # Consultar por bloques para no exceder el límite de parámetros de SQLite
+    for start in range(0, len(project_ids), chunk_size):
+        chunk = project_ids[start:start + chunk_size]
+        projects.extend(_with_skills(db.query(Project)).filter(Project.id.in_(chunk)).all())
+    return projects
 
 def create_project(db: Session, project: ProjectCreate, client_id: int) -> Project:
     # Crear proyecto
@@ -1,11 +1,17 @@
 # app/crud/transaction.py
 from sqlalchemy.orm import Session
-from typing import List
+from app.core.pagination import Keyset
+from typing import List, Optional
 from app.models.models import Transaction, User, Project, TransactionType
 from app.schemas.transaction import CreditPurchase, WithdrawalRequest
 
+# Más recientes primero; usa el índice ix_transactions_user_id_created_at
+transactions_keyset = Keyset(Transaction.id, Transaction.created_at, descending=True)
+
 def purchase_credits(db: Session, user_id: int, credit_purchase: CreditPurchase) -> Transaction:
     """Comprar créditos"""
+    # Los saldos se leen y actualizan en la misma transacción de escritura
+    db.use_writer()
     # Crear transacción
     transaction = Transaction(
         user_id=user_id,
@@ -16,7 +22,7 @@ def purchase_credits(db: Session, user_id: int, credit_purchase: CreditPurchase)
     db.add(transaction)
     
     # Actualizar balance del usuario
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.query(User).filter(User.id == user_id).populate_existing().first()
     user.credits_balance += credit_purchase.amount
     
     db.commit()
@@ -25,8 +31,10 @@ def purchase_credits(db: Session, user_id: int, credit_purchase: CreditPurchase)
 
 def hold_credits_for_project(db: Session, project_id: int, amount: float):
     """Retener créditos para un proyecto"""
-    project = db.query(Project).filter(Project.id == project_id).first()
-    client = db.query(User).filter(User.id == project.client_id).first()
+    # Los saldos se leen y actualizan en la misma transacción de escritura
+    db.use_writer()
+    project = db.query(Project).filter(Project.id == project_id).populate_existing().first()
+    client = db.query(User).filter(User.id == project.client_id).populate_existing().first()
     
     if client.credits_balance < amount:
         raise ValueError("Insufficient credits")
@@ -39,13 +47,15 @@ def hold_credits_for_project(db: Session, project_id: int, amount: float):
 
 def release_payment(db: Session, project_id: int) -> Transaction:
     """Liberar pago al freelancer cuando el proyecto se completa"""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    # Los saldos se leen y actualizan en la misma transacción de escritura
+    db.use_writer()
+    project = db.query(Project).filter(Project.id == project_id).populate_existing().first()
     
     if project.credits_held <= 0:
         raise ValueError("No credits held for this project")
     
     # Transferir créditos al freelancer
-    freelancer = db.query(User).filter(User.id == project.freelancer_id).first()
+    freelancer = db.query(User).filter(User.id == project.freelancer_id).populate_existing().first()
     freelancer.credits_balance += project.credits_held
     
     # Crear transacción de pago
@@ -68,7 +78,9 @@ def release_payment(db: Session, project_id: int) -> Transaction:
 
 def request_withdrawal(db: Session, user_id: int, withdrawal: WithdrawalRequest) -> Transaction:
     """Solicitar retiro de créditos"""
-    user = db.query(User).filter(User.id == user_id).first()
+    # Los saldos se leen y actualizan en la misma transacción de escritura
+    db.use_writer()
+    user = db.query(User).filter(User.id == user_id).populate_existing().first()
     
     if user.credits_balance < withdrawal.amount:
         raise ValueError("Insufficient credits")
@@ -89,15 +101,17 @@ def request_withdrawal(db: Session, user_id: int, withdrawal: WithdrawalRequest)
     db.refresh(transaction)
     return transaction
 
-def get_user_transactions(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[Transaction]:
+def get_user_transactions(db: Session, user_id: int, skip: int = 0, limit: int = 100,
+                          cursor: Optional[str] = None) -> List[Transaction]:
     """Obtener transacciones del usuario"""
-    return db.query(Transaction).filter(
-        Transaction.user_id == user_id
-    ).order_by(Transaction.created_at.desc()).offset(skip).limit(limit).all()
+    query = db.query(Transaction).filter(Transaction.user_id == user_id)
+    return transactions_keyset.apply(query, cursor=cursor, skip=skip, limit=limit).all()
 
 def complete_project_payment(db: Session, project_id: int) -> Transaction:
     """Completar pago del proyecto: transferir créditos retenidos al freelancer"""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    # Los saldos se leen y actualizan en la misma transacción de escritura
+    db.use_writer()
+    project = db.query(Project).filter(Project.id == project_id).populate_existing().first()
     
     if not project:
         raise ValueError("Project not found")
@@ -112,7 +126,7 @@ def complete_project_payment(db: Session, project_id: int) -> Transaction:
         raise ValueError("No freelancer assigned to this project")
     
     # Transferir créditos al freelancer
-    freelancer = db.query(User).filter(User.id == project.freelancer_id).first()
+    freelancer = db.query(User).filter(User.id == project.freelancer_id).populate_existing().first()
     if not freelancer:
         raise ValueError("Freelancer not found")
     
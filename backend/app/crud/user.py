@@ -1,10 +1,19 @@
 # app/crud/user.py
-from typing import Optional, List
-from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterator, Optional, List
+from sqlalchemy import distinct, func
+from sqlalchemy.orm import Session, selectinload
+from app.core.pagination import Keyset
 from app.core.security import get_password_hash
-from app.models.models import User, Skill
+from app.ml import sync  # noqa: F401  (actualiza el recomendador al confirmar cambios de usuarios)
+from app.models.models import User, Skill, user_skills
 from app.schemas.user import UserCreate, UserUpdate
 
+def _with_skills(query):
+    """Carga las habilidades de toda la página en una sola consulta extra (evita N+1)"""
+    return query.options(selectinload(User.skills))
+
+users_keyset = Keyset(User.id)
+
 def get_user(db: Session, user_id: int) -> Optional[User]:
     return db.query(User).filter(User.id == user_id).first()
 
@@ -14,11 +23,107 @@ def get_user_by_email(db: Session, *, email: str) -> Optional[User]:
 def get_user_by_username(db: Session, *, username: str) -> Optional[User]:
     return db.query(User).filter(User.username == username).first()
 
-def get_users(db: Session, *, skip: int = 0, limit: int = 100) -> List[User]:
-    return db.query(User).offset(skip).limit(limit).all()
+def get_users(db: Session, *, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[User]:
+    return users_keyset.apply(_with_skills(db.query(User)), cursor=cursor, skip=skip, limit=limit).all()
 
 def get_freelancers(db: Session, *, skip: int = 0, limit: int = 100) -> List[User]:
-    return db.query(User).filter(User.is_freelancer == True).offset(skip).limit(limit).all()
+    return _with_skills(db.query(User)).filter(User.is_freelancer == True).offset(skip).limit(limit).all()
+
+def get_freelancers_by_ids(db: Session, *, user_ids: List[int], chunk_size: int = 500) -> List[User]:
+    """Obtener los freelancers con los ids dados, ordenados por id"""
+    freelancers = []
+    # Consultar por bloques para no exceder el límite de parámetros de SQLite
+    for start in range(0, len(user_ids), chunk_size):
+        chunk = user_ids[start:start + chunk_size]
+        freelancers.extend(
+            _with_skills(db.query(User)).filter(User.id.in_(chunk), User.is_freelancer == True).all()
+        )
+    freelancers.sort(key=lambda user: user.id)
+    return freelancers
+
+def _freelancer_feature_rows(db: Session, rows) -> List[Dict[str, Any]]:
+    chunk = [
+        {
+            "id": user_id,
+            "experience_years": experience_years,
+            "hourly_rate": hourly_rate,
+            "rating": rating,
+            "area_expertise": area_expertise,
+            "skills": [],
+        }
+        for user_id, experience_years, hourly_rate, rating, area_expertise in rows
+    ]
+    by_id = {row["id"]: row for row in chunk}
+    skill_rows = db.query(user_skills.c.user_id, Skill.name).join(
+        Skill, Skill.id == user_skills.c.skill_id
+    ).filter(user_skills.c.user_id.in_(list(by_id)))
+    for user_id, skill_name in skill_rows:
+        by_id[user_id]["skills"].append(skill_name)
+    return chunk
+
+def iter_freelancer_feature_chunks(
+    db: Session, *, user_ids: Optional[List[int]] = None, chunk_size: int = 1000
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Recorrer los freelancers por bloques de `chunk_size`, en orden de id, como
+    diccionarios con solo las columnas que usa el recomendador (sin cargar
+    objetos User ni sus relaciones). Con `user_ids` se limita a esos ids.
+    """
+    columns = (User.id, User.experience_years, User.hourly_rate, User.rating, User.area_expertise)
+    if user_ids is not None:
+        user_ids = sorted(set(user_ids))
+        for start in range(0, len(user_ids), chunk_size):
+            rows = db.query(*columns).filter(
+                User.id.in_(user_ids[start:start + chunk_size]), User.is_freelancer == True
+            ).order_by(User.id).all()
+            if rows:
+                yield _freelancer_feature_rows(db, rows)
+        return
+
+    # Paginación por id (keyset): cada bloque es una consulta acotada, sin OFFSET
+    last_id = 0
+    while True:
+        rows = db.query(*columns).filter(
+            User.is_freelancer == True, User.id > last_id
+        ).order_by(User.id).limit(chunk_size).all()
+        if not rows:
+            return
+        yield _freelancer_feature_rows(db, rows)
+        last_id = rows[-1][0]
+
+def get_freelancer_skill_match_rows(
+    db: Session, *, skill_ids: List[int], user_ids: Optional[List[int]] = None, chunk_size: int = 500
+) -> List[tuple]:
+    """
+    Filas de características de los freelancers para un proyecto, en orden de id:
+    (id, experience_years, hourly_rate, rating, area_expertise, skill_match_count).
+
+    La coincidencia de habilidades la calcula la base de datos: un JOIN de
+    `user_skills` con las habilidades del proyecto agrupado por usuario, en
+    la misma consulta que las columnas del freelancer (sin cargar las
+    habilidades de cada uno). Con `user_ids` se consulta por bloques.
+    """
+    matches = db.query(
+        user_skills.c.user_id,
+        func.count(distinct(user_skills.c.skill_id)).label("skill_match_count")
+    ).filter(user_skills.c.skill_id.in_(skill_ids)).group_by(user_skills.c.user_id).subquery()
+
+    query = db.query(
+        User.id, User.experience_years, User.hourly_rate, User.rating, User.area_expertise,
+        func.coalesce(matches.c.skill_match_count, 0)
+    ).outerjoin(
+        matches, matches.c.user_id == User.id
+    ).filter(User.is_freelancer == True)
+
+    if user_ids is None:
+        return query.order_by(User.id).all()
+
+    rows = []
+    user_ids = sorted(set(user_ids))
+    # Por bloques para no exceder el límite de parámetros de SQLite
+    for start in range(0, len(user_ids), chunk_size):
+        rows.extend(query.filter(User.id.in_(user_ids[start:start + chunk_size])).order_by(User.id).all())
+    return rows
 
 def create_user(db: Session, *, user: UserCreate) -> User:
     # Crear usuario
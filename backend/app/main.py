@@ -1,19 +1,28 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 import os
 import uvicorn
 from app.api.v1.api import api_router
 from app.core.config import settings
-from app.database import Base, engine
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.database import Base, count_queries, engine
 from app.ml.init_model import create_initial_model
+from app.ml.registry import model_registry
 from app.core.init_admin import create_admin_user
+from app.core.migrations import run_migrations
 
 # Crear tablas en la base de datos
 Base.metadata.create_all(bind=engine)
 
+# Aplicar las migraciones pendientes (p. ej. índices nuevos en bases existentes)
+run_migrations()
+
 # Crear modelo inicial si no existe
 create_initial_model()
 
+# Cargar el modelo una sola vez para todo el proceso
+model_registry.get()
+
 # Crear usuario admin si no existe
 create_admin_user()
 
@@ -37,8 +46,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Cursor de la página siguiente de las listas paginadas (legible desde el navegador)
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Contar las consultas SQL de cada petición (p. ej. para detectar N+1 en las pruebas)
+if settings.DB_QUERY_COUNT_HEADER:
+    @app.middleware("http")
+    async def add_query_count_header(request: Request, call_next):
+        with count_queries() as counter:
+            response = await call_next(request)
+        response.headers["X-Query-Count"] = str(counter.count)
+        return response
+
 # Incluir rutas
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
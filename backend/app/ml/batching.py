@@ -0,0 +1,172 @@
+# app/ml/batching.py
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Dict, List, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class _Job(NamedTuple):
+    model: Any
+    features: Any
+    future: Future
+    enqueued_at: float
+
+
+class InferenceBatcher:
+    """
+    Servicio de inferencia por micro-lotes dentro del proceso.
+
+    Las peticiones concurrentes encolan sus matrices de características; un hilo
+    dedicado espera unos milisegundos para juntar los trabajos pendientes, los
+    evalúa con una sola llamada a `predict_proba` y reparte las filas de vuelta
+    a cada petición. Solo se espera si hay concurrencia (otros trabajos en cola
+    o un lote anterior con varios trabajos): una petición sola se evalúa de
+    inmediato y no paga la ventana de espera. Así el cómputo del modelo no ocupa el threadpool de FastAPI
+    y muchas llamadas pequeñas se convierten en pocas llamadas grandes.
+    """
+
+    def __init__(self, max_wait_ms: float = None, max_batch_rows: int = None, timeout: float = None):
+        self.max_wait = (settings.RECOMMENDER_BATCH_WAIT_MS if max_wait_ms is None else max_wait_ms) / 1000.0
+        self.max_batch_rows = settings.RECOMMENDER_BATCH_MAX_ROWS if max_batch_rows is None else max_batch_rows
+        self.timeout = settings.RECOMMENDER_BATCH_TIMEOUT_SECONDS if timeout is None else timeout
+        self._queue: "queue.Queue[_Job]" = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._started_at = None
+        self._jobs = 0
+        self._batches = 0
+        self._rows = 0
+        self._busy_seconds = 0.0
+        self._queue_waits = deque(maxlen=1000)
+        self._last_batch_jobs = 0
+
+    def _ensure_worker(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._started_at = time.monotonic()
+                self._thread = threading.Thread(target=self._run, name="inference-batcher", daemon=True)
+                self._thread.start()
+
+    def predict_proba(self, model, features) -> np.ndarray:
+        """Encola un trabajo y espera sus probabilidades (bloquea solo al hilo que llama)."""
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put(_Job(model, features, future, time.monotonic()))
+        return future.result(timeout=self.timeout)
+
+    def _collect(self, jobs: List[_Job]) -> None:
+        """Agrega a `jobs` el próximo lote; si algo falla, `jobs` conserva lo ya sacado de la cola."""
+        jobs.append(self._queue.get())
+        rows = len(jobs[0].features)
+        # Sin señales de concurrencia no hay con quién juntar el trabajo: solo se toma lo ya encolado
+        wait = not self._queue.empty() or self._last_batch_jobs > 1
+        deadline = time.monotonic() + self.max_wait
+        while rows < self.max_batch_rows:
+            remaining = deadline - time.monotonic()
+            try:
+                if wait and remaining > 0:
+                    job = self._queue.get(timeout=remaining)
+                else:
+                    job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            jobs.append(job)
+            rows += len(job.features)
+        self._last_batch_jobs = len(jobs)
+
+    def _run(self) -> None:
+        while True:
+            jobs: List[_Job] = []
+            try:
+                self._collect(jobs)
+                # Un cambio de modelo puede dejar trabajos de dos versiones en el mismo lote
+                groups: Dict[int, List[_Job]] = {}
+                for job in jobs:
+                    groups.setdefault(id(job.model), []).append(job)
+                for group in groups.values():
+                    self._score(group)
+            except Exception as e:
+                # El hilo sigue atendiendo la cola; los trabajos del lote reciben el error
+                # en lugar de esperar hasta el timeout
+                logger.exception("Error procesando un lote de inferencia")
+                for job in jobs:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+
+    def _score(self, jobs: List[_Job]) -> None:
+        started = time.monotonic()
+        try:
+            parts = [job.features for job in jobs]
+            if all(isinstance(part, pd.DataFrame) for part in parts):
+                stacked = pd.concat(parts, ignore_index=True)
+            else:
+                stacked = np.vstack([np.asarray(part) for part in parts])
+            probabilities = jobs[0].model.predict_proba(stacked)
+        except Exception as e:
+            for job in jobs:
+                job.future.set_exception(e)
+            return
+        finished = time.monotonic()
+
+        offset = 0
+        for job in jobs:
+            n_rows = len(job.features)
+            job.future.set_result(probabilities[offset:offset + n_rows])
+            offset += n_rows
+
+        with self._stats_lock:
+            self._jobs += len(jobs)
+            self._batches += 1
+            self._rows += offset
+            self._busy_seconds += finished - started
+            self._queue_waits.extend(started - job.enqueued_at for job in jobs)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            waits = np.array(self._queue_waits) * 1000.0
+            uptime = time.monotonic() - self._started_at if self._started_at else 0.0
+            return {
+                "max_wait_ms": self.max_wait * 1000.0,
+                "max_batch_rows": self.max_batch_rows,
+                "queue_size": self._queue.qsize(),
+                "jobs": self._jobs,
+                "batches": self._batches,
+                "rows": self._rows,
+                "avg_jobs_per_batch": self._jobs / self._batches if self._batches else 0.0,
+                "avg_rows_per_batch": self._rows / self._batches if self._batches else 0.0,
+                "rows_per_second_busy": self._rows / self._busy_seconds if self._busy_seconds else 0.0,
+                "rows_per_second_uptime": self._rows / uptime if uptime else 0.0,
+                "queue_wait_ms_p50": float(np.percentile(waits, 50)) if len(waits) else 0.0,
+                "queue_wait_ms_p99": float(np.percentile(waits, 99)) if len(waits) else 0.0,
+                "queue_wait_ms_max": float(waits.max()) if len(waits) else 0.0,
+            }
+
+
+class BatchedModel:
+    """Envuelve un modelo para que `predict_proba` pase por el servicio de micro-lotes."""
+
+    def __init__(self, model, batcher: InferenceBatcher):
+        self.model = model
+        self.batcher = batcher
+
+    def predict_proba(self, features) -> np.ndarray:
+        return self.batcher.predict_proba(self.model, features)
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+
+# Servicio compartido por el proceso del servidor
+inference_batcher = InferenceBatcher()
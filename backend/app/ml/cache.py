@@ -0,0 +1,99 @@
+# app/ml/cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from app.core.config import settings
+
+
+class TTLCache:
+    """
+    Caché LRU acotada con expiración por tiempo, segura entre hilos.
+    Lleva contadores de aciertos y fallos para poder dimensionarla.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class GenerationCounter:
+    """Contador que se incrementa cada vez que cambian los datos de los que depende una caché."""
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def bump(self) -> int:
+        with self._lock:
+            self._value += 1
+            return self._value
+
+
+# Generación del conjunto de freelancers: cambia al confirmarse cambios de freelancers (ver app.ml.sync)
+freelancer_pool_generation = GenerationCounter()
+
+# Generación de los proyectos abiertos: cambia al confirmarse cambios de proyectos (ver app.ml.sync)
+open_projects_generation = GenerationCounter()
+
+# Recomendaciones de freelancers por proyecto
+recommendation_cache = TTLCache(
+    maxsize=settings.RECOMMENDATION_CACHE_SIZE,
+    ttl=settings.RECOMMENDATION_CACHE_TTL_SECONDS,
+)
+
+# Rankings de proyectos abiertos por freelancer, para paginar sin volver a puntuar
+project_ranking_cache = TTLCache(
+    maxsize=settings.PROJECT_RANKING_CACHE_SIZE,
+    ttl=settings.PROJECT_RANKING_TTL_SECONDS,
+)
@@ -0,0 +1,177 @@
+# app/ml/candidates.py
+import heapq
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import User, user_skills
+
+
+class CandidateIndex:
+    """
+    Índice invertido en memoria para la etapa de recuperación del recomendador.
+
+    Guarda habilidad (id de la tabla `skills`) -> freelancers y área -> freelancers,
+    de modo que para un proyecto se obtiene un conjunto acotado de candidatos
+    sin recorrer a todos los freelancers. Solo ese conjunto pasa por el modelo.
+    """
+
+    def __init__(self, refresh_interval: float = None):
+        self.refresh_interval = (
+            settings.RECOMMENDER_INDEX_REFRESH_SECONDS if refresh_interval is None else refresh_interval
+        )
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._pending: Optional[Dict[int, Any]] = None
+        self._by_skill: Dict[int, Set[int]] = {}
+        self._by_area: Dict[str, Set[int]] = {}
+        self._user_skills: Dict[int, Set[int]] = {}
+        self._user_area: Dict[int, Optional[str]] = {}
+        self._loaded_at: Optional[float] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def __len__(self) -> int:
+        return len(self._user_area)
+
+    def _add(self, user_id: int, skill_ids: Iterable[int], area: Optional[str]) -> None:
+        skill_ids = set(skill_ids)
+        self._user_skills[user_id] = skill_ids
+        self._user_area[user_id] = area
+        for skill_id in skill_ids:
+            self._by_skill.setdefault(skill_id, set()).add(user_id)
+        if area is not None:
+            self._by_area.setdefault(area, set()).add(user_id)
+
+    def _discard(self, user_id: int) -> None:
+        for skill_id in self._user_skills.pop(user_id, ()):
+            postings = self._by_skill.get(skill_id)
+            if postings is not None:
+                postings.discard(user_id)
+                if not postings:
+                    del self._by_skill[skill_id]
+        area = self._user_area.pop(user_id, None)
+        if area is not None and area in self._by_area:
+            self._by_area[area].discard(user_id)
+            if not self._by_area[area]:
+                del self._by_area[area]
+
+    def load_from_db(self, db: Session) -> None:
+        """
+        Reconstruye el índice completo con dos consultas (freelancers y sus
+        habilidades). Se arma fuera del lock y se reemplaza al final; los cambios
+        recibidos mientras tanto se vuelven a aplicar sobre el índice nuevo.
+        """
+        with self._lock:
+            self._pending = {}
+
+        fresh = CandidateIndex(refresh_interval=self.refresh_interval)
+        for user_id, area in db.query(User.id, User.area_expertise).filter(User.is_freelancer == True).order_by(User.id):
+            fresh._add(user_id, (), area)
+
+        skill_rows = db.query(user_skills.c.user_id, user_skills.c.skill_id).join(
+            User, User.id == user_skills.c.user_id
+        ).filter(User.is_freelancer == True)
+        for user_id, skill_id in skill_rows:
+            fresh._user_skills[user_id].add(skill_id)
+            fresh._by_skill.setdefault(skill_id, set()).add(user_id)
+
+        with self._lock:
+            self._by_skill, self._by_area = fresh._by_skill, fresh._by_area
+            self._user_skills, self._user_area = fresh._user_skills, fresh._user_area
+            for user_id, entry in self._pending.items():
+                self._discard(user_id)
+                if entry is not None:
+                    self._add(user_id, *entry)
+            self._pending = None
+            self._loaded_at = time.monotonic()
+
+    def _is_stale(self) -> bool:
+        return (
+            self._loaded_at is None
+            or (self.refresh_interval >= 0 and time.monotonic() - self._loaded_at >= self.refresh_interval)
+        )
+
+    def ensure_loaded(self, db: Session) -> None:
+        """Carga el índice si no existe o si pasó el intervalo de refresco.
+
+        El refresco periódico recoge cambios hechos por otros procesos (workers).
+        """
+        if not self._is_stale():
+            return
+        # Si ya hay índice y otro hilo lo está reconstruyendo, se usa el actual
+        if not self._build_lock.acquire(blocking=self._loaded_at is None):
+            return
+        try:
+            if self._is_stale():
+                self.load_from_db(db)
+        finally:
+            self._build_lock.release()
+
+    def _apply(self, user_id: int, entry) -> None:
+        with self._lock:
+            if self._pending is not None:
+                self._pending[user_id] = entry
+            if not self.loaded:
+                # Se incluirá en la primera carga completa
+                return
+            self._discard(user_id)
+            if entry is not None:
+                self._add(user_id, *entry)
+
+    @staticmethod
+    def entry_for(user: User):
+        """Entrada de un usuario: (ids de sus habilidades, área), o None si no es freelancer."""
+        if not user.is_freelancer:
+            return None
+        return {skill.id for skill in user.skills}, user.area_expertise
+
+    def set_entry(self, user_id: int, entry) -> None:
+        """Reemplaza la entrada de un usuario por una calculada con `entry_for` (None la quita)."""
+        self._apply(user_id, entry)
+
+    def update_user(self, user: User) -> None:
+        """Actualiza las entradas de un usuario tras crearlo o modificarlo."""
+        self._apply(user.id, self.entry_for(user))
+
+    def remove_user(self, user_id: int) -> None:
+        self._apply(user_id, None)
+
+    def candidates(self, skill_ids: Iterable[int], area: Optional[str], limit: int) -> List[int]:
+        """
+        Devuelve hasta `limit` ids de freelancers, primero los que comparten más
+        habilidades con el proyecto (desempatando por coincidencia de área y por
+        id). Si no se llega al límite, se completa con freelancers del área y
+        luego con el resto.
+        """
+        with self._lock:
+            overlap = Counter()
+            for skill_id in set(skill_ids):
+                overlap.update(self._by_skill.get(skill_id, ()))
+            same_area = self._by_area.get(area, set()) if area is not None else set()
+
+            result = heapq.nsmallest(limit, overlap, key=lambda uid: (-overlap[uid], uid not in same_area, uid))
+            if len(result) >= limit:
+                return result
+
+            seen = set(result)
+            for user_id in sorted(same_area - seen)[:limit - len(result)]:
+                result.append(user_id)
+                seen.add(user_id)
+            if len(result) < limit:
+                for user_id in self._user_area:
+                    if user_id not in seen:
+                        result.append(user_id)
+                        if len(result) >= limit:
+                            break
+            return result
+
+
+# Índice compartido por el proceso del servidor
+freelancer_index = CandidateIndex()
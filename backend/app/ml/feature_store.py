@@ -0,0 +1,246 @@
+# app/ml/feature_store.py
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.ml.features import (
+    FEATURE_COLUMNS, SkillVocabulary, _pad_to, build_features, popcount, skill_overlap, skill_vocabulary
+)
+from app.models.models import Skill, User, user_skills
+
+# Columnas numéricas del freelancer que usa el modelo
+NUMERIC_COLUMNS = ['experience_years', 'hourly_rate', 'rating']
+
+# Código de área para usuarios sin área (None)
+NO_AREA = -1
+
+
+class FreelancerFeatureStore:
+    """
+    Características de cada freelancer guardadas en arreglos contiguos en
+    memoria: una columna float64 por valor numérico, el código de área y la
+    máscara de bits de habilidades (una fila por freelancer).
+
+    Se carga una vez desde la base de datos y después se actualiza fila por
+    fila al confirmarse cada cambio de un usuario (ver app.ml.sync), así el
+    recomendador arma la matriz de características de todos los candidatos
+    con indexación de NumPy, sin consultar la base ni cargar objetos User.
+    Igual que el índice de candidatos, se reconstruye periódicamente para
+    recoger los cambios hechos por otros procesos.
+    """
+
+    def __init__(self, vocabulary: Optional[SkillVocabulary] = None, refresh_interval: float = None):
+        self.vocabulary = skill_vocabulary if vocabulary is None else vocabulary
+        self.refresh_interval = (
+            settings.RECOMMENDER_INDEX_REFRESH_SECONDS if refresh_interval is None else refresh_interval
+        )
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._pending: Optional[Dict[int, Optional[tuple]]] = None
+        self._loaded_at: Optional[float] = None
+        self._reset(capacity=0)
+
+    def _reset(self, capacity: int) -> None:
+        self._size = 0
+        self._row_of: Dict[int, int] = {}
+        self._area_codes: Dict[str, int] = {}
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._active = np.zeros(capacity, dtype=bool)
+        self._columns = {name: np.zeros(capacity, dtype=np.float64) for name in NUMERIC_COLUMNS}
+        self._area = np.full(capacity, NO_AREA, dtype=np.int32)
+        self._masks = np.zeros((capacity, self.vocabulary.n_bytes), dtype=np.uint8)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def __len__(self) -> int:
+        return int(self._active[:self._size].sum())
+
+    def _area_code(self, area: Optional[str]) -> int:
+        if area is None:
+            return NO_AREA
+        code = self._area_codes.get(area)
+        if code is None:
+            code = self._area_codes[area] = len(self._area_codes)
+        return code
+
+    def _grow(self, capacity: int) -> None:
+        capacity = max(capacity, 2 * len(self._ids), 1024)
+        extra = capacity - len(self._ids)
+        self._ids = np.concatenate([self._ids, np.zeros(extra, dtype=np.int64)])
+        self._active = np.concatenate([self._active, np.zeros(extra, dtype=bool)])
+        for name in NUMERIC_COLUMNS:
+            self._columns[name] = np.concatenate([self._columns[name], np.zeros(extra, dtype=np.float64)])
+        self._area = np.concatenate([self._area, np.full(extra, NO_AREA, dtype=np.int32)])
+        self._masks = np.pad(self._masks, [(0, extra), (0, 0)])
+
+    def _set_masks(self, rows, masks: np.ndarray) -> None:
+        # El vocabulario puede haber crecido: se ensancha la matriz, nunca se recorta
+        if masks.shape[-1] > self._masks.shape[1]:
+            self._masks = _pad_to(self._masks, masks.shape[-1])
+        self._masks[rows] = _pad_to(masks, self._masks.shape[1])
+
+    def _write(self, user_id: int, entry: Optional[tuple]) -> None:
+        row = self._row_of.get(user_id)
+        if entry is None:
+            if row is not None:
+                self._active[row] = False
+            return
+        if row is None:
+            if self._size == len(self._ids):
+                self._grow(self._size + 1)
+            row = self._row_of[user_id] = self._size
+            self._ids[row] = user_id
+            self._size += 1
+
+        experience_years, hourly_rate, rating, area, skills = entry
+        for name, value in zip(NUMERIC_COLUMNS, (experience_years, hourly_rate, rating)):
+            self._columns[name][row] = np.nan if value is None else value
+        self._area[row] = self._area_code(area)
+        self._set_masks(row, self.vocabulary.encode(skills))
+        self._active[row] = True
+
+    def load_from_db(self, db: Session) -> None:
+        """
+        Reconstruye los arreglos con dos consultas (freelancers y nombres de sus
+        habilidades). Se arman fuera del lock y se reemplazan al final; los
+        cambios recibidos mientras tanto se vuelven a aplicar sobre los nuevos.
+        """
+        with self._lock:
+            self._pending = {}
+
+        rows = db.query(
+            User.id, User.experience_years, User.hourly_rate, User.rating, User.area_expertise
+        ).filter(User.is_freelancer == True).order_by(User.id).all()
+
+        skills: Dict[int, List[str]] = {row[0]: [] for row in rows}
+        skill_rows = db.query(user_skills.c.user_id, Skill.name).join(
+            Skill, Skill.id == user_skills.c.skill_id
+        ).join(
+            User, User.id == user_skills.c.user_id
+        ).filter(User.is_freelancer == True)
+        for user_id, name in skill_rows:
+            if user_id in skills:
+                skills[user_id].append(name)
+
+        fresh = FreelancerFeatureStore(vocabulary=self.vocabulary, refresh_interval=self.refresh_interval)
+        fresh._reset(capacity=len(rows))
+        n = len(rows)
+        fresh._size = n
+        fresh._ids[:] = [row[0] for row in rows]
+        fresh._row_of = {user_id: i for i, user_id in enumerate(fresh._ids.tolist())}
+        fresh._active[:] = True
+        for i, name in enumerate(NUMERIC_COLUMNS, start=1):
+            # None -> NaN, igual que al armar las características desde diccionarios
+            fresh._columns[name][:] = np.array([row[i] for row in rows], dtype=np.float64)
+        fresh._area[:] = [fresh._area_code(row[4]) for row in rows]
+        if n:
+            fresh._set_masks(slice(0, n), self.vocabulary.encode_many(skills[row[0]] for row in rows))
+
+        with self._lock:
+            self._size, self._row_of, self._area_codes = fresh._size, fresh._row_of, fresh._area_codes
+            self._ids, self._active, self._columns = fresh._ids, fresh._active, fresh._columns
+            self._area, self._masks = fresh._area, fresh._masks
+            for user_id, entry in self._pending.items():
+                self._write(user_id, entry)
+            self._pending = None
+            self._loaded_at = time.monotonic()
+
+    def _is_stale(self) -> bool:
+        return (
+            self._loaded_at is None
+            or (self.refresh_interval >= 0 and time.monotonic() - self._loaded_at >= self.refresh_interval)
+        )
+
+    def ensure_loaded(self, db: Session) -> None:
+        """Carga los arreglos si no existen o si pasó el intervalo de refresco."""
+        if not self._is_stale():
+            return
+        # Si ya hay datos y otro hilo los está reconstruyendo, se usan los actuales
+        if not self._build_lock.acquire(blocking=self._loaded_at is None):
+            return
+        try:
+            if self._is_stale():
+                self.load_from_db(db)
+        finally:
+            self._build_lock.release()
+
+    def _apply(self, user_id: int, entry: Optional[tuple]) -> None:
+        with self._lock:
+            if self._pending is not None:
+                self._pending[user_id] = entry
+            if not self.loaded:
+                # Se incluirá en la primera carga completa
+                return
+            self._write(user_id, entry)
+
+    @staticmethod
+    def entry_for(user: User) -> Optional[tuple]:
+        """Fila de un usuario (incluidas sus habilidades), o None si no es freelancer."""
+        if not user.is_freelancer:
+            return None
+        return (
+            user.experience_years, user.hourly_rate, user.rating, user.area_expertise,
+            [skill.name for skill in user.skills]
+        )
+
+    def set_entry(self, user_id: int, entry: Optional[tuple]) -> None:
+        """Reemplaza la fila de un usuario por una calculada con `entry_for` (None la quita)."""
+        self._apply(user_id, entry)
+
+    def update_user(self, user: User) -> None:
+        """Actualiza la fila de un usuario tras crearlo o modificarlo (incluidas sus habilidades)."""
+        self._apply(user.id, self.entry_for(user))
+
+    def remove_user(self, user_id: int) -> None:
+        self._apply(user_id, None)
+
+    def pair_features(self, project: Dict, user_ids: Optional[Iterable[int]] = None) -> Tuple[np.ndarray, pd.DataFrame]:
+        """
+        Ids (ascendentes) y matriz de características de los pares
+        (freelancer, `project`) para los freelancers dados, o para todos.
+        Mismo resultado que `features.pair_features` con los diccionarios de
+        esos freelancers.
+        """
+        project_mask = self.vocabulary.encode(project.get('skills_required', []))
+        area = project.get('area')
+        with self._lock:
+            if user_ids is None:
+                rows = np.flatnonzero(self._active[:self._size])
+            else:
+                rows = np.fromiter(
+                    (self._row_of[user_id] for user_id in user_ids if user_id in self._row_of), dtype=np.int64
+                )
+                rows = rows[self._active[rows]]
+            rows = rows[np.argsort(self._ids[rows], kind='stable')]
+
+            # La indexación copia: lo que sigue trabaja sobre una instantánea consistente
+            ids = self._ids[rows]
+            numeric = {name: self._columns[name][rows] for name in NUMERIC_COLUMNS}
+            # Un área que ningún freelancer tiene no coincide con ninguno
+            area_code = NO_AREA if area is None else self._area_codes.get(area, NO_AREA - 1)
+            area_match = (self._area[rows] == area_code).astype(np.int64)
+            skill_match_count = skill_overlap(self._masks[rows], project_mask[None, :])
+
+        if not len(ids):
+            return ids, pd.DataFrame(columns=FEATURE_COLUMNS)
+        features = build_features(
+            experience_years=numeric['experience_years'],
+            hourly_rate=numeric['hourly_rate'],
+            rating=numeric['rating'],
+            skill_match_count=skill_match_count,
+            project_skill_count=popcount(project_mask),
+            area_match=area_match,
+            budget=project.get('budget', 0)
+        )
+        return ids, features
+
+
+# Características de los freelancers compartidas por el proceso del servidor
+freelancer_features = FreelancerFeatureStore()
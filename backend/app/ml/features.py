@@ -0,0 +1,184 @@
+# app/ml/features.py
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Orden de las columnas que espera el modelo
+FEATURE_COLUMNS = [
+    'experience_years', 'hourly_rate', 'rating', 'skill_match_count',
+    'skill_match_pct', 'area_match', 'budget'
+]
+
+# Número de bits encendidos de cada byte posible
+POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+class SkillVocabulary:
+    """
+    Asigna a cada habilidad un id entero denso (0, 1, 2, ...) para representar
+    el conjunto de habilidades de un usuario o proyecto como una máscara de bits
+    empaquetada en bytes (np.uint8), en lugar de un set de strings.
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.loaded_from_db = False
+        for name in names:
+            self.intern(name)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def n_bytes(self) -> int:
+        """Ancho en bytes de una máscara con el vocabulario actual."""
+        return max(1, (len(self._ids) + 7) // 8)
+
+    def intern(self, name: str) -> int:
+        skill_id = self._ids.get(name)
+        if skill_id is None:
+            with self._lock:
+                skill_id = self._ids.setdefault(name, len(self._ids))
+        return skill_id
+
+    def load_from_db(self, db) -> None:
+        """Interna las habilidades de la tabla `skills` en el orden de sus ids."""
+        from app.models.models import Skill
+
+        for (name,) in db.query(Skill.name).order_by(Skill.id):
+            self.intern(name)
+        self.loaded_from_db = True
+
+    def encode(self, skills: Optional[Iterable[str]]) -> np.ndarray:
+        """Máscara de bits de una lista de habilidades."""
+        ids = [self.intern(name) for name in (skills or [])]
+        bits = np.zeros(self.n_bytes * 8, dtype=np.uint8)
+        bits[ids] = 1
+        return np.packbits(bits)
+
+    def encode_many(self, skill_lists: Iterable[Optional[Iterable[str]]]) -> np.ndarray:
+        """Matriz de máscaras (una fila por lista de habilidades)."""
+        id_lists = [[self.intern(name) for name in (skills or [])] for skills in skill_lists]
+        bits = np.zeros((len(id_lists), self.n_bytes * 8), dtype=np.uint8)
+        rows = np.repeat(np.arange(len(id_lists)), [len(ids) for ids in id_lists])
+        cols = np.fromiter((i for ids in id_lists for i in ids), dtype=np.int64, count=len(rows))
+        bits[rows, cols] = 1
+        return np.packbits(bits, axis=1)
+
+
+def _pad_to(masks: np.ndarray, n_bytes: int) -> np.ndarray:
+    # Las máscaras creadas antes de que creciera el vocabulario son más angostas
+    missing = n_bytes - masks.shape[-1]
+    if missing <= 0:
+        return masks
+    pad = [(0, 0)] * (masks.ndim - 1) + [(0, missing)]
+    return np.pad(masks, pad)
+
+
+def popcount(masks: np.ndarray) -> np.ndarray:
+    """Cantidad de habilidades de cada máscara (cuenta de bits por fila)."""
+    return POPCOUNT_TABLE[masks].sum(axis=-1, dtype=np.int64)
+
+
+def skill_overlap(freelancer_masks: np.ndarray, project_masks: np.ndarray) -> np.ndarray:
+    """Habilidades en común por par. Una máscara de una sola fila se aplica a todos los pares."""
+    n_bytes = max(freelancer_masks.shape[-1], project_masks.shape[-1])
+    return popcount(_pad_to(freelancer_masks, n_bytes) & _pad_to(project_masks, n_bytes))
+
+
+def _numeric(values) -> np.ndarray:
+    # Valores faltantes (None / NaN) como 0, igual que en los conjuntos de entrenamiento
+    values = np.asarray(values, dtype=np.float64)
+    return np.where(np.isnan(values), 0.0, values)
+
+
+def build_features(experience_years, hourly_rate, rating, skill_match_count,
+                   project_skill_count, area_match, budget) -> pd.DataFrame:
+    """
+    Arma la matriz de características del modelo a partir de columnas ya
+    calculadas. Los argumentos pueden ser escalares o arreglos de una fila,
+    que se repiten para todos los pares. Todos los caminos (servidor y
+    extracción de entrenamiento) pasan por aquí, incluido el manejo de faltantes.
+    """
+    skill_match_count = np.asarray(skill_match_count, dtype=np.int64)
+    project_skill_count = np.asarray(project_skill_count, dtype=np.int64)
+
+    # Porcentaje de habilidades requeridas que posee el freelancer
+    skill_match_pct = np.divide(
+        skill_match_count, project_skill_count,
+        out=np.zeros(np.broadcast(skill_match_count, project_skill_count).shape, dtype=np.float64),
+        where=project_skill_count > 0
+    )
+
+    columns = {
+        'experience_years': _numeric(experience_years),
+        'hourly_rate': _numeric(hourly_rate),
+        'rating': _numeric(rating),
+        'skill_match_count': skill_match_count,
+        'skill_match_pct': skill_match_pct,
+        'area_match': np.asarray(area_match, dtype=np.int64),
+        'budget': _numeric(budget),
+    }
+    n_pairs = max(np.size(values) for values in columns.values())
+    return pd.DataFrame(
+        {name: np.broadcast_to(values, n_pairs) for name, values in columns.items()},
+        columns=FEATURE_COLUMNS
+    )
+
+
+def pair_features(freelancers: List[Dict[str, Any]], projects: List[Dict[str, Any]],
+                  vocabulary: Optional[SkillVocabulary] = None) -> pd.DataFrame:
+    """
+    Características de pares (freelancer, proyecto) a partir de diccionarios
+    como los que arma el servidor. Las listas deben tener la misma longitud o
+    una de ellas un solo elemento, que se reutiliza para todos los pares.
+    """
+    vocabulary = skill_vocabulary if vocabulary is None else vocabulary
+
+    # Máscaras de bits de habilidades; la coincidencia es un AND + conteo de bits
+    freelancer_masks = vocabulary.encode_many(f.get('skills', []) for f in freelancers)
+    project_masks = vocabulary.encode_many(p.get('skills_required', []) for p in projects)
+
+    # Coincidencia de área
+    freelancer_areas = np.array([f.get('area_expertise') for f in freelancers], dtype=object)
+    project_areas = np.array([p.get('area') for p in projects], dtype=object)
+
+    return build_features(
+        experience_years=[f.get('experience_years', 0) for f in freelancers],
+        hourly_rate=[f.get('hourly_rate', 0) for f in freelancers],
+        rating=[f.get('rating', 0) for f in freelancers],
+        skill_match_count=skill_overlap(freelancer_masks, project_masks),
+        project_skill_count=popcount(project_masks),
+        area_match=(freelancer_areas == project_areas).astype(np.int64),
+        budget=[p.get('budget', 0) for p in projects]
+    )
+
+
+
+def skill_match_features(rows: List[tuple], project: Dict[str, Any]):
+    """
+    Ids y características de los pares (freelancer, `project`) a partir de
+    filas (id, experience_years, hourly_rate, rating, area_expertise,
+    skill_match_count) con la coincidencia de habilidades ya contada, como las
+    de `crud.user.get_freelancer_skill_match_rows`.
+    """
+    if not rows:
+        return np.zeros(0, dtype=np.int64), pd.DataFrame(columns=FEATURE_COLUMNS)
+
+    ids, experience_years, hourly_rate, rating, areas, skill_match_count = zip(*rows)
+    project_area = project.get('area')
+    return np.array(ids, dtype=np.int64), build_features(
+        experience_years=np.array(experience_years, dtype=np.float64),
+        hourly_rate=np.array(hourly_rate, dtype=np.float64),
+        rating=np.array(rating, dtype=np.float64),
+        skill_match_count=skill_match_count,
+        project_skill_count=len(set(project.get('skills_required') or [])),
+        area_match=[area == project_area for area in areas],
+        budget=project.get('budget', 0)
+    )
+
+# Vocabulario compartido por el proceso del servidor
+skill_vocabulary = SkillVocabulary()
@@ -0,0 +1,189 @@
+# app/ml/forest.py
+import hashlib
+import json
+import os
+import pickle
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+COMPILED_MODEL_DIR = os.path.join(os.path.dirname(__file__), "models", "compiled")
+MANIFEST_FILE = "manifest.json"
+FORMAT_VERSION = 1
+
+# Arreglos que componen un bosque compilado (uno por archivo .npy)
+ARRAY_NAMES = ["feature", "threshold", "children", "value", "roots"]
+
+
+class CompiledForest:
+    """
+    Bosque aleatorio aplanado en arreglos contiguos de NumPy.
+
+    Todos los árboles se guardan concatenados: para cada nodo, la característica
+    y el umbral de corte, los hijos izquierdo/derecho (índices globales) y la
+    distribución de clases normalizada. Un lote de muestras se recorre por todos
+    los árboles a la vez, avanzando un nivel por iteración solo los pares
+    (árbol, muestra) que aún no llegaron a una hoja. No depende de scikit-learn
+    y da las mismas probabilidades que `RandomForestClassifier.predict_proba`.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], manifest: Dict[str, Any]):
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.value = arrays["value"]
+        self.roots = arrays["roots"]
+        self.manifest = manifest
+        self.classes_ = np.asarray(manifest["classes"])
+        self.feature_names_in_: Optional[List[str]] = manifest.get("feature_names")
+        self.n_features_in_ = int(manifest["n_features"])
+        self.version: Optional[str] = manifest.get("version")
+        # Hijos aplanados: el hijo de `nodo` es children[2 * nodo + va_a_la_derecha]
+        self.children = arrays["children"].reshape(-1)
+        # Las hojas son los nodos que apuntan a sí mismos
+        self._is_leaf = arrays["children"][:, 0] == np.arange(len(self.feature))
+
+    @classmethod
+    def load(cls, directory: str = COMPILED_MODEL_DIR, mmap: bool = True) -> "CompiledForest":
+        """Carga el bosque; con `mmap` los arreglos se mapean en memoria sin copiarlos."""
+        with open(os.path.join(directory, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+        if manifest.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Formato de modelo compilado no soportado: {manifest.get('format_version')}")
+        arrays = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r' if mmap else None)
+            for name in ARRAY_NAMES
+        }
+        return cls(arrays, manifest)
+
+    def _as_matrix(self, X) -> np.ndarray:
+        if self.feature_names_in_ is not None and hasattr(X, "columns"):
+            X = X[self.feature_names_in_]
+        # scikit-learn evalúa los árboles en float32; se replica para obtener los mismos cortes
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"Se esperaban {self.n_features_in_} características, se recibió un arreglo de forma {X.shape}"
+            )
+        return X
+
+    def _leaves(self, X: np.ndarray) -> np.ndarray:
+        """Índice de la hoja alcanzada en cada árbol, con forma (n_árboles, n_muestras)."""
+        n_samples, n_features = X.shape
+        n_trees = len(self.roots)
+        flat_X = X.reshape(-1)
+        leaves = np.empty(n_trees * n_samples, dtype=np.int32)
+
+        # Pares (árbol, muestra) que aún no llegaron a una hoja: nodo actual,
+        # desplazamiento de la fila de la muestra en X y posición en el resultado
+        nodes = np.repeat(self.roots, n_samples)
+        row_offsets = np.tile(np.arange(n_samples, dtype=np.int64) * n_features, n_trees)
+        positions = np.arange(n_trees * n_samples)
+        while nodes.size:
+            go_right = ~(flat_X[row_offsets + self.feature[nodes]] <= self.threshold[nodes])
+            child = self.children[2 * nodes + go_right]
+            done = self._is_leaf[child]
+            leaves[positions[done]] = child[done]
+            pending = ~done
+            nodes, row_offsets, positions = child[pending], row_offsets[pending], positions[pending]
+        return leaves.reshape(n_trees, n_samples)
+
+    def predict_proba(self, X, chunk_size: int = 4096) -> np.ndarray:
+        X = self._as_matrix(X)
+        n_samples = X.shape[0]
+        proba = np.zeros((n_samples, len(self.classes_)), dtype=np.float64)
+
+        # Por bloques, para acotar la memoria de la matriz (árboles x muestras)
+        for start in range(0, n_samples, chunk_size):
+            leaves = self._leaves(X[start:start + chunk_size])
+            block = proba[start:start + chunk_size]
+            # Se suma árbol por árbol, en el mismo orden que scikit-learn
+            for tree_leaves in leaves:
+                block += self.value[tree_leaves]
+        proba /= len(self.roots)
+        return proba
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def export_forest(model, directory: str = COMPILED_MODEL_DIR, version: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Aplana un `RandomForestClassifier` entrenado y lo guarda en `directory`.
+
+    Los arreglos se escriben primero y el manifiesto al final (cada archivo se
+    reemplaza de forma atómica), de modo que quien vigile el manifiesto siempre
+    encuentra un modelo completo.
+    """
+    features, thresholds, children, values, roots = [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        n_nodes = tree.node_count
+        node_ids = np.arange(n_nodes)
+        is_leaf = tree.children_left == -1
+
+        # Las hojas apuntan a sí mismas para que el recorrido se quede en ellas
+        left = np.where(is_leaf, node_ids, tree.children_left) + offset
+        right = np.where(is_leaf, node_ids, tree.children_right) + offset
+
+        # Igual que DecisionTreeClassifier.predict_proba: normalizar cada hoja
+        value = tree.value[:, 0, :].astype(np.float64)
+        normalizer = value.sum(axis=1, keepdims=True)
+        normalizer[normalizer == 0.0] = 1.0
+
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+        children.append(np.stack([left, right], axis=1))
+        values.append(value / normalizer)
+        roots.append(offset)
+        max_depth = max(max_depth, int(tree.max_depth))
+        offset += n_nodes
+
+    arrays = {
+        "feature": np.ascontiguousarray(np.concatenate(features), dtype=np.int32),
+        "threshold": np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64),
+        "children": np.ascontiguousarray(np.concatenate(children), dtype=np.int32),
+        "value": np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+        "roots": np.asarray(roots, dtype=np.int32),
+    }
+
+    if version is None:
+        digest = hashlib.sha256()
+        for name in ARRAY_NAMES:
+            digest.update(arrays[name].tobytes())
+        version = digest.hexdigest()[:12]
+
+    feature_names = getattr(model, "feature_names_in_", None)
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "version": version,
+        "n_trees": len(roots),
+        "n_nodes": int(offset),
+        "max_depth": max_depth,
+        "n_features": int(model.n_features_in_),
+        "feature_names": [str(name) for name in feature_names] if feature_names is not None else None,
+        "classes": np.asarray(model.classes_).tolist(),
+    }
+
+    os.makedirs(directory, exist_ok=True)
+    for name in ARRAY_NAMES:
+        tmp_path = os.path.join(directory, f"{name}.tmp.npy")
+        np.save(tmp_path, arrays[name])
+        os.replace(tmp_path, os.path.join(directory, f"{name}.npy"))
+
+    tmp_manifest = os.path.join(directory, MANIFEST_FILE + ".tmp")
+    with open(tmp_manifest, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_manifest, os.path.join(directory, MANIFEST_FILE))
+
+    return manifest
+
+
+if __name__ == "__main__":
+    # Compilar el modelo pickle existente (requiere scikit-learn solo en este paso)
+    pickle_path = os.path.join(os.path.dirname(__file__), "models", "trained_model.pkl")
+    with open(pickle_path, "rb") as f:
+        data = f.read()
+    manifest = export_forest(pickle.loads(data), version=hashlib.sha256(data).hexdigest()[:12])
+    print(f"Modelo compilado ({manifest['n_trees']} árboles, {manifest['n_nodes']} nodos) en {COMPILED_MODEL_DIR}")
@@ -1,9 +1,11 @@
+import hashlib
 import os
 import pickle
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
 import pandas as pd
 
+from app.ml.forest import export_forest
+
 def create_initial_model():
     """Crea un modelo inicial básico para demostraciones si no existe uno entrenado."""
     
@@ -16,6 +18,9 @@ def create_initial_model():
 
     print("Creando modelo inicial básico...")
     
+    # scikit-learn solo se necesita para entrenar, no para servir el modelo
+    from sklearn.ensemble import RandomForestClassifier
+    
     # Crear directorios si no existen
     os.makedirs(os.path.dirname(model_path), exist_ok=True)
     
@@ -38,8 +43,12 @@ def create_initial_model():
     model.fit(X, y)
     
     # Guardar el modelo
+    model_bytes = pickle.dumps(model)
     with open(model_path, 'wb') as f:
-        pickle.dump(model, f)
+        f.write(model_bytes)
+    
+    # Guardar también la versión compilada que usa el servidor
+    export_forest(model, version=hashlib.sha256(model_bytes).hexdigest()[:12])
     
     print(f"Modelo inicial guardado en {model_path}")
 
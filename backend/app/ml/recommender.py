@@ -1,9 +1,12 @@
 #backend\app\ml\recomender.py
+import heapq
 import os
 import pickle
 import numpy as np
 import pandas as pd
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterable, List
+
+from app.ml.features import pair_features
 
 class FreelancerRecommender:
     """
@@ -11,7 +14,12 @@ class FreelancerRecommender:
     basado en modelos de Machine Learning.
     """
     
-    def __init__(self):
+    def __init__(self, model: Any = None):
+        # Usar el modelo recibido (p. ej. desde el registro de modelos) si lo hay
+        if model is not None:
+            self.model = model
+            return
+
         # Cargar el modelo entrenado
         model_path = os.path.join(os.path.dirname(__file__), "models", "trained_model.pkl")
         
@@ -24,93 +32,149 @@ class FreelancerRecommender:
                 self.model = pickle.load(f)
     
     def prepare_features(self, freelancer: Dict[str, Any], project: Dict[str, Any]) -> pd.DataFrame:
-        """Prepara las características para la predicción del modelo."""
-        
-        # Calcular coincidencia de habilidades
-        freelancer_skills = set(freelancer.get('skills', []))
-        project_skills = set(project.get('skills_required', []))
-        
-        # Número de habilidades coincidentes
-        skill_match_count = len(freelancer_skills.intersection(project_skills))
-        
-        # Porcentaje de habilidades requeridas que posee el freelancer
-        skill_match_pct = skill_match_count / len(project_skills) if project_skills else 0
-        
-        # Coincidencia de área
-        area_match = 1 if freelancer.get('area_expertise') == project.get('area') else 0
-        
-        # Crear DataFrame con las características
-        features = pd.DataFrame({
-            'experience_years': [freelancer.get('experience_years', 0)],
-            'hourly_rate': [freelancer.get('hourly_rate', 0)],
-            'rating': [freelancer.get('rating', 0)],
-            'skill_match_count': [skill_match_count],
-            'skill_match_pct': [skill_match_pct],
-            'area_match': [area_match],
-            'budget': [project.get('budget', 0)]
-        })
-        
-        return features
+        """Prepara las características para la predicción del modelo (las mismas que en el lote)."""
+        return pair_features([freelancer], [project])
     
+    def prepare_features_batch(self, freelancers: List[Dict[str, Any]], projects: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Prepara las características de varios pares (freelancer, proyecto) en una sola matriz.
+
+        Las listas deben tener la misma longitud o una de ellas un solo elemento,
+        que se reutiliza para todos los pares.
+        """
+        return pair_features(freelancers, projects)
+
     def predict_match(self, freelancer: Dict[str, Any], project: Dict[str, Any]) -> float:
         """Predice la probabilidad de coincidencia entre un freelancer y un proyecto."""
-        
+        return float(self.predict_matches([freelancer], [project])[0])
+
+    def predict_matches(self, freelancers: List[Dict[str, Any]], projects: List[Dict[str, Any]]) -> np.ndarray:
+        """Predice la probabilidad de coincidencia de varios pares con una sola llamada al modelo."""
+
         if self.model is None:
             raise ValueError("El modelo no ha sido cargado. Entrene el modelo primero.")
-        
-        # Preparar características
-        features = self.prepare_features(freelancer, project)
-        
-        # Predecir probabilidad
+
+        if not freelancers or not projects:
+            return np.zeros(0, dtype=np.float64)
+
+        features = self.prepare_features_batch(freelancers, projects)
         probabilities = self.model.predict_proba(features)
-        
-        # Retornar probabilidad de match (clase 1)
-        return float(probabilities[0][1])
-    
+        return np.asarray(probabilities[:, 1], dtype=np.float64)
+
+    @staticmethod
+    def top_n_indices(scores: np.ndarray, top_n: int) -> List[int]:
+        """Índices de los top_n puntajes en orden descendente.
+
+        Usa una selección parcial en lugar de ordenar todo el arreglo y, ante
+        empates, conserva el orden original (igual que un sort estable).
+        """
+        n = len(scores)
+        if n == 0 or top_n <= 0:
+            return []
+        if top_n < n:
+            # Umbral del k-ésimo mayor; se incluyen todos los empatados con él
+            threshold = np.partition(scores, n - top_n)[n - top_n]
+            candidates = np.flatnonzero(scores >= threshold)
+        else:
+            candidates = np.arange(n)
+        order = np.argsort(-scores[candidates], kind='stable')
+        return candidates[order][:top_n].tolist()
+
     def recommend_freelancers(self, project: Dict[str, Any], freelancers: List[Dict[str, Any]], top_n: int = 5) -> List[Dict[str, Any]]:
         """Recomienda los mejores freelancers para un proyecto dado."""
         
         if self.model is None:
             raise ValueError("El modelo no ha sido cargado. Entrene el modelo primero.")
         
-        results = []
-        
-        for freelancer in freelancers:
-            # Calcular probabilidad de match
-            match_probability = self.predict_match(freelancer, project)
-            
-            # Añadir a resultados
-            results.append({
+        # Calcular probabilidades de match de todos los candidatos a la vez
+        scores = self.predict_matches(freelancers, [project])
+        
+        # Devolver los top_n resultados ordenados por probabilidad (descendente)
+        return [
+            {
+                'freelancer': freelancers[i],
+                'match_probability': float(scores[i])
+            }
+            for i in self.top_n_indices(scores, top_n)
+        ]
+    
+    def recommend_freelancers_streaming(self, project: Dict[str, Any], freelancer_chunks: Iterable[List[Dict[str, Any]]],
+                                        top_n: int = 5) -> List[Dict[str, Any]]:
+        """Recomienda freelancers recorriendo el conjunto por bloques.
+
+        Cada bloque se puntúa con una sola llamada al modelo y solo se conservan
+        los top_n mejores vistos hasta el momento (un heap), así la memoria no
+        depende del tamaño del conjunto. Ante empates gana el que llegó primero,
+        igual que `recommend_freelancers` sobre la lista completa.
+        """
+
+        if self.model is None:
+            raise ValueError("El modelo no ha sido cargado. Entrene el modelo primero.")
+
+        if top_n <= 0:
+            return []
+
+        # Heap de mínimos con (puntaje, -posición): la raíz es el peor de los retenidos
+        heap = []
+        position = 0
+        for chunk in freelancer_chunks:
+            scores = self.predict_matches(chunk, [project])
+            for i in sorted(self.top_n_indices(scores, top_n)):
+                entry = (float(scores[i]), -(position + i), chunk[i])
+                if len(heap) < top_n:
+                    heapq.heappush(heap, entry)
+                elif entry[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, entry)
+            position += len(chunk)
+
+        return [
+            {
                 'freelancer': freelancer,
-                'match_probability': match_probability
-            })
-        
-        # Ordenar por probabilidad de match (descendente)
-        results.sort(key=lambda x: x['match_probability'], reverse=True)
-        
-        # Devolver los top_n resultados
-        return results[:top_n]
+                'match_probability': score
+            }
+            for score, _, freelancer in sorted(heap, key=lambda entry: (-entry[0], -entry[1]))
+        ]
     
+    def recommend_freelancers_from_features(self, freelancer_ids: np.ndarray, features: pd.DataFrame,
+                                            top_n: int = 5, chunk_size: int = 1000) -> List[Dict[str, Any]]:
+        """Recomienda freelancers a partir de una matriz de características ya armada.
+
+        Pensado para el almacén de características en memoria: la matriz se
+        puntúa por bloques de `chunk_size` filas y ante empates gana el primero
+        (`freelancer_ids` ascendentes, igual que al recorrer la base por id).
+        """
+
+        if self.model is None:
+            raise ValueError("El modelo no ha sido cargado. Entrene el modelo primero.")
+
+        if len(freelancer_ids) == 0 or top_n <= 0:
+            return []
+
+        scores = np.concatenate([
+            np.asarray(self.model.predict_proba(features.iloc[start:start + chunk_size])[:, 1], dtype=np.float64)
+            for start in range(0, len(features), chunk_size)
+        ])
+        return [
+            {
+                'freelancer': {'id': int(freelancer_ids[i])},
+                'match_probability': float(scores[i])
+            }
+            for i in self.top_n_indices(scores, top_n)
+        ]
+
     def recommend_projects(self, freelancer: Dict[str, Any], projects: List[Dict[str, Any]], top_n: int = 5) -> List[Dict[str, Any]]:
         """Recomienda los mejores proyectos para un freelancer dado."""
         
         if self.model is None:
             raise ValueError("El modelo no ha sido cargado. Entrene el modelo primero.")
         
-        results = []
-        
-        for project in projects:
-            # Calcular probabilidad de match
-            match_probability = self.predict_match(freelancer, project)
-            
-            # Añadir a resultados
-            results.append({
-                'project': project,
-                'match_probability': match_probability
-            })
-        
-        # Ordenar por probabilidad de match (descendente)
-        results.sort(key=lambda x: x['match_probability'], reverse=True)
-        
-        # Devolver los top_n resultados
-        return results[:top_n]
\ No newline at end of file
+        # Calcular probabilidades de match de todos los proyectos a la vez
+        scores = self.predict_matches([freelancer], projects)
+        
+        # Devolver los top_n resultados ordenados por probabilidad (descendente)
+        return [
+            {
+                'project': projects[i],
+                'match_probability': float(scores[i])
+            }
+            for i in self.top_n_indices(scores, top_n)
+        ]
\ No newline at end of file
@@ -0,0 +1,186 @@
+# app/ml/registry.py
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, NamedTuple, Optional
+
+from app.core.config import settings
+from app.ml.batching import BatchedModel, inference_batcher
+from app.ml.forest import COMPILED_MODEL_DIR, MANIFEST_FILE, CompiledForest
+from app.ml.recommender import FreelancerRecommender
+
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(__file__), "models", "trained_model.pkl")
+
+logger = logging.getLogger(__name__)
+
+
+def _mtime(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+class LoadedModel(NamedTuple):
+    """Modelo cargado junto con sus metadatos. Es inmutable para poder
+    reemplazarlo de forma atómica."""
+    recommender: Optional[FreelancerRecommender]
+    version: Optional[str]
+    loaded_at: Optional[datetime]
+    file_mtime: Optional[float]
+    file_size: Optional[int]
+    source: Optional[str] = None
+
+
+EMPTY_MODEL = LoadedModel(None, None, None, None, None)
+
+
+class ModelRegistry:
+    """
+    Registro del modelo de recomendación compartido por todo el proceso.
+
+    El modelo se deserializa una sola vez y se reutiliza entre peticiones.
+    Cada cierto intervalo se revisa el archivo del modelo y, si cambió, se
+    carga la nueva versión y se reemplaza la referencia en un solo paso: las
+    peticiones en curso siguen usando el recomendador que ya obtuvieron.
+
+    Si existe el modelo compilado (ver `app.ml.forest`) y no es más antiguo
+    que el pickle, se usa ese, que se mapea en memoria sin importar
+    scikit-learn; si no, el pickle (p. ej. reentrenado sin volver a exportar).
+    """
+
+    def __init__(self, model_path: str = DEFAULT_MODEL_PATH, compiled_dir: Optional[str] = COMPILED_MODEL_DIR,
+                 check_interval: float = None):
+        self.model_path = model_path
+        self.compiled_dir = compiled_dir if settings.MODEL_USE_COMPILED else None
+        self.check_interval = (
+            settings.MODEL_RELOAD_INTERVAL_SECONDS if check_interval is None else check_interval
+        )
+        self._current: Optional[LoadedModel] = None
+        self._last_check = 0.0
+        self._load_lock = threading.Lock()
+
+    def _source(self):
+        """
+        Archivo a vigilar y tipo de modelo: el manifiesto compilado si existe y
+        es al menos tan reciente como el pickle, o el pickle.
+        """
+        if self.compiled_dir is not None:
+            manifest_path = os.path.join(self.compiled_dir, MANIFEST_FILE)
+            manifest_mtime = _mtime(manifest_path)
+            if manifest_mtime is not None:
+                pickle_mtime = _mtime(self.model_path)
+                # publish_model escribe el pickle y después el manifiesto
+                if pickle_mtime is None or manifest_mtime >= pickle_mtime:
+                    return "compiled", manifest_path
+        return "pickle", self.model_path
+
+    def _file_signature(self):
+        source, path = self._source()
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None, None, None
+        return source, stat.st_mtime, stat.st_size
+
+    def _load(self) -> LoadedModel:
+        source, mtime, size = self._file_signature()
+        if mtime is None:
+            logger.warning("Modelo no encontrado. Ejecute primero train_model.py para entrenar el modelo.")
+            return EMPTY_MODEL
+
+        if source == "compiled":
+            forest = CompiledForest.load(self.compiled_dir)
+            model, version = forest, forest.version
+        else:
+            with open(self.model_path, 'rb') as f:
+                data = f.read()
+            model, version = pickle.loads(data), hashlib.sha256(data).hexdigest()[:12]
+
+        if settings.RECOMMENDER_BATCH_WAIT_MS > 0:
+            # Las peticiones concurrentes comparten llamadas a predict_proba
+            model = BatchedModel(model, inference_batcher)
+
+        return LoadedModel(
+            recommender=FreelancerRecommender(model=model),
+            version=version,
+            loaded_at=datetime.utcnow(),
+            file_mtime=mtime,
+            file_size=size,
+            source=source,
+        )
+
+    def _swap(self, current: Optional[LoadedModel], raise_errors: bool = False) -> LoadedModel:
+        try:
+            loaded = self._load()
+        except Exception:
+            if raise_errors:
+                # Quien pidió la recarga recibe el error; se sigue sirviendo la versión anterior
+                raise
+            # Si el archivo está corrupto o a medio escribir se mantiene la versión anterior
+            logger.exception("Error cargando el modelo %s", self.model_path)
+            loaded = current or EMPTY_MODEL
+        self._current = loaded
+        return loaded
+
+    def reload(self) -> LoadedModel:
+        """
+        Fuerza la carga del modelo desde disco (p. ej. desde un endpoint de admin).
+        Si falla, propaga el error y se mantiene el modelo que se estaba usando.
+        """
+        with self._load_lock:
+            self._last_check = time.monotonic()
+            return self._swap(self._current, raise_errors=True)
+
+    def get(self) -> LoadedModel:
+        """Devuelve el modelo actual, recargándolo si el archivo cambió."""
+        current = self._current
+        if current is None:
+            with self._load_lock:
+                if self._current is None:
+                    self._last_check = time.monotonic()
+                    return self._swap(None)
+                return self._current
+
+        if self.check_interval < 0 or time.monotonic() - self._last_check < self.check_interval:
+            return current
+
+        # Si otro hilo ya está revisando o cargando, se sigue con la versión actual
+        if not self._load_lock.acquire(blocking=False):
+            return current
+        try:
+            self._last_check = time.monotonic()
+            if self._file_signature() == (current.source, current.file_mtime, current.file_size):
+                return current
+            return self._swap(current)
+        finally:
+            self._load_lock.release()
+
+    def get_recommender(self) -> FreelancerRecommender:
+        recommender = self.get().recommender
+        if recommender is None:
+            raise ValueError("El modelo no ha sido cargado. Entrene el modelo primero.")
+        return recommender
+
+    @property
+    def version(self) -> Optional[str]:
+        return self.get().version
+
+    def info(self) -> Dict[str, Any]:
+        current = self.get()
+        return {
+            "model_path": self.model_path,
+            "source": current.source,
+            "version": current.version,
+            "loaded_at": current.loaded_at,
+            "file_size": current.file_size,
+            "is_loaded": current.recommender is not None,
+        }
+
+
+# Registro compartido por todo el proceso
+model_registry = ModelRegistry()
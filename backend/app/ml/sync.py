@@ -0,0 +1,99 @@
+# app/ml/sync.py
+"""
+Propaga a las estructuras en memoria del recomendador los cambios guardados
+en la base, como parte de la misma unidad de trabajo.
+
+En cada flush se anotan los usuarios y proyectos modificados en atributos
+que usa el recomendador; al confirmarse la transacción se actualizan el
+índice de candidatos y el almacén de características, y se incrementan las
+generaciones que invalidan las cachés. Si la transacción se revierte, lo
+anotado se descarta. Cubre cualquier cambio hecho por el ORM (CRUD,
+endpoints o scripts), no solo los de app.crud.
+"""
+from typing import Dict, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.ml.cache import freelancer_pool_generation, open_projects_generation
+from app.ml.candidates import freelancer_index
+from app.ml.feature_store import freelancer_features
+from app.models.models import Project, User
+
+# Atributos de los que dependen el índice, las características y el ranking de proyectos
+USER_ATTRIBUTES = ("is_freelancer", "experience_years", "hourly_rate", "rating", "area_expertise", "skills")
+PROJECT_ATTRIBUTES = ("status", "budget", "area", "client_id", "skills_required")
+
+
+class _PendingChanges:
+    """Cambios anotados en la transacción en curso de una sesión."""
+
+    def __init__(self):
+        # Usuarios tocados en el último flush (None si se eliminaron)
+        self.users: Dict[int, Optional[User]] = {}
+        # Entradas (índice, características) ya calculadas, por id de usuario
+        self.entries: Dict[int, tuple] = {}
+        self.projects_changed = False
+
+
+def _pending(session: Session) -> _PendingChanges:
+    return session.info.setdefault("recommender_changes", _PendingChanges())
+
+
+def _changed(obj, attributes) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in attributes)
+
+
+@event.listens_for(Session, "after_flush")
+def _record_changes(session: Session, flush_context) -> None:
+    # Aquí todavía se ven las listas new/dirty/deleted y el historial de cada atributo
+    for obj in session.new:
+        if isinstance(obj, User):
+            _pending(session).users[obj.id] = obj
+        elif isinstance(obj, Project):
+            _pending(session).projects_changed = True
+    for obj in session.dirty:
+        if isinstance(obj, User) and _changed(obj, USER_ATTRIBUTES):
+            _pending(session).users[obj.id] = obj
+        elif isinstance(obj, Project) and _changed(obj, PROJECT_ATTRIBUTES):
+            _pending(session).projects_changed = True
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            _pending(session).users[obj.id] = None
+        elif isinstance(obj, Project):
+            _pending(session).projects_changed = True
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _snapshot_users(session: Session, flush_context) -> None:
+    # Después del commit los objetos quedan expirados: las entradas se calculan ahora
+    pending = session.info.get("recommender_changes")
+    if pending is None:
+        return
+    for user_id, user in pending.users.items():
+        if user is None:
+            pending.entries[user_id] = (None, None)
+        else:
+            pending.entries[user_id] = (freelancer_index.entry_for(user), freelancer_features.entry_for(user))
+    pending.users.clear()
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(session: Session) -> None:
+    pending = session.info.pop("recommender_changes", None)
+    if pending is None:
+        return
+    for user_id, (index_entry, feature_entry) in pending.entries.items():
+        freelancer_index.set_entry(user_id, index_entry)
+        freelancer_features.set_entry(user_id, feature_entry)
+    if pending.entries:
+        # Invalida las recomendaciones en caché calculadas con el conjunto anterior
+        freelancer_pool_generation.bump()
+    if pending.projects_changed:
+        open_projects_generation.bump()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop("recommender_changes", None)
@@ -1,8 +1,16 @@
+import os
 import pandas as pd
 import numpy as np
 import random
 from sklearn.preprocessing import LabelEncoder
 
+from app.ml.features import SkillVocabulary, popcount, skill_overlap
+from app.ml.training.dataset import ColumnarWriter
+
+DATA_DIR = "app/ml/training/data"
+# Conjunto de entrenamiento columnar (un archivo binario por columna + manifiesto)
+TRAINING_SET_DIR = os.path.join(DATA_DIR, "training_set")
+
 def generate_user_data(n_users=100):
     """Genera datos sintéticos de usuarios para entrenar el modelo de recomendación."""
     
@@ -91,75 +99,136 @@ def generate_project_data(n_projects=200, n_users=100):
     
     return pd.DataFrame(projects)
 
-def generate_matching_data(users_df, projects_df):
-    """Genera datos de emparejamiento para entrenar un modelo de recomendación."""
+def _sample_excluding(rng, n_options, excluded, size):
+    """
+    Posiciones uniformes en [0, n_options) que evitan `excluded` (una por
+    muestra, -1 si no hay nada que excluir): se sortea entre n_options - 1
+    valores y se salta la posición excluida.
+    """
+    has_excluded = excluded >= 0
+    draws = np.floor(rng.random(size) * (n_options - has_excluded)).astype(np.int64)
+    return draws + (has_excluded & (draws >= excluded))
+
+def generate_matching_data(users_df, projects_df, negatives_per_positive=3, hard_negative_ratio=0.0,
+                           random_state=None):
+    """
+    Genera datos de emparejamiento para entrenar un modelo de recomendación.
+
+    Cada proyecto asignado aporta un ejemplo positivo (su freelancer) y
+    `negatives_per_positive` negativos, sorteados todos a la vez con NumPy entre
+    los freelancers distintos del positivo. Una fracción `hard_negative_ratio`
+    de los negativos se toma del área del proyecto (negativos difíciles); si el
+    área no tiene otros freelancers se sortea entre todos.
+    """
+    rng = np.random.default_rng(random_state)
     
     # Filtrar usuarios freelancer
-    freelancers = users_df[users_df["is_freelancer"]].copy()
+    freelancers = users_df[users_df["is_freelancer"]].reset_index(drop=True)
     
     # Filtrar proyectos asignados
-    assigned_projects = projects_df[projects_df["is_assigned"]].copy()
-    
-    # Crear datos de emparejamiento
-    matches = []
-    
-    # Para proyectos asignados, crear ejemplos positivos
-    for _, project in assigned_projects.iterrows():
-        freelancer_id = project["freelancer_id"]
-        project_id = project["project_id"]
+    assigned_projects = projects_df[projects_df["is_assigned"]]
+    n_positive = len(assigned_projects)
+    n_freelancers = len(freelancers)
+    
+    # Ejemplos positivos (match real); el freelancer puede no estar entre los freelancers (-1)
+    positive_ids = assigned_projects["freelancer_id"].to_numpy(dtype=np.float64)
+    positive_pos = pd.Index(freelancers["user_id"]).get_indexer(positive_ids)
+    
+    # Ejemplos negativos (freelancers que no fueron seleccionados), k por positivo
+    k = negatives_per_positive
+    excluded = np.repeat(positive_pos, k)
+    negative_pos = np.full(len(excluded), -1, dtype=np.int64)
+    drawable = n_freelancers - (excluded >= 0) > 0
+    negative_pos[drawable] = _sample_excluding(rng, n_freelancers, excluded[drawable], drawable.sum())
+    
+    hard = drawable & (rng.random(len(excluded)) < hard_negative_ratio)
+    if hard.any():
+        # Freelancers agrupados por área: cada área es un tramo contiguo de `by_area`
+        area_codes, areas = pd.factorize(freelancers["area_expertise"])
+        by_area = np.argsort(area_codes, kind="stable")
+        area_start = np.searchsorted(area_codes[by_area], np.arange(len(areas)))
+        area_count = np.bincount(area_codes[area_codes >= 0], minlength=len(areas))
+        rank_in_area = np.empty(n_freelancers, dtype=np.int64)
+        rank_in_area[by_area] = np.arange(n_freelancers)
         
-        # Ejemplo positivo (match real)
-        matches.append({
-            "freelancer_id": freelancer_id,
-            "project_id": project_id,
-            "match": 1
-        })
+        project_area = np.repeat(pd.Index(areas).get_indexer(assigned_projects["area"]), k)
+        count = np.where(project_area >= 0, area_count[np.maximum(project_area, 0)], 0)
+        # Si el positivo es del área del proyecto, se excluye dentro del tramo
+        positive_in_area = (excluded >= 0) & (project_area >= 0) & (
+            area_codes[np.maximum(excluded, 0)] == project_area
+        )
+        hard &= count - positive_in_area > 0
         
-        # Ejemplos negativos (freelancers que no fueron seleccionados)
-        for _ in range(3):  # 3 ejemplos negativos por cada positivo
-            random_freelancer = freelancers.sample(1).iloc[0]
-            if random_freelancer["user_id"] != freelancer_id:
-                matches.append({
-                    "freelancer_id": random_freelancer["user_id"],
-                    "project_id": project_id,
-                    "match": 0
-                })
-    
-    matches_df = pd.DataFrame(matches)
-    
-    # Combinar con características de freelancer y proyecto
-    result = matches_df.merge(
-        freelancers.rename(columns={"user_id": "freelancer_id"}),
-        on="freelancer_id",
-        how="left"
+        start = area_start[project_area[hard]]
+        positive_rank = np.where(
+            positive_in_area[hard], rank_in_area[np.maximum(excluded[hard], 0)] - start, -1
+        )
+        offsets = _sample_excluding(rng, count[hard], positive_rank, hard.sum())
+        negative_pos[hard] = by_area[start + offsets]
+    
+    # Filas en orden: el positivo de cada proyecto seguido de sus negativos
+    freelancer_pos = np.column_stack([positive_pos, negative_pos.reshape(n_positive, k)])
+    valid = np.column_stack([np.ones(n_positive, dtype=bool), (negative_pos >= 0).reshape(n_positive, k)])
+    # La posición -1 toma el NaN agregado al final
+    freelancer_ids = np.append(freelancers["user_id"].to_numpy(dtype=np.float64), np.nan)[freelancer_pos]
+    freelancer_ids[:, 0] = positive_ids
+    
+    matches_df = pd.DataFrame({
+        "freelancer_id": freelancer_ids[valid],
+        "project_id": np.repeat(assigned_projects["project_id"].to_numpy(), k + 1).reshape(n_positive, k + 1)[valid],
+        "match": np.tile(np.r_[1, np.zeros(k, dtype=np.int64)], (n_positive, 1))[valid],
+    })
+    
+    # Combinar con características de freelancer y proyecto por posición, sin merge
+    freelancer_features = freelancers.drop(columns=["user_id"]).reindex(freelancer_pos[valid])
+    project_pos = pd.Index(projects_df["project_id"]).get_indexer(matches_df["project_id"])
+    project_features = projects_df.drop(columns=["project_id"]).iloc[project_pos]
+    
+    # Mismos nombres de columna que produce el merge (freelancer_id aparece en ambos lados)
+    matches_df = matches_df.rename(columns={"freelancer_id": "freelancer_id_x"})
+    project_features = project_features.rename(columns={"freelancer_id": "freelancer_id_y"})
+    
+    return pd.concat(
+        [matches_df, freelancer_features.reset_index(drop=True), project_features.reset_index(drop=True)],
+        axis=1
     )
-    
-    result = result.merge(
-        projects_df.rename(columns={"project_id": "project_id"}),
-        on="project_id",
-        how="left"
+
+def _encode_skill_column(vocabulary, column):
+    """
+    Máscaras de bits de una columna de listas de habilidades. En los pares
+    generados, el mismo freelancer o proyecto aparece en muchas filas
+    compartiendo el mismo objeto lista: cada lista distinta se codifica una
+    sola vez y su máscara se reparte a todas sus filas. Los valores que no son
+    lista (NaN de un freelancer sin datos) cuentan como sin habilidades.
+    """
+    values = column.to_numpy(dtype=object)
+    codes, uniques = pd.factorize(np.fromiter(map(id, values), dtype=np.uint64, count=len(values)))
+    # Primera fila de cada objeto distinto
+    first_rows = np.empty(len(uniques), dtype=np.int64)
+    first_rows[codes[::-1]] = np.arange(len(values) - 1, -1, -1)
+    masks = vocabulary.encode_many(
+        values[i] if isinstance(values[i], list) else [] for i in first_rows
     )
-    
-    return result
+    return masks[codes]
 
 def prepare_features(data):
     """Prepara características para el entrenamiento del modelo."""
     
-    # Crear características basadas en habilidades
+    # Crear características basadas en habilidades: cada lista de habilidades se
+    # codifica como máscara de bits y la coincidencia es un AND + conteo de bits
+    vocabulary = SkillVocabulary()
+    freelancer_masks = _encode_skill_column(vocabulary, data['skills'])
+    project_masks = _encode_skill_column(vocabulary, data['skills_required'])
+    
     # Contar cuántas habilidades coinciden entre el freelancer y el proyecto
-    data['skill_match_count'] = data.apply(
-        lambda row: len(set(row['skills']).intersection(set(row['skills_required']))) 
-            if isinstance(row['skills'], list) and isinstance(row['skills_required'], list) 
-            else 0, 
-        axis=1
-    )
+    data['skill_match_count'] = skill_overlap(freelancer_masks, project_masks)
     
     # Porcentaje de habilidades requeridas que posee el freelancer
-    data['skill_match_pct'] = data.apply(
-        lambda row: len(set(row['skills']).intersection(set(row['skills_required']))) / len(set(row['skills_required']))
-            if isinstance(row['skills_required'], list) and len(row['skills_required']) > 0
-            else 0,
-        axis=1
+    project_skill_count = popcount(project_masks)
+    data['skill_match_pct'] = np.divide(
+        data['skill_match_count'].to_numpy(), project_skill_count,
+        out=np.zeros(len(data), dtype=np.float64),
+        where=project_skill_count > 0
     )
     
     # Coincidencia de área de expertise
@@ -174,7 +243,13 @@ def prepare_features(data):
     
     return X, y
 
-def generate_training_data(save_to_csv=True):
+def write_training_set(X, y, directory=TRAINING_SET_DIR, metadata=None):
+    """Guarda las características y la etiqueta en el formato columnar que lee train_model."""
+    with ColumnarWriter(directory, metadata=metadata) as writer:
+        writer.append({**{name: X[name].to_numpy() for name in X.columns}, 'match': y.to_numpy()})
+    return directory
+
+def generate_training_data(save=True):
     """Genera un conjunto completo de datos de entrenamiento."""
     
     # Generar datos de usuarios y proyectos
@@ -190,26 +265,26 @@ def generate_training_data(save_to_csv=True):
     print("Preparando características...")
     X, y = prepare_features(matching_data)
     
-    if save_to_csv:
+    if save:
         print("Guardando datos...")
-        users_df.to_csv("app/ml/training/data/users.csv", index=False)
-        projects_df.to_csv("app/ml/training/data/projects.csv", index=False)
-        matching_data.to_csv("app/ml/training/data/matching.csv", index=False)
+        os.makedirs(DATA_DIR, exist_ok=True)
+        # Formato binario: las columnas de listas (habilidades) se conservan como listas
+        users_df.to_pickle(os.path.join(DATA_DIR, "users.pkl"))
+        projects_df.to_pickle(os.path.join(DATA_DIR, "projects.pkl"))
+        matching_data.to_pickle(os.path.join(DATA_DIR, "matching.pkl"))
         
         # Guardar datos de entrenamiento
-        training_data = pd.concat([X, y], axis=1)
-        training_data.to_csv("app/ml/training/data/training_data.csv", index=False)
+        write_training_set(X, y, metadata={"source": "synthetic"})
     
     return X, y, users_df, projects_df, matching_data
 
 if __name__ == "__main__":
     # Crear directorio de datos si no existe
-    import os
-    os.makedirs("app/ml/training/data", exist_ok=True)
+    os.makedirs(DATA_DIR, exist_ok=True)
     
     # Generar datos
     X, y, users_df, projects_df, matching_data = generate_training_data()
     
     print(f"Generados {len(users_df)} usuarios")
     print(f"Generados {len(projects_df)} proyectos")
-    print(f"Generados {len(matching_data)} ejemplos de emparejamiento")
\ No newline at end of file
+    print(f"Generados {len(matching_data)} ejemplos de emparejamiento")
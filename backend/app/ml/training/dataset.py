@@ -0,0 +1,162 @@
+# app/ml/training/dataset.py
+import json
+import os
+import shutil
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+MANIFEST_FILE = "manifest.json"
+FORMAT_VERSION = 1
+
+
+class ColumnarWriter:
+    """
+    Escribe un conjunto de datos columnar en disco: un archivo binario crudo por
+    columna (los valores de NumPy tal cual, sin encabezado) y un manifiesto JSON
+    con el esquema y la cantidad de filas.
+
+    Las filas se agregan por bloques, así que nunca hace falta tener el conjunto
+    completo en memoria. Se escribe en un directorio temporal que reemplaza al
+    destino recién al cerrar: quien lea el directorio ve el conjunto anterior
+    o el nuevo completo, nunca uno a medias.
+    """
+
+    def __init__(self, directory: str, schema: Optional[Mapping[str, Any]] = None,
+                 metadata: Optional[Dict[str, Any]] = None):
+        self.directory = directory
+        self.metadata = dict(metadata or {})
+        self.n_rows = 0
+        self._tmp_dir = directory + ".partial"
+        self._schema: Optional[Dict[str, np.dtype]] = (
+            {name: np.dtype(dtype) for name, dtype in schema.items()} if schema is not None else None
+        )
+        self._files = {}
+
+        if os.path.exists(self._tmp_dir):
+            shutil.rmtree(self._tmp_dir)
+        os.makedirs(self._tmp_dir)
+
+    def _open_files(self) -> None:
+        for name in self._schema:
+            self._files[name] = open(os.path.join(self._tmp_dir, f"{name}.bin"), "wb")
+
+    def append(self, columns) -> None:
+        """Agrega un bloque de filas (DataFrame o diccionario columna -> arreglo)."""
+        if isinstance(columns, pd.DataFrame):
+            columns = {name: columns[name].to_numpy() for name in columns.columns}
+
+        if self._schema is None:
+            # Sin esquema explícito, lo fija el primer bloque
+            self._schema = {name: np.asarray(values).dtype for name, values in columns.items()}
+        if not self._files:
+            self._open_files()
+
+        missing = set(self._schema) - set(columns)
+        if missing:
+            raise ValueError(f"Faltan columnas en el bloque: {sorted(missing)}")
+
+        lengths = {len(columns[name]) for name in self._schema}
+        if len(lengths) > 1:
+            raise ValueError("Las columnas del bloque tienen longitudes distintas")
+
+        for name, dtype in self._schema.items():
+            np.ascontiguousarray(columns[name], dtype=dtype).tofile(self._files[name])
+        self.n_rows += lengths.pop() if lengths else 0
+
+    def close(self) -> Dict[str, Any]:
+        """Escribe el manifiesto y publica el directorio."""
+        if self._schema is None:
+            self._schema = {}
+        if not self._files:
+            self._open_files()
+        for handle in self._files.values():
+            handle.close()
+
+        manifest = {
+            "format_version": FORMAT_VERSION,
+            "n_rows": self.n_rows,
+            "columns": [
+                {"name": name, "dtype": dtype.str, "file": f"{name}.bin"}
+                for name, dtype in self._schema.items()
+            ],
+            "created_at": datetime.utcnow().isoformat(),
+            "metadata": self.metadata,
+        }
+        with open(os.path.join(self._tmp_dir, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f, indent=2, default=str)
+
+        # Reemplazar el conjunto anterior (si lo hay) por el nuevo
+        old_dir = self.directory + ".old"
+        if os.path.exists(old_dir):
+            shutil.rmtree(old_dir)
+        if os.path.exists(self.directory):
+            os.replace(self.directory, old_dir)
+        os.replace(self._tmp_dir, self.directory)
+        if os.path.exists(old_dir):
+            shutil.rmtree(old_dir)
+        return manifest
+
+    def abort(self) -> None:
+        for handle in self._files.values():
+            handle.close()
+        shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class ColumnarDataset:
+    """Conjunto columnar abierto; con `mmap` cada columna es un np.memmap de solo lectura."""
+
+    def __init__(self, directory: str, mmap: bool = True):
+        self.directory = directory
+        with open(os.path.join(directory, MANIFEST_FILE)) as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Formato de conjunto de datos no soportado: {self.manifest.get('format_version')}")
+
+        self.n_rows: int = self.manifest["n_rows"]
+        self.metadata: Dict[str, Any] = self.manifest.get("metadata", {})
+        self.columns: Dict[str, np.ndarray] = {}
+        for column in self.manifest["columns"]:
+            path = os.path.join(directory, column["file"])
+            dtype = np.dtype(column["dtype"])
+            if self.n_rows == 0:
+                # np.memmap no admite archivos vacíos
+                self.columns[column["name"]] = np.empty(0, dtype=dtype)
+            elif mmap:
+                self.columns[column["name"]] = np.memmap(path, dtype=dtype, mode="r", shape=(self.n_rows,))
+            else:
+                self.columns[column["name"]] = np.fromfile(path, dtype=dtype, count=self.n_rows)
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self.columns)
+
+    def to_frame(self, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """DataFrame con las columnas pedidas (sin copiar si pandas puede evitarlo)."""
+        names = list(columns) if columns is not None else self.column_names
+        return pd.DataFrame({name: self.columns[name] for name in names}, columns=names, copy=False)
+
+
+def open_dataset(directory: str, mmap: bool = True) -> ColumnarDataset:
+    return ColumnarDataset(directory, mmap=mmap)
+
+
+def dataset_exists(directory: str) -> bool:
+    return os.path.exists(os.path.join(directory, MANIFEST_FILE))
@@ -0,0 +1,192 @@
+# app/ml/training/evaluate.py
+"""
+Evaluación offline de modelos: calidad del ranking y costo de servirlos.
+
+Reproduce proyectos históricos a partir de un conjunto extraído con
+app.ml.training.extract (postulaciones aceptadas = relevantes, rechazadas =
+no relevantes): para cada proyecto se puntúan sus candidatos con una sola
+llamada al modelo, como en el servidor, y se ordenan por probabilidad.
+
+Para cada artefacto (pickle o directorio compilado) se informa NDCG@k,
+recall@k y MRR promediados sobre los proyectos, junto con el tamaño en disco,
+el tiempo de carga y la latencia de inferencia por candidato.
+
+Uso (desde backend/):
+    python -m app.ml.training.evaluate app/ml/models/trained_model.pkl app/ml/models/compiled
+    python -m app.ml.training.evaluate otro_modelo.pkl --dataset app/ml/training/data/applications --k 5 10
+"""
+import argparse
+import json
+import os
+import pickle
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.ml.features import FEATURE_COLUMNS
+from app.ml.forest import MANIFEST_FILE, CompiledForest
+from app.ml.training.dataset import open_dataset
+from app.ml.training.extract import DEFAULT_OUTPUT_DIR
+
+DEFAULT_K = (5, 10)
+
+
+def artifact_size(path: str) -> int:
+    """Bytes en disco del artefacto (un archivo o todos los archivos de un directorio)."""
+    if os.path.isdir(path):
+        return sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, names in os.walk(path) for name in names
+        )
+    return os.path.getsize(path)
+
+
+def load_artifact(path: str) -> Tuple[Any, float]:
+    """Carga un modelo en pickle o un bosque compilado; devuelve (modelo, segundos de carga)."""
+    if os.path.exists(os.path.join(path, MANIFEST_FILE)):
+        # Igual que el servidor: arreglos mapeados en memoria
+        started = time.perf_counter()
+        model = CompiledForest.load(path)
+        return model, time.perf_counter() - started
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    # La primera carga también importa los módulos de scikit-learn; se mide una recarga,
+    # que es lo que paga el servidor al publicar un modelo nuevo
+    pickle.loads(data)
+    started = time.perf_counter()
+    model = pickle.loads(data)
+    return model, time.perf_counter() - started
+
+
+def project_groups(project_ids: np.ndarray) -> List[np.ndarray]:
+    """Filas de cada proyecto (en orden de id de proyecto y, dentro de él, de fila)."""
+    order = np.argsort(project_ids, kind='stable')
+    bounds = np.flatnonzero(np.diff(project_ids[order])) + 1
+    return np.split(order, bounds)
+
+
+def ranking_metrics(scores: np.ndarray, labels: np.ndarray, ks: Sequence[int]) -> Dict[str, float]:
+    """
+    NDCG@k, recall@k y rango recíproco del primer relevante para un proyecto.
+    Ante empates se conserva el orden original, igual que el recomendador.
+    """
+    ranked = labels[np.argsort(-scores, kind='stable')].astype(np.float64)
+    n_relevant = ranked.sum()
+    discounts = 1.0 / np.log2(np.arange(2, len(ranked) + 2))
+
+    metrics = {}
+    for k in ks:
+        dcg = (ranked[:k] * discounts[:k]).sum()
+        ideal = discounts[:int(min(k, n_relevant))].sum()
+        metrics[f"ndcg@{k}"] = dcg / ideal if ideal > 0 else 0.0
+        metrics[f"recall@{k}"] = ranked[:k].sum() / n_relevant if n_relevant > 0 else 0.0
+    hits = np.flatnonzero(ranked)
+    metrics["mrr"] = 1.0 / (hits[0] + 1) if len(hits) else 0.0
+    return metrics
+
+
+def evaluate_model(model, features: pd.DataFrame, labels: np.ndarray, groups: List[np.ndarray],
+                   ks: Sequence[int] = DEFAULT_K) -> Dict[str, Any]:
+    """Puntúa cada proyecto por separado y promedia las métricas; mide la latencia de cada llamada."""
+    # Primera llamada fuera de la medición (carga perezosa de páginas, cachés de scikit-learn)
+    model.predict_proba(features.iloc[groups[0]])
+
+    per_project = []
+    latencies = np.zeros(len(groups))
+    for i, rows in enumerate(groups):
+        X = features.iloc[rows]
+        started = time.perf_counter()
+        scores = np.asarray(model.predict_proba(X)[:, 1], dtype=np.float64)
+        latencies[i] = time.perf_counter() - started
+        per_project.append(ranking_metrics(scores, labels[rows], ks))
+
+    n_candidates = sum(len(rows) for rows in groups)
+    result = {name: float(np.mean([m[name] for m in per_project])) for name in per_project[0]}
+    result.update({
+        "projects": len(groups),
+        "candidates": n_candidates,
+        "latency_us_per_candidate": latencies.sum() / n_candidates * 1e6,
+        "latency_ms_p50": float(np.percentile(latencies, 50) * 1e3),
+        "latency_ms_p99": float(np.percentile(latencies, 99) * 1e3),
+    })
+    return result
+
+
+def load_replay_set(dataset_dir: str, min_candidates: int = 2, max_projects: int = 0):
+    """
+    Características, etiquetas y grupos por proyecto del conjunto extraído.
+    Solo se reproducen proyectos con al menos un relevante y `min_candidates` candidatos.
+    """
+    dataset = open_dataset(dataset_dir)
+    if 'project_id' not in dataset.columns:
+        raise ValueError(f"{dataset_dir} no tiene la columna project_id; use un conjunto de app.ml.training.extract")
+
+    features = dataset.to_frame(FEATURE_COLUMNS)
+    labels = np.asarray(dataset['match'])
+    groups = [
+        rows for rows in project_groups(np.asarray(dataset['project_id']))
+        if len(rows) >= min_candidates and labels[rows].any()
+    ]
+    if max_projects > 0:
+        groups = groups[:max_projects]
+    return features, labels, groups
+
+
+def evaluate_artifacts(paths: Sequence[str], dataset_dir: str = DEFAULT_OUTPUT_DIR, ks: Sequence[int] = DEFAULT_K,
+                       min_candidates: int = 2, max_projects: int = 0) -> List[Dict[str, Any]]:
+    features, labels, groups = load_replay_set(dataset_dir, min_candidates, max_projects)
+    if not groups:
+        raise ValueError(f"No hay proyectos para evaluar en {dataset_dir}")
+    print(f"Reproduciendo {len(groups)} proyectos ({sum(len(rows) for rows in groups)} candidatos)")
+
+    results = []
+    for path in paths:
+        model, load_seconds = load_artifact(path)
+        result = {
+            "artifact": path,
+            "size_bytes": artifact_size(path),
+            "load_ms": load_seconds * 1e3,
+            **evaluate_model(model, features, labels, groups, ks),
+        }
+        results.append(result)
+        del model
+    return results
+
+
+def print_report(results: List[Dict[str, Any]], ks: Sequence[int]) -> None:
+    columns = [f"ndcg@{k}" for k in ks] + [f"recall@{k}" for k in ks] + [
+        "mrr", "latency_us_per_candidate", "latency_ms_p99", "size_bytes", "load_ms"
+    ]
+    table = pd.DataFrame(results).set_index("artifact")[columns]
+    table = table.rename(columns={
+        "latency_us_per_candidate": "us/cand", "latency_ms_p99": "p99 ms",
+        "size_bytes": "KB", "load_ms": "carga ms",
+    })
+    table["KB"] = table["KB"] / 1024
+    with pd.option_context("display.width", 200, "display.max_columns", None, "display.float_format", "{:.4g}".format):
+        print(table)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evalúa modelos por calidad de ranking y costo de inferencia")
+    parser.add_argument("artifacts", nargs="+", help="Modelos en pickle o directorios de modelos compilados")
+    parser.add_argument("--dataset", default=DEFAULT_OUTPUT_DIR,
+                        help="Conjunto extraído con app.ml.training.extract")
+    parser.add_argument("--k", type=int, nargs="+", default=list(DEFAULT_K))
+    parser.add_argument("--min-candidates", type=int, default=2)
+    parser.add_argument("--max-projects", type=int, default=0, help="0 = todos")
+    parser.add_argument("--output", default=None, help="Guardar los resultados en JSON")
+    args = parser.parse_args()
+
+    results = evaluate_artifacts(
+        args.artifacts, dataset_dir=args.dataset, ks=args.k,
+        min_candidates=args.min_candidates, max_projects=args.max_projects
+    )
+    print_report(results, args.k)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Resultados guardados en {args.output}")
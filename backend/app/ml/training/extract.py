@@ -0,0 +1,172 @@
+# app/ml/training/extract.py
+import argparse
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.ml.features import FEATURE_COLUMNS, SkillVocabulary, pair_features
+from app.ml.training.dataset import ColumnarWriter
+from app.models.models import (
+    ApplicationStatus, Project, ProjectApplication, Skill, User, project_skills, user_skills
+)
+
+DEFAULT_OUTPUT_DIR = "app/ml/training/data/applications"
+
+# Columnas del conjunto extraído: características, etiqueta y metadatos del par
+APPLICATION_SCHEMA = {
+    'experience_years': np.float64,
+    'hourly_rate': np.float64,
+    'rating': np.float64,
+    'skill_match_count': np.int64,
+    'skill_match_pct': np.float64,
+    'area_match': np.int64,
+    'budget': np.float64,
+    'match': np.int64,
+    'application_id': np.int64,
+    'freelancer_id': np.int64,
+    'project_id': np.int64,
+    'updated_at': np.float64,
+}
+
+EPOCH = datetime(1970, 1, 1)
+
+LABELS = {ApplicationStatus.ACCEPTED.value: 1, ApplicationStatus.REJECTED.value: 0}
+
+
+def _skill_names(db: Session, table, owner_column, owner_ids: List[int],
+                 chunk_size: int = 500) -> Dict[int, List[str]]:
+    skills: Dict[int, List[str]] = {owner_id: [] for owner_id in owner_ids}
+    # Consultar por bloques para no exceder el límite de parámetros de SQLite
+    for start in range(0, len(owner_ids), chunk_size):
+        rows = db.query(owner_column, Skill.name).select_from(table).join(
+            Skill, Skill.id == table.c.skill_id
+        ).filter(owner_column.in_(owner_ids[start:start + chunk_size]))
+        for owner_id, name in rows:
+            skills[owner_id].append(name)
+    return skills
+
+
+def iter_application_chunks(db: Session, chunk_size: int = 5000, since: Optional[datetime] = None,
+                            after_id: int = 0) -> Iterator[List[Any]]:
+    """
+    Recorre las postulaciones aceptadas o rechazadas por bloques de
+    `chunk_size`, en orden de id (paginación por id, sin OFFSET). Cada fila
+    trae los datos del freelancer y del proyecto en la misma consulta.
+    Con `since` solo se incluyen las que cambiaron de estado después de esa fecha.
+    """
+    query = db.query(
+        ProjectApplication.id, ProjectApplication.status, ProjectApplication.updated_at,
+        User.id, User.experience_years, User.hourly_rate, User.rating, User.area_expertise,
+        Project.id, Project.budget, Project.area,
+    ).join(
+        User, User.id == ProjectApplication.freelancer_id
+    ).join(
+        Project, Project.id == ProjectApplication.project_id
+    ).filter(ProjectApplication.status.in_(list(LABELS)))
+    if since is not None:
+        query = query.filter(ProjectApplication.updated_at > since)
+
+    last_id = after_id
+    while True:
+        rows = query.filter(ProjectApplication.id > last_id).order_by(ProjectApplication.id).limit(chunk_size).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def chunk_to_columns(db: Session, rows: List[Any], vocabulary: SkillVocabulary) -> Dict[str, np.ndarray]:
+    """Calcula las características de un bloque con el mismo código que usa el servidor."""
+    freelancer_skills = _skill_names(db, user_skills, user_skills.c.user_id, sorted({row[3] for row in rows}))
+    project_skills_by_id = _skill_names(
+        db, project_skills, project_skills.c.project_id, sorted({row[8] for row in rows})
+    )
+
+    freelancers = [
+        {
+            "experience_years": row[4],
+            "hourly_rate": row[5],
+            "rating": row[6],
+            "area_expertise": row[7],
+            "skills": freelancer_skills[row[3]],
+        }
+        for row in rows
+    ]
+    projects = [
+        {"budget": row[9], "area": row[10], "skills_required": project_skills_by_id[row[8]]}
+        for row in rows
+    ]
+    features = pair_features(freelancers, projects, vocabulary=vocabulary)
+
+    columns = {name: features[name].to_numpy() for name in FEATURE_COLUMNS}
+    columns['match'] = np.array([LABELS[row[1]] for row in rows], dtype=np.int64)
+    columns['application_id'] = np.array([row[0] for row in rows], dtype=np.int64)
+    columns['freelancer_id'] = np.array([row[3] for row in rows], dtype=np.int64)
+    columns['project_id'] = np.array([row[8] for row in rows], dtype=np.int64)
+    # Segundos desde la época; las fechas de la base están en UTC sin zona horaria
+    columns['updated_at'] = np.array(
+        [(row[2] - EPOCH).total_seconds() if row[2] is not None else np.nan for row in rows], dtype=np.float64
+    )
+    return columns
+
+
+def extract_applications(db: Session, output_dir: str = DEFAULT_OUTPUT_DIR, chunk_size: int = 5000,
+                         since: Optional[datetime] = None, pause_seconds: float = 0.0) -> Dict[str, Any]:
+    """
+    Extrae pares etiquetados (postulación aceptada = 1, rechazada = 0) de la
+    base de datos a un conjunto columnar en `output_dir`.
+
+    Cada bloque es una consulta corta e independiente y se escribe a disco
+    antes de pedir el siguiente, así la memoria queda acotada por `chunk_size`
+    y la extracción puede correr contra la base en uso; `pause_seconds` cede
+    tiempo a la API entre bloques.
+    """
+    vocabulary = SkillVocabulary()
+    last_id = 0
+    last_updated_at = None
+    metadata = {"source": "project_applications", "since": since.isoformat() if since else None}
+
+    with ColumnarWriter(output_dir, schema=APPLICATION_SCHEMA, metadata=metadata) as writer:
+        for rows in iter_application_chunks(db, chunk_size=chunk_size, since=since):
+            columns = chunk_to_columns(db, rows, vocabulary)
+            writer.append(columns)
+            last_id = int(columns['application_id'][-1])
+            chunk_updated = [row[2] for row in rows if row[2] is not None]
+            if chunk_updated:
+                last_updated_at = max(chunk_updated + ([last_updated_at] if last_updated_at else []))
+            # Liberar la sesión entre bloques para no retener objetos ni transacciones largas
+            db.expire_all()
+            db.rollback()
+            if pause_seconds > 0:
+                time.sleep(pause_seconds)
+
+        # Marca de agua para extracciones incrementales
+        writer.metadata["last_application_id"] = last_id
+        writer.metadata["last_updated_at"] = last_updated_at.isoformat() if last_updated_at else None
+
+    print(f"Extraídas {writer.n_rows} postulaciones en {output_dir}")
+    return writer.metadata
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Extrae postulaciones etiquetadas a un conjunto columnar")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--since", type=datetime.fromisoformat, default=None,
+                        help="Solo postulaciones actualizadas después de esta fecha (ISO 8601)")
+    parser.add_argument("--pause-seconds", type=float, default=0.0)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        extract_applications(
+            db, output_dir=args.output, chunk_size=args.chunk_size,
+            since=args.since, pause_seconds=args.pause_seconds
+        )
+    finally:
+        db.close()
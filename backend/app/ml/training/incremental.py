@@ -0,0 +1,150 @@
+# app/ml/training/incremental.py
+import argparse
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.ml.features import FEATURE_COLUMNS
+from app.ml.forest import COMPILED_MODEL_DIR
+from app.ml.training.dataset import open_dataset
+from app.ml.training.extract import EPOCH, extract_applications
+from app.ml.training.train_model import publish_model
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "models")
+MODEL_PATH = os.path.join(MODEL_DIR, "trained_model.pkl")
+CHECKPOINT_PATH = os.path.join(MODEL_DIR, "checkpoint.json")
+
+
+def load_checkpoint(path: str = CHECKPOINT_PATH) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_checkpoint(checkpoint: Dict[str, Any], path: str = CHECKPOINT_PATH) -> None:
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def update_model(db: Session, trees_per_update: int = 10, max_estimators: int = 200, min_new_rows: int = 20,
+                 model_path: str = MODEL_PATH, compiled_dir: str = COMPILED_MODEL_DIR,
+                 checkpoint_path: str = CHECKPOINT_PATH, chunk_size: int = 5000,
+                 overlap_seconds: float = 300.0) -> Optional[str]:
+    """
+    Actualiza el modelo con las postulaciones resueltas (aceptadas/rechazadas)
+    desde el último checkpoint, sin reentrenar desde cero.
+
+    Se agregan `trees_per_update` árboles entrenados solo con los datos nuevos
+    (warm start del bosque aleatorio) y, si el bosque supera `max_estimators`,
+    se descartan los árboles más antiguos. El modelo se publica igual que un
+    entrenamiento completo (pickle + versión compilada), de modo que el
+    servidor lo recarga solo. Devuelve la nueva versión, o None si no había
+    datos suficientes.
+
+    La marca de agua es el mayor `updated_at` leído, pero cada extracción
+    vuelve a leer los `overlap_seconds` anteriores: así se recuperan las filas
+    con la misma fecha que la marca y las que se confirmaron tarde con una
+    fecha anterior. Las ya usadas dentro de esa ventana se recuerdan en el
+    checkpoint como (id de postulación, updated_at) y se descartan.
+    """
+    checkpoint = load_checkpoint(checkpoint_path)
+    watermark = datetime.fromisoformat(checkpoint["last_updated_at"]) if checkpoint.get("last_updated_at") else None
+    since = watermark - timedelta(seconds=overlap_seconds) if watermark else None
+    seen = {(int(application_id), updated_at) for application_id, updated_at in checkpoint.get("seen", [])}
+
+    # Extraer solo lo nuevo a un directorio temporal (por bloques, sin cargar las tablas)
+    work_dir = tempfile.mkdtemp(prefix="incremental_")
+    try:
+        dataset_dir = os.path.join(work_dir, "dataset")
+        metadata = extract_applications(db, output_dir=dataset_dir, chunk_size=chunk_size, since=since)
+        dataset = open_dataset(dataset_dir)
+        keys = list(zip(np.asarray(dataset['application_id']).tolist(), np.asarray(dataset['updated_at']).tolist()))
+        new = np.array([key not in seen for key in keys], dtype=bool)
+        if new.sum() < min_new_rows:
+            print(f"Solo {new.sum()} postulaciones nuevas (mínimo {min_new_rows}); no se actualiza el modelo.")
+            return None
+
+        X = dataset.to_frame(FEATURE_COLUMNS)[new].reset_index(drop=True)
+        y = np.asarray(dataset['match'])[new]
+
+        with open(model_path, 'rb') as f:
+            model = pickle.load(f)
+
+        # Los árboles nuevos deben conocer las mismas clases que los existentes
+        if not np.array_equal(np.unique(y), np.asarray(model.classes_)):
+            print("Las postulaciones nuevas no incluyen todas las clases; no se actualiza el modelo.")
+            return None
+
+        started = time.perf_counter()
+        model.set_params(warm_start=True, n_estimators=len(model.estimators_) + trees_per_update)
+        model.fit(X, y)
+
+        if len(model.estimators_) > max_estimators:
+            # Descartar los árboles más antiguos (entrenados con datos menos recientes)
+            model.estimators_ = model.estimators_[-max_estimators:]
+            model.n_estimators = len(model.estimators_)
+        model.set_params(warm_start=False)
+
+        version = publish_model(model, model_path, compiled_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    last_updated_at = metadata.get("last_updated_at") or checkpoint.get("last_updated_at")
+    # Solo hace falta recordar lo que la próxima extracción volverá a leer
+    window_start = (
+        (datetime.fromisoformat(last_updated_at) - EPOCH).total_seconds() - overlap_seconds
+        if last_updated_at else float("inf")
+    )
+    seen.update(keys)
+    save_checkpoint({
+        "model_version": version,
+        "n_estimators": len(model.estimators_),
+        "last_application_id": metadata.get("last_application_id"),
+        "last_updated_at": last_updated_at,
+        "seen": sorted([application_id, updated_at] for application_id, updated_at in seen
+                       if updated_at >= window_start),
+        "rows": len(X),
+        "updated_at": datetime.utcnow().isoformat(),
+    }, checkpoint_path)
+
+    print(f"Modelo {version} actualizado con {len(X)} postulaciones nuevas "
+          f"({len(model.estimators_)} árboles, {time.perf_counter() - started:.2f} s)")
+    return version
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Actualiza el modelo con las postulaciones resueltas recientes")
+    parser.add_argument("--trees", type=int, default=10, help="Árboles nuevos por actualización")
+    parser.add_argument("--max-estimators", type=int, default=200)
+    parser.add_argument("--min-new-rows", type=int, default=20)
+    parser.add_argument("--overlap-seconds", type=float, default=300.0,
+                        help="Ventana que se vuelve a leer antes de la marca de agua (confirmaciones tardías)")
+    parser.add_argument("--interval", type=float, default=0.0,
+                        help="Repetir cada N segundos (0 = una sola vez)")
+    args = parser.parse_args()
+
+    while True:
+        db = SessionLocal()
+        try:
+            update_model(
+                db, trees_per_update=args.trees, max_estimators=args.max_estimators,
+                min_new_rows=args.min_new_rows, overlap_seconds=args.overlap_seconds
+            )
+        finally:
+            db.close()
+        if args.interval <= 0:
+            break
+        time.sleep(args.interval)
@@ -0,0 +1,459 @@
+# app/ml/training/marketplace.py
+"""
+Generador sintético del mercado completo (usuarios, habilidades, proyectos,
+postulaciones, mensajes y transacciones) para pruebas de carga.
+
+El trabajo se divide en fragmentos de tamaño fijo y cada fragmento usa su
+propio generador derivado de (semilla, entidad, fragmento) con SeedSequence,
+así el resultado es idéntico para una misma semilla sin importar cuántos
+procesos se usen. Los fragmentos se generan en paralelo y se escriben en
+orden, en bloques, a CSV o directamente a la base de datos.
+
+Uso (desde backend/):
+    python -m app.ml.training.marketplace --users 1000000 --projects 300000 --output data/marketplace
+    python -m app.ml.training.marketplace --users 100000 --projects 30000 --database
+"""
+import argparse
+import os
+from datetime import datetime
+from multiprocessing import Pool
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+BASE_SKILLS = [
+    "Investigación cualitativa", "Investigación cuantitativa", "Análisis estadístico",
+    "Diseño experimental", "Revisión de literatura", "Escritura científica",
+    "Metodología de investigación", "Análisis de datos", "Desarrollo de encuestas",
+    "Entrevistas estructuradas", "SPSS", "R", "Python", "Excel avanzado",
+    "Investigación de mercados", "Estudios de caso", "Economía", "Finanzas",
+    "Medicina", "Derecho", "Educación", "Psicología", "Sociología", "Marketing"
+]
+
+AREAS = [
+    "Ciencias sociales", "Economía", "Comercio exterior",
+    "Finanzas", "Jurisprudencia", "Medicina", "Educación",
+    "Psicología", "Marketing", "Tecnología"
+]
+
+PROJECT_STATUSES = ["open", "assigned", "in_progress", "completed", "cancelled"]
+PROJECT_STATUS_P = [0.40, 0.10, 0.15, 0.30, 0.05]
+
+MESSAGE_TEXTS = [
+    "Hola, ¿podemos revisar el alcance del proyecto?",
+    "Adjunto el primer avance.",
+    "Gracias, lo reviso hoy.",
+    "¿Podrías ampliar la sección de metodología?",
+    "Listo, subí la versión corregida.",
+    "Perfecto, quedo atento.",
+]
+MESSAGE_STATUSES = ["read", "delivered", "sent"]
+MESSAGE_STATUS_P = [0.80, 0.15, 0.05]
+
+# Códigos de entidad para derivar la semilla de cada fragmento
+USERS, PROJECTS = 0, 1
+
+DEFAULT_PASSWORD = "password"
+# bcrypt de DEFAULT_PASSWORD, calculado una vez: get_password_hash usa una sal aleatoria y
+# haría que la salida cambie en cada ejecución con la misma semilla
+DEFAULT_PASSWORD_HASH = "$2b$12$n9E0dn5ZQtxRGcsUthluU.Oy5zu8AwcuiZOJPuWXQn4v9lnHNkHwu"
+
+
+class MarketplaceConfig(NamedTuple):
+    n_users: int = 100000
+    n_projects: int = 30000
+    seed: int = 42
+    shard_size: int = 50000
+    freelancer_ratio: float = 0.7
+    n_skills: int = 200
+    skill_zipf: float = 1.1
+    mean_applications: float = 5.0
+    mean_messages: float = 8.0
+    start: datetime = datetime(2024, 1, 1)
+    days: int = 730
+    password_hash: str = ""
+
+
+def skill_names(n_skills: int) -> List[str]:
+    return BASE_SKILLS[:n_skills] + [f"Habilidad {i + 1}" for i in range(len(BASE_SKILLS), n_skills)]
+
+
+def zipf_weights(n: int, exponent: float) -> np.ndarray:
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+def sample_skill_sets(rng: np.random.Generator, n_rows: int, weights: np.ndarray,
+                      min_k: int, max_k: int, chunk_size: int = 50000):
+    """
+    Conjuntos de habilidades sin repetición con probabilidad proporcional a
+    `weights` (truco de Gumbel top-k), por bloques para acotar la memoria.
+    Devuelve el formato CSR (indptr, indices).
+    """
+    counts = rng.integers(min_k, max_k + 1, size=n_rows)
+    log_weights = np.log(weights)
+    indices = [np.zeros(0, dtype=np.int64)]
+    for start in range(0, n_rows, chunk_size):
+        n = min(chunk_size, n_rows - start)
+        keys = log_weights + rng.gumbel(size=(n, len(weights)))
+        top = np.argpartition(-keys, max_k - 1, axis=1)[:, :max_k]
+        # Ordenar los max_k elegidos por clave para que los primeros k sean una muestra válida
+        order = np.argsort(-np.take_along_axis(keys, top, axis=1), axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        indices.append(top[np.arange(max_k) < counts[start:start + n, None]])
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    return indptr, np.concatenate(indices).astype(np.int32)
+
+
+def _rng(config: MarketplaceConfig, entity: int, shard: int) -> np.random.Generator:
+    return np.random.default_rng(np.random.SeedSequence([config.seed, entity, shard]))
+
+
+def _shards(n_rows: int, shard_size: int) -> List[tuple]:
+    return [(shard, start, min(start + shard_size, n_rows))
+            for shard, start in enumerate(range(0, n_rows, shard_size))]
+
+
+def _timestamps(config: MarketplaceConfig, fraction: np.ndarray) -> np.ndarray:
+    """Fracción [0, 1) del período -> datetime64[us]."""
+    offsets = (fraction * config.days * 86400e6).astype("timedelta64[us]")
+    return np.datetime64(config.start, "us") + offsets
+
+
+def _days(values: np.ndarray) -> np.ndarray:
+    return (values * 86400e6).astype("timedelta64[us]")
+
+
+def _user_shard(args) -> Dict[str, Any]:
+    config, shard, start, stop = args
+    rng = _rng(config, USERS, shard)
+    n = stop - start
+    ids = np.arange(start + 1, stop + 1, dtype=np.int64)
+
+    is_freelancer = rng.random(n) < config.freelancer_ratio
+    area = rng.choice(len(AREAS), size=n, p=zipf_weights(len(AREAS), 0.6))
+    # Experiencia y tarifa con cola larga; la calificación se concentra en valores altos
+    experience = np.clip(np.round(rng.lognormal(np.log(4.0), 0.7, n), 1), 0.5, 40.0)
+    hourly_rate = np.clip(np.round(rng.lognormal(np.log(35.0), 0.5, n), 2), 5.0, 300.0)
+    rating = np.round(3.0 + 2.0 * rng.beta(5.0, 2.0, n), 1)
+    # Popularidad (freelancers) y actividad (clientes): pocos concentran la mayoría
+    weight = rng.pareto(1.5, n) + 1.0
+
+    users = pd.DataFrame({
+        "id": ids,
+        "email": [f"user{i}@example.com" for i in ids],
+        "username": [f"user{i}" for i in ids],
+        "hashed_password": config.password_hash,
+        "full_name": None,
+        "is_active": True,
+        "is_freelancer": is_freelancer,
+        "is_client": ~is_freelancer,
+        "experience_years": np.where(is_freelancer, experience, np.nan),
+        "hourly_rate": np.where(is_freelancer, hourly_rate, np.nan),
+        "rating": np.where(is_freelancer, rating, 0.0),
+        "area_expertise": pd.Series(np.array(AREAS, dtype=object)[area]).where(is_freelancer, None),
+        "credits_balance": np.where(is_freelancer, 0.0, np.round(rng.uniform(0, 5000, n), 2)),
+        "is_admin": False,
+    })
+
+    freelancer_rows = np.flatnonzero(is_freelancer)
+    indptr, indices = sample_skill_sets(
+        rng, len(freelancer_rows), zipf_weights(config.n_skills, config.skill_zipf), 1, 10
+    )
+    user_skills = pd.DataFrame({
+        "user_id": np.repeat(ids[freelancer_rows], np.diff(indptr)),
+        "skill_id": indices.astype(np.int64) + 1,
+    })
+
+    # Compras de créditos de clientes y solicitudes de retiro de freelancers
+    n_tx = np.where(is_freelancer, rng.poisson(0.5, n), rng.poisson(2.0, n))
+    owner = np.repeat(np.arange(n), n_tx)
+    owner_is_freelancer = is_freelancer[owner]
+    amount = np.round(rng.lognormal(np.log(200.0), 0.8, len(owner)), 2)
+    transactions = pd.DataFrame({
+        "user_id": ids[owner],
+        "project_id": None,
+        "transaction_type": np.where(owner_is_freelancer, "withdrawal_request", "credit_purchase"),
+        "amount": np.where(owner_is_freelancer, -amount, amount),
+        "description": np.where(owner_is_freelancer, "Solicitud de retiro", "Compra de créditos"),
+        "created_at": _timestamps(config, rng.random(len(owner))),
+    })
+
+    return {
+        "tables": {"users": users, "user_skills": user_skills, "transactions": transactions},
+        "freelancer_ids": ids[is_freelancer],
+        "freelancer_weights": weight[is_freelancer] * rating[is_freelancer],
+        "client_ids": ids[~is_freelancer],
+        "client_weights": weight[~is_freelancer],
+    }
+
+
+# Población de usuarios compartida con los procesos de la segunda fase
+_POPULATION: Dict[str, np.ndarray] = {}
+
+
+def _init_population(population: Dict[str, np.ndarray]) -> None:
+    _POPULATION.clear()
+    _POPULATION.update(population)
+
+
+def _pick(rng: np.random.Generator, ids: np.ndarray, cdf: np.ndarray, size: int) -> np.ndarray:
+    return ids[np.minimum(np.searchsorted(cdf, rng.random(size) * cdf[-1]), len(ids) - 1)]
+
+
+def _project_shard(args) -> Dict[str, Any]:
+    config, shard, start, stop = args
+    rng = _rng(config, PROJECTS, shard)
+    n = stop - start
+    ids = np.arange(start + 1, stop + 1, dtype=np.int64)
+    client_ids, client_cdf = _POPULATION["client_ids"], _POPULATION["client_cdf"]
+    freelancer_ids, freelancer_cdf = _POPULATION["freelancer_ids"], _POPULATION["freelancer_cdf"]
+
+    client = _pick(rng, client_ids, client_cdf, n)
+    status = np.array(PROJECT_STATUSES, dtype=object)[rng.choice(len(PROJECT_STATUSES), size=n, p=PROJECT_STATUS_P)]
+    has_freelancer = np.isin(status, ["assigned", "in_progress", "completed"]) & (len(freelancer_ids) > 0)
+    freelancer = np.where(has_freelancer, _pick(rng, freelancer_ids, freelancer_cdf, n) if len(freelancer_ids) else -1, -1)
+    area = np.array(AREAS, dtype=object)[rng.choice(len(AREAS), size=n, p=zipf_weights(len(AREAS), 0.6))]
+    budget = np.clip(np.round(rng.lognormal(np.log(1200.0), 0.9, n), 2), 100.0, 50000.0)
+    # Más proyectos recientes que antiguos (crecimiento de la plataforma)
+    created_at = _timestamps(config, np.sqrt(rng.random(n)))
+    updated_at = created_at + _days(rng.exponential(10.0, n))
+
+    projects = pd.DataFrame({
+        "id": ids,
+        "title": [f"Proyecto {i}" for i in ids],
+        "description": [f"Proyecto de investigación en {a}" for a in area],
+        "client_id": client,
+        "freelancer_id": pd.Series(freelancer, dtype="Int64").where(has_freelancer),
+        "status": status,
+        "budget": budget,
+        "deadline": updated_at + _days(rng.uniform(7.0, 90.0, n)),
+        "created_at": created_at,
+        "updated_at": updated_at,
+        "area": area,
+        "credits_held": np.where(np.isin(status, ["assigned", "in_progress"]), budget, 0.0),
+        "is_paid": status == "completed",
+    })
+
+    indptr, indices = sample_skill_sets(rng, n, zipf_weights(config.n_skills, config.skill_zipf), 2, 6)
+    project_skills = pd.DataFrame({
+        "project_id": np.repeat(ids, np.diff(indptr)),
+        "skill_id": indices.astype(np.int64) + 1,
+    })
+
+    # Postulaciones: la del freelancer asignado primero, luego las demás (sin repetir freelancer)
+    tables = {"projects": projects, "project_skills": project_skills}
+    if len(freelancer_ids):
+        n_apps = rng.negative_binomial(2, 2.0 / (2.0 + config.mean_applications), n)
+        assigned_rows = np.flatnonzero(has_freelancer)
+        owner = np.concatenate([assigned_rows, np.repeat(np.arange(n), n_apps)])
+        applicant = np.concatenate([freelancer[assigned_rows], _pick(rng, freelancer_ids, freelancer_cdf, n_apps.sum())])
+        is_assigned = np.arange(len(owner)) < len(assigned_rows)
+        order = np.argsort(owner, kind="stable")
+        owner, applicant, is_assigned = owner[order], applicant[order], is_assigned[order]
+        _, first = np.unique(owner * (freelancer_ids.max() + 1) + applicant, return_index=True)
+        keep = np.sort(first)
+        owner, applicant, is_assigned = owner[keep], applicant[keep], is_assigned[keep]
+
+        app_status = np.where(
+            status[owner] == "open", "pending",
+            np.where(is_assigned, "accepted", "rejected")
+        )
+        app_created = created_at[owner] + _days(rng.exponential(2.0, len(owner)))
+        applications = pd.DataFrame({
+            "project_id": ids[owner],
+            "freelancer_id": applicant,
+            "message": None,
+            "status": app_status,
+            "created_at": app_created,
+            "updated_at": np.where(app_status == "pending", app_created,
+                                   app_created + _days(rng.exponential(3.0, len(owner)))),
+        })
+        tables["project_applications"] = applications
+
+    # Mensajes entre cliente y freelancer de los proyectos asignados
+    assigned_rows = np.flatnonzero(has_freelancer)
+    n_messages = rng.poisson(config.mean_messages, len(assigned_rows))
+    msg_owner = np.repeat(assigned_rows, n_messages)
+    from_client = rng.random(len(msg_owner)) < 0.5
+    tables["chat_messages"] = pd.DataFrame({
+        "project_id": ids[msg_owner],
+        "sender_id": np.where(from_client, client[msg_owner], freelancer[msg_owner]),
+        "receiver_id": np.where(from_client, freelancer[msg_owner], client[msg_owner]),
+        "message": np.array(MESSAGE_TEXTS, dtype=object)[rng.integers(0, len(MESSAGE_TEXTS), len(msg_owner))],
+        "status": np.array(MESSAGE_STATUSES, dtype=object)[
+            rng.choice(len(MESSAGE_STATUSES), size=len(msg_owner), p=MESSAGE_STATUS_P)
+        ],
+        "created_at": created_at[msg_owner] + _days(rng.exponential(5.0, len(msg_owner))),
+    })
+
+    # Pago al freelancer de cada proyecto completado
+    paid = np.flatnonzero(status == "completed")
+    tables["transactions"] = pd.DataFrame({
+        "user_id": freelancer[paid],
+        "project_id": ids[paid],
+        "transaction_type": "project_payment",
+        "amount": budget[paid],
+        "description": [f"Payment for project: Proyecto {i}" for i in ids[paid]],
+        "created_at": updated_at[paid],
+    })
+    return {"tables": tables}
+
+
+class CsvSink:
+    """Escribe cada tabla en `<directorio>/<tabla>.csv`, agregando bloques en orden."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._started = set()
+
+    def write(self, table: str, frame: pd.DataFrame) -> None:
+        path = os.path.join(self.directory, f"{table}.csv")
+        first = table not in self._started
+        frame.to_csv(path, mode="w" if first else "a", header=first, index=False)
+        self._started.add(table)
+
+    def close(self) -> None:
+        pass
+
+
+class DatabaseSink:
+    """
+    Inserta cada bloque en la base de datos con inserciones masivas (una
+    transacción por bloque). Crea las tablas que falten; se espera una base
+    vacía, ya que los ids generados empiezan en 1. Al cerrar, en PostgreSQL
+    adelanta las secuencias de los ids al máximo insertado.
+    """
+
+    def __init__(self, engine, batch_size: int = 20000):
+        from app.database import Base
+        from app.models import models  # noqa: F401 (registra las tablas en Base.metadata)
+
+        Base.metadata.create_all(bind=engine)
+        self.engine = engine
+        self.batch_size = batch_size
+        self.tables = Base.metadata.tables
+        self._written = set()
+
+    def write(self, table: str, frame: pd.DataFrame) -> None:
+        records = frame.astype(object).where(frame.notna(), None).to_dict("records")
+        with self.engine.begin() as conn:
+            for start in range(0, len(records), self.batch_size):
+                conn.execute(self.tables[table].insert(), records[start:start + self.batch_size])
+        self._written.add(table)
+
+    def close(self) -> None:
+        if self.engine.dialect.name != "postgresql":
+            return
+        # Los ids se insertaron explícitamente: sin esto, el primer INSERT de la API
+        # tomaría el id 1 de la secuencia y chocaría con la clave primaria
+        with self.engine.begin() as conn:
+            for table in sorted(self._written):
+                if "id" not in self.tables[table].c:
+                    continue
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence(:table, 'id'), COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) "
+                    f"FROM {table}"
+                ), {"table": table})
+
+
+def _cdf(weights: np.ndarray) -> np.ndarray:
+    return np.cumsum(weights, dtype=np.float64)
+
+
+def _run(pool_size: int, fn, tasks: List[tuple], initializer=None, initargs=()) -> Iterator[Dict[str, Any]]:
+    if pool_size <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for task in tasks:
+            yield fn(task)
+        return
+    with Pool(pool_size, initializer=initializer, initargs=initargs) as pool:
+        # imap conserva el orden de los fragmentos: el resultado no depende de los procesos
+        yield from pool.imap(fn, tasks)
+
+
+def generate_marketplace(config: MarketplaceConfig, sink, workers: Optional[int] = None) -> Dict[str, int]:
+    """
+    Genera el mercado completo y lo envía a `sink` fragmento por fragmento.
+    Los ids de postulaciones, mensajes y transacciones se asignan en el orden
+    de escritura, así también son deterministas.
+    """
+    workers = workers or os.cpu_count() or 1
+    counts: Dict[str, int] = {}
+    next_id: Dict[str, int] = {}
+
+    def emit(tables: Dict[str, pd.DataFrame]) -> None:
+        for table, frame in tables.items():
+            if table in ("project_applications", "chat_messages", "transactions"):
+                first = next_id.get(table, 1)
+                frame.insert(0, "id", np.arange(first, first + len(frame), dtype=np.int64))
+                next_id[table] = first + len(frame)
+            if len(frame):
+                sink.write(table, frame)
+            counts[table] = counts.get(table, 0) + len(frame)
+
+    emit({"skills": pd.DataFrame({
+        "id": np.arange(1, config.n_skills + 1), "name": skill_names(config.n_skills)
+    })})
+
+    # Fase 1: usuarios (y sus habilidades y transacciones propias)
+    freelancer_ids, freelancer_weights, client_ids, client_weights = [], [], [], []
+    user_tasks = [(config, *shard) for shard in _shards(config.n_users, config.shard_size)]
+    for result in _run(workers, _user_shard, user_tasks):
+        emit(result["tables"])
+        freelancer_ids.append(result["freelancer_ids"])
+        freelancer_weights.append(result["freelancer_weights"])
+        client_ids.append(result["client_ids"])
+        client_weights.append(result["client_weights"])
+
+    population = {
+        "freelancer_ids": np.concatenate(freelancer_ids) if freelancer_ids else np.zeros(0, dtype=np.int64),
+        "freelancer_cdf": _cdf(np.concatenate(freelancer_weights)) if freelancer_weights else np.zeros(0),
+        "client_ids": np.concatenate(client_ids) if client_ids else np.zeros(0, dtype=np.int64),
+        "client_cdf": _cdf(np.concatenate(client_weights)) if client_weights else np.zeros(0),
+    }
+    if config.n_projects and not len(population["client_ids"]):
+        raise ValueError("No hay clientes para asignar proyectos; aumente n_users")
+
+    # Fase 2: proyectos, postulaciones, mensajes y pagos
+    project_tasks = [(config, *shard) for shard in _shards(config.n_projects, config.shard_size)]
+    for result in _run(workers, _project_shard, project_tasks, _init_population, (population,)):
+        emit(result["tables"])
+
+    sink.close()
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera un mercado sintético para pruebas de carga")
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--projects", type=int, default=30000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--shard-size", type=int, default=50000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default="app/ml/training/data/marketplace",
+                        help="Directorio de los CSV (se ignora con --database)")
+    parser.add_argument("--database", action="store_true",
+                        help="Insertar directamente en la base de datos configurada (tablas nuevas)")
+    args = parser.parse_args()
+
+    config = MarketplaceConfig(
+        n_users=args.users, n_projects=args.projects, seed=args.seed, shard_size=args.shard_size,
+        # Un solo hash para todos: bcrypt por usuario haría la generación impracticable
+        password_hash=DEFAULT_PASSWORD_HASH,
+    )
+    if args.database:
+        from app.database import engine
+
+        sink = DatabaseSink(engine)
+    else:
+        sink = CsvSink(args.output)
+
+    counts = generate_marketplace(config, sink, workers=args.workers)
+    for table, count in counts.items():
+        print(f"{table}: {count} filas")
@@ -0,0 +1,177 @@
+# app/ml/training/search.py
+import hashlib
+import json
+import math
+import os
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import f1_score
+from sklearn.model_selection import ParameterGrid, StratifiedKFold
+
+
+class SearchResult(NamedTuple):
+    best_params: Dict[str, Any]
+    best_score: float
+    records: List[Dict[str, Any]]
+    exhausted_budget: bool
+
+
+class _Fold(NamedTuple):
+    X_train: np.ndarray
+    y_train: np.ndarray
+    X_val: np.ndarray
+    y_val: np.ndarray
+
+
+def _params_key(params: Dict[str, Any]) -> str:
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+class SuccessiveHalvingSearch:
+    """
+    Búsqueda de hiperparámetros por reducción sucesiva (successive halving).
+
+    En la primera ronda todos los candidatos se evalúan con pocas muestras de
+    entrenamiento; en cada ronda siguiente solo pasa el mejor 1/`factor` y las
+    muestras se multiplican por `factor`, hasta usar el conjunto completo.
+
+    Las particiones de validación cruzada y sus matrices se calculan una sola
+    vez y se reutilizan para todos los candidatos. Cada evaluación se agrega a
+    un diario JSONL (con sus tiempos), así una búsqueda interrumpida retoma
+    donde quedó; el presupuesto de CPU incluye lo ya gastado en el diario.
+    """
+
+    def __init__(self, estimator, param_grid: Dict[str, List[Any]], cv: int = 3, factor: int = 3,
+                 min_samples: Optional[int] = None, cpu_budget_seconds: Optional[float] = None,
+                 journal_path: Optional[str] = None, random_state: int = 42):
+        self.estimator = estimator
+        self.param_grid = param_grid
+        self.cv = cv
+        self.factor = factor
+        self.min_samples = min_samples
+        self.cpu_budget_seconds = cpu_budget_seconds
+        self.journal_path = journal_path
+        self.random_state = random_state
+
+    def _fingerprint(self, X: np.ndarray, y: np.ndarray) -> str:
+        """Identifica la búsqueda: solo se reutilizan entradas del diario con la misma configuración."""
+        digest = hashlib.sha256()
+        digest.update(_params_key({
+            "estimator": repr(self.estimator), "grid": self.param_grid, "cv": self.cv,
+            "factor": self.factor, "min_samples": self.min_samples, "random_state": self.random_state,
+        }).encode())
+        digest.update(str(X.shape).encode())
+        digest.update(np.ascontiguousarray(y).tobytes())
+        return digest.hexdigest()[:16]
+
+    def _load_journal(self, fingerprint: str) -> Dict[tuple, Dict[str, Any]]:
+        done = {}
+        if not self.journal_path or not os.path.exists(self.journal_path):
+            return done
+        with open(self.journal_path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Una línea cortada por una interrupción se descarta
+                    continue
+                if record.get("search") == fingerprint:
+                    done[(record["rung"], _params_key(record["params"]))] = record
+        return done
+
+    def _prepare_folds(self, X: np.ndarray, y: np.ndarray) -> List[_Fold]:
+        splitter = StratifiedKFold(n_splits=self.cv, shuffle=True, random_state=self.random_state)
+        rng = np.random.default_rng(self.random_state)
+        folds = []
+        for train_idx, val_idx in splitter.split(X, y):
+            # Orden aleatorio fijo: el subconjunto de cada ronda son las primeras n filas
+            train_idx = rng.permutation(train_idx)
+            folds.append(_Fold(
+                np.ascontiguousarray(X[train_idx]), y[train_idx],
+                np.ascontiguousarray(X[val_idx]), y[val_idx],
+            ))
+        return folds
+
+    def _evaluate(self, params: Dict[str, Any], folds: List[_Fold], n_samples: int) -> Dict[str, Any]:
+        scores = []
+        fit_seconds = 0.0
+        score_seconds = 0.0
+        cpu_started = time.process_time()
+        for fold in folds:
+            model = clone(self.estimator).set_params(**params)
+            started = time.perf_counter()
+            model.fit(fold.X_train[:n_samples], fold.y_train[:n_samples])
+            fit_seconds += time.perf_counter() - started
+
+            started = time.perf_counter()
+            scores.append(f1_score(fold.y_val, model.predict(fold.X_val), zero_division=0))
+            score_seconds += time.perf_counter() - started
+        return {
+            "scores": scores,
+            "mean_score": float(np.mean(scores)),
+            "fit_seconds": fit_seconds,
+            "score_seconds": score_seconds,
+            "cpu_seconds": time.process_time() - cpu_started,
+        }
+
+    def fit(self, X, y) -> SearchResult:
+        # scikit-learn trabaja en float32; se convierte una sola vez para todos los candidatos
+        X = np.ascontiguousarray(np.asarray(X, dtype=np.float32))
+        y = np.asarray(y)
+        fingerprint = self._fingerprint(X, y)
+        done = self._load_journal(fingerprint)
+        folds = self._prepare_folds(X, y)
+
+        candidates = list(ParameterGrid(self.param_grid))
+        max_samples = min(len(fold.y_train) for fold in folds)
+        n_rungs = max(1, math.ceil(math.log(len(candidates), self.factor))) if len(candidates) > 1 else 1
+        min_samples = self.min_samples or max(2 * self.cv, max_samples // self.factor ** (n_rungs - 1))
+
+        spent = sum(record["cpu_seconds"] for record in done.values())
+        records: List[Dict[str, Any]] = []
+        best_params, best_score = candidates[0], -math.inf
+        exhausted = False
+        journal = open(self.journal_path, "a") if self.journal_path else None
+        try:
+            for rung in range(n_rungs):
+                n_samples = max_samples if rung == n_rungs - 1 else min(max_samples, min_samples * self.factor ** rung)
+                rung_records = []
+                for params in candidates:
+                    record = done.get((rung, _params_key(params)))
+                    if record is None:
+                        if self.cpu_budget_seconds is not None and spent >= self.cpu_budget_seconds:
+                            exhausted = True
+                            break
+                        record = {
+                            "search": fingerprint, "rung": rung, "params": params, "n_samples": n_samples,
+                            **self._evaluate(params, folds, n_samples),
+                        }
+                        spent += record["cpu_seconds"]
+                        if journal is not None:
+                            journal.write(json.dumps(record, default=str) + "\n")
+                            journal.flush()
+                        print(f"[ronda {rung}] {params}: f1={record['mean_score']:.4f} "
+                              f"({record['fit_seconds']:.2f} s de ajuste, {n_samples} muestras)")
+                    rung_records.append(record)
+                records.extend(rung_records)
+
+                if rung_records:
+                    # El mejor de la ronda más avanzada evaluada es el resultado
+                    top = max(rung_records, key=lambda r: r["mean_score"])
+                    best_params, best_score = top["params"], top["mean_score"]
+                if exhausted:
+                    print(f"Presupuesto de CPU agotado ({spent:.1f} s) en la ronda {rung}")
+                    break
+
+                # Pasan a la siguiente ronda los mejores 1/factor (orden estable ante empates)
+                n_keep = max(1, math.ceil(len(candidates) / self.factor))
+                ranked = sorted(rung_records, key=lambda r: -r["mean_score"])
+                candidates = [r["params"] for r in ranked[:n_keep]]
+        finally:
+            if journal is not None:
+                journal.close()
+
+        return SearchResult(best_params, best_score, records, exhausted)
@@ -1,25 +1,69 @@
+import hashlib
 import os
 import pickle
 import pandas as pd
 import numpy as np
+from sklearn.base import clone
 from sklearn.model_selection import train_test_split, GridSearchCV
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, classification_report
 
+from app.core.config import settings
 # Importar generador de datos si no existen los datos
-from app.ml.training.data_generator import generate_training_data
+from app.ml.training.data_generator import DATA_DIR, TRAINING_SET_DIR, generate_training_data, write_training_set
+from app.ml.training.dataset import dataset_exists, open_dataset
+from app.ml.training.search import SuccessiveHalvingSearch
+from app.ml.features import FEATURE_COLUMNS
+from app.ml.forest import COMPILED_MODEL_DIR, export_forest
 
-def train_model():
+# Diario de la búsqueda por reducción sucesiva (permite reanudarla)
+SEARCH_JOURNAL = os.path.join(DATA_DIR, "search_journal.jsonl")
+
+def publish_model(model, model_path, compiled_dir=COMPILED_MODEL_DIR):
+    """
+    Guarda el modelo (pickle y versión compilada) y devuelve su versión.
+    
+    Se escribe en un archivo temporal y se reemplaza, para que el servidor
+    (que recarga el modelo al detectar cambios) nunca lea un archivo a medias.
+    El entrenamiento puede usar todos los núcleos (n_jobs=-1), pero el modelo
+    se publica con MODEL_SERVING_N_JOBS para no competir con el servidor.
+    """
+    if "n_jobs" in model.get_params():
+        model.set_params(n_jobs=settings.MODEL_SERVING_N_JOBS)
+    model_bytes = pickle.dumps(model)
+    version = hashlib.sha256(model_bytes).hexdigest()[:12]
+    tmp_path = model_path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(model_bytes)
+    os.replace(tmp_path, model_path)
+    
+    # Exportar el bosque a arreglos NumPy para servirlo sin scikit-learn;
+    # comparte la versión (hash del pickle) con el modelo original
+    export_forest(model, compiled_dir, version=version)
+    return version
+
+def load_training_set(directory=TRAINING_SET_DIR):
+    """Mapea en memoria un conjunto columnar: las columnas se leen tal cual, sin parsear texto."""
+    dataset = open_dataset(directory)
+    X = dataset.to_frame(FEATURE_COLUMNS)
+    y = pd.Series(dataset['match'], name='match')
+    return X, y
+
+def train_model(dataset_dir=TRAINING_SET_DIR, search="grid", cpu_budget_seconds=None, journal_path=SEARCH_JOURNAL):
     """Entrena un modelo de recomendación y lo guarda."""
     
     # Verificar si ya existen datos de entrenamiento
-    data_file = "app/ml/training/data/training_data.csv"
+    legacy_csv = os.path.join(DATA_DIR, "training_data.csv")
     
-    if os.path.exists(data_file):
+    if dataset_exists(dataset_dir):
         print("Cargando datos existentes...")
-        data = pd.read_csv(data_file)
-        X = data.drop('match', axis=1)
-        y = data['match']
+        X, y = load_training_set(dataset_dir)
+    elif os.path.exists(legacy_csv):
+        # Datos de versiones anteriores: se convierten una vez al formato columnar
+        print("Convirtiendo datos CSV existentes al formato columnar...")
+        data = pd.read_csv(legacy_csv)
+        write_training_set(data.drop('match', axis=1), data['match'], dataset_dir, metadata={"source": legacy_csv})
+        X, y = load_training_set(dataset_dir)
     else:
         print("Generando nuevos datos de entrenamiento...")
         X, y, _, _, _ = generate_training_data()
@@ -45,18 +89,36 @@ def train_model():
         'max_depth': [10],
     }
     
-    grid_search = GridSearchCV(
-        estimator=model,
-        param_grid=simplified_param_grid,
-        cv=3,
-        n_jobs=-1,
-        scoring='f1'
-    )
-    
-    grid_search.fit(X_train, y_train)
-    
-    # Obtener el mejor modelo
-    best_model = grid_search.best_estimator_
+    if search == "halving":
+        # Reducción sucesiva sobre la grilla completa, con particiones reutilizadas,
+        # diario reanudable y presupuesto de CPU
+        model.set_params(n_jobs=-1)
+        halving = SuccessiveHalvingSearch(
+            estimator=model,
+            param_grid=param_grid,
+            cv=3,
+            cpu_budget_seconds=cpu_budget_seconds,
+            journal_path=journal_path
+        )
+        result = halving.fit(X_train, y_train)
+        print(f"Mejores parámetros: {result.best_params} (f1={result.best_score:.4f})")
+        
+        # Reentrenar con todos los datos de entrenamiento
+        best_model = clone(model).set_params(**result.best_params)
+        best_model.fit(X_train, y_train)
+    else:
+        grid_search = GridSearchCV(
+            estimator=model,
+            param_grid=simplified_param_grid,
+            cv=3,
+            n_jobs=-1,
+            scoring='f1'
+        )
+        
+        grid_search.fit(X_train, y_train)
+        
+        # Obtener el mejor modelo
+        best_model = grid_search.best_estimator_
     
     # Evaluar el modelo
     y_pred = best_model.predict(X_test)
@@ -74,10 +136,10 @@ def train_model():
     os.makedirs(model_dir, exist_ok=True)
     
     model_path = os.path.join(model_dir, "trained_model.pkl")
-    with open(model_path, 'wb') as f:
-        pickle.dump(best_model, f)
+    publish_model(best_model, model_path)
     
     print(f"Modelo guardado en {model_path}")
+    print(f"Modelo compilado guardado en {COMPILED_MODEL_DIR}")
     
     # Guardar también información sobre las características
     feature_importance = pd.DataFrame({
@@ -92,4 +154,16 @@ def train_model():
     return best_model
 
 if __name__ == "__main__":
-    train_model()
\ No newline at end of file
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Entrena el modelo de recomendación")
+    parser.add_argument("--dataset", default=TRAINING_SET_DIR,
+                        help="Conjunto columnar a usar (p. ej. el extraído con app.ml.training.extract)")
+    parser.add_argument("--search", choices=["grid", "halving"], default="grid",
+                        help="grid: grilla simplificada; halving: grilla completa por reducción sucesiva")
+    parser.add_argument("--cpu-budget", type=float, default=None,
+                        help="Segundos de CPU máximos para la búsqueda por reducción sucesiva")
+    parser.add_argument("--journal", default=SEARCH_JOURNAL)
+    args = parser.parse_args()
+    train_model(dataset_dir=args.dataset, search=args.search, cpu_budget_seconds=args.cpu_budget,
+                journal_path=args.journal)
\ No newline at end of file
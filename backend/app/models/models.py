@@ -1,5 +1,5 @@
 # app/models/models.py
-from sqlalchemy import Boolean, Column, Integer, String, Float, ForeignKey, Table, DateTime, Enum as SQLAlchemyEnum
+from sqlalchemy import Boolean, Column, Integer, String, Float, ForeignKey, Index, Table, DateTime, Enum as SQLAlchemyEnum
 from sqlalchemy.orm import relationship
 import enum
 from datetime import datetime
@@ -127,6 +127,13 @@ class Project(Base):
     messages = relationship("ChatMessage", back_populates="project")
     # Relación para aplicaciones al proyecto
     applications = relationship("ProjectApplication", back_populates="project")
+    
+    # Índices de las consultas frecuentes (listados por estado, cliente y freelancer)
+    __table_args__ = (
+        Index("ix_projects_status", "status"),
+        Index("ix_projects_client_id_updated_at", "client_id", "updated_at"),
+        Index("ix_projects_freelancer_id_updated_at", "freelancer_id", "updated_at"),
+    )
 
 # Nuevos modelos
 class ChatMessage(Base):
@@ -144,6 +151,12 @@ class ChatMessage(Base):
     project = relationship("Project", back_populates="messages")
     sender = relationship("User", back_populates="sent_messages", foreign_keys=[sender_id])
     receiver = relationship("User", back_populates="received_messages", foreign_keys=[receiver_id])
+    
+    # Mensajes de un proyecto en orden cronológico y no leídos por destinatario
+    __table_args__ = (
+        Index("ix_chat_messages_project_id_created_at", "project_id", "created_at"),
+        Index("ix_chat_messages_receiver_id_status", "receiver_id", "status"),
+    )
 
 class Transaction(Base):
     __tablename__ = "transactions"
@@ -158,6 +171,11 @@ class Transaction(Base):
     
     # Relaciones
     user = relationship("User", back_populates="transactions")
+    
+    # Historial de transacciones de un usuario
+    __table_args__ = (
+        Index("ix_transactions_user_id_created_at", "user_id", "created_at"),
+    )
 
 class ProjectApplication(Base):
     __tablename__ = "project_applications"
@@ -173,6 +191,11 @@ class ProjectApplication(Base):
     # Relaciones
     project = relationship("Project", back_populates="applications")
     freelancer = relationship("User", back_populates="applications")
+    
+    # Postulaciones de un proyecto y búsqueda de la postulación de un freelancer
+    __table_args__ = (
+        Index("ix_project_applications_project_id_freelancer_id", "project_id", "freelancer_id"),
+    )
 
 class CreditRequest(Base):
     __tablename__ = "credit_requests"
@@ -190,4 +213,11 @@ class CreditRequest(Base):
     
     # Relaciones
     user = relationship("User", foreign_keys=[user_id])
-    reviewer = relationship("User", foreign_keys=[reviewed_by])
\ No newline at end of file
+    reviewer = relationship("User", foreign_keys=[reviewed_by])
+    
+    # Solicitudes pendientes en orden de llegada
+    __table_args__ = (
+        Index("ix_credit_requests_status_created_at", "status", "created_at"),
+        # Listado de todas las solicitudes (paginado por fecha)
+        Index("ix_credit_requests_created_at", "created_at"),
+    )
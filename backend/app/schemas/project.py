@@ -35,4 +35,11 @@ class Project(ProjectBase):
 
 class ProjectDetail(Project):
     client_name: Optional[str] = None
-    freelancer_name: Optional[str] = None
\ No newline at end of file
+    freelancer_name: Optional[str] = None
+
+class RecommendedProject(Project):
+    match_probability: float
+
+class RecommendedProjectPage(BaseModel):
+    items: List[RecommendedProject] = []
+    next_cursor: Optional[str] = None
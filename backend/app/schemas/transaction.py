@@ -24,7 +24,7 @@ class Transaction(TransactionBase):
     created_at: datetime
 
     class Config:
-        from_attributes = True
+        orm_mode = True
 
 class UserBalance(BaseModel):
     credits_balance: float
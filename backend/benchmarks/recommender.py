@@ -0,0 +1,379 @@
+# benchmarks/recommender.py
+"""
+Benchmark del recomendador sobre conjuntos sintéticos de freelancers.
+
+Para cada tamaño de conjunto (por defecto 1k, 10k, 100k y 1M freelancers) mide
+la latencia p50/p99 y la memoria pico de:
+
+- `isolated`: `FreelancerRecommender.recommend_freelancers` y
+  `recommend_projects` llamados directamente sobre listas de diccionarios.
+- `endpoint`: `GET /projects/recommendations/{id}` y `GET /projects/recommended`
+  de punta a punta (TestClient + SQLite sembrada con el mismo conjunto), con
+  las cachés vaciadas antes de cada petición.
+
+Las habilidades siguen una distribución de Zipf (pocas habilidades muy
+comunes y una cola larga), igual que las áreas con un sesgo menor. Los
+resultados se escriben en JSON para comparar entre commits.
+
+Uso (desde backend/):
+    python -m benchmarks.recommender --sizes 1000 10000 --output bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from app.ml.training.marketplace import AREAS, sample_skill_sets, skill_names, zipf_weights  # noqa: E402
+
+BENCH_PASSWORD = "benchmark"
+
+
+class SyntheticPool(NamedTuple):
+    """Conjunto sintético en columnas; las habilidades van en formato CSR (indptr, indices)."""
+    numeric: Dict[str, np.ndarray]
+    area: np.ndarray
+    skill_indptr: np.ndarray
+    skill_indices: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.area)
+
+    def skills_of(self, i: int) -> np.ndarray:
+        return self.skill_indices[self.skill_indptr[i]:self.skill_indptr[i + 1]]
+
+
+def generate_freelancers(rng: np.random.Generator, n: int, n_skills: int, zipf_exponent: float) -> SyntheticPool:
+    indptr, indices = sample_skill_sets(rng, n, zipf_weights(n_skills, zipf_exponent), 1, 10)
+    return SyntheticPool(
+        numeric={
+            "experience_years": np.round(rng.uniform(0.5, 15.0, n), 1),
+            "hourly_rate": np.round(rng.uniform(10.0, 100.0, n), 2),
+            "rating": np.round(rng.uniform(3.0, 5.0, n), 1),
+        },
+        area=rng.choice(len(AREAS), size=n, p=zipf_weights(len(AREAS), 0.6)),
+        skill_indptr=indptr,
+        skill_indices=indices,
+    )
+
+
+def generate_projects(rng: np.random.Generator, n: int, n_skills: int, zipf_exponent: float) -> SyntheticPool:
+    indptr, indices = sample_skill_sets(rng, n, zipf_weights(n_skills, zipf_exponent), 2, 6)
+    return SyntheticPool(
+        numeric={"budget": np.round(rng.uniform(100.0, 5000.0, n), 2)},
+        area=rng.choice(len(AREAS), size=n, p=zipf_weights(len(AREAS), 0.6)),
+        skill_indptr=indptr,
+        skill_indices=indices,
+    )
+
+
+def freelancer_dicts(pool: SyntheticPool, names: List[str], first_id: int = 1) -> List[Dict[str, Any]]:
+    experience, rate, rating = (pool.numeric[k].tolist() for k in ("experience_years", "hourly_rate", "rating"))
+    return [
+        {
+            "id": first_id + i,
+            "experience_years": experience[i],
+            "hourly_rate": rate[i],
+            "rating": rating[i],
+            "area_expertise": AREAS[pool.area[i]],
+            "skills": [names[s] for s in pool.skills_of(i)],
+        }
+        for i in range(len(pool))
+    ]
+
+
+def project_dicts(pool: SyntheticPool, names: List[str], first_id: int = 1) -> List[Dict[str, Any]]:
+    budget = pool.numeric["budget"].tolist()
+    return [
+        {
+            "id": first_id + i,
+            "budget": budget[i],
+            "area": AREAS[pool.area[i]],
+            "skills_required": [names[s] for s in pool.skills_of(i)],
+        }
+        for i in range(len(pool))
+    ]
+
+
+def seed_database(engine, freelancers: SyntheticPool, projects: SyntheticPool, names: List[str],
+                  chunk_size: int = 20000) -> None:
+    """
+    Recrea las tablas y carga el conjunto con inserciones masivas (sin ORM).
+    El usuario 1 es el cliente dueño de todos los proyectos; los freelancers
+    tienen ids 2..n+1.
+    """
+    from app.core.security import get_password_hash
+    from app.database import Base
+    from app.models.models import Project, ProjectStatus, Skill, User, project_skills, user_skills
+
+    if engine.dialect.name != "sqlite":
+        raise RuntimeError(f"seed_database borra todas las tablas; se negó a hacerlo sobre {engine.url!r}")
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    password_hash = get_password_hash(BENCH_PASSWORD)
+    now = datetime.utcnow()
+
+    def user_row(user_id, username, **fields):
+        row = {
+            "id": user_id, "email": f"{username}@example.com", "username": username,
+            "hashed_password": password_hash, "full_name": None, "is_active": True,
+            "is_freelancer": False, "is_client": False, "experience_years": None,
+            "hourly_rate": None, "rating": 0.0, "area_expertise": None,
+            "credits_balance": 0.0, "is_admin": False,
+        }
+        row.update(fields)
+        return row
+
+    with engine.begin() as conn:
+        conn.execute(Skill.__table__.insert(), [{"id": i + 1, "name": name} for i, name in enumerate(names)])
+        conn.execute(User.__table__.insert(), [user_row(1, "bench_client", is_client=True)])
+
+        experience, rate, rating = (
+            freelancers.numeric[k].tolist() for k in ("experience_years", "hourly_rate", "rating")
+        )
+        for start in range(0, len(freelancers), chunk_size):
+            stop = min(start + chunk_size, len(freelancers))
+            conn.execute(User.__table__.insert(), [
+                user_row(
+                    i + 2, f"bench_f{i}", is_freelancer=True, experience_years=experience[i],
+                    hourly_rate=rate[i], rating=rating[i], area_expertise=AREAS[freelancers.area[i]]
+                )
+                for i in range(start, stop)
+            ])
+            conn.execute(user_skills.insert(), [
+                {"user_id": i + 2, "skill_id": int(s) + 1}
+                for i in range(start, stop) for s in freelancers.skills_of(i)
+            ])
+
+        budget = projects.numeric["budget"].tolist()
+        for start in range(0, len(projects), chunk_size):
+            stop = min(start + chunk_size, len(projects))
+            conn.execute(Project.__table__.insert(), [
+                {
+                    "id": i + 1, "title": f"Proyecto {i + 1}", "description": "Proyecto sintético",
+                    "client_id": 1, "freelancer_id": None, "status": ProjectStatus.OPEN.value,
+                    "budget": budget[i], "deadline": None, "created_at": now, "updated_at": now,
+                    "area": AREAS[projects.area[i]], "credits_held": 0.0, "is_paid": False,
+                }
+                for i in range(start, stop)
+            ])
+            conn.execute(project_skills.insert(), [
+                {"project_id": i + 1, "skill_id": int(s) + 1}
+                for i in range(start, stop) for s in projects.skills_of(i)
+            ])
+
+
+def measure(fn: Callable[[int], Any], repeats: int, warmup: int = 1) -> Dict[str, Any]:
+    """Latencias de `repeats` llamadas y memoria pico (tracemalloc) de una llamada aparte."""
+    for i in range(warmup):
+        fn(i)
+
+    latencies = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        fn(i)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+
+    # tracemalloc encarece las asignaciones, así que la memoria se mide fuera de las latencias
+    tracemalloc.start()
+    try:
+        fn(repeats)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    latencies = np.array(latencies)
+    return {
+        "repeats": repeats,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "mean_ms": float(latencies.mean()),
+        "min_ms": float(latencies.min()),
+        "max_ms": float(latencies.max()),
+        "peak_memory_mb": peak / 2 ** 20,
+    }
+
+
+def run_isolated(recommender, freelancers: SyntheticPool, projects: SyntheticPool, names: List[str],
+                 repeats: int, top_n: int) -> List[Dict[str, Any]]:
+    freelancer_list = freelancer_dicts(freelancers, names)
+    project_list = project_dicts(projects, names)
+    results = []
+
+    def score_freelancers(i):
+        recommender.recommend_freelancers(project_list[i % len(project_list)], freelancer_list, top_n=top_n)
+
+    def score_projects(i):
+        recommender.recommend_projects(freelancer_list[i % len(freelancer_list)], project_list, top_n=top_n)
+
+    results.append({"mode": "isolated", "target": "recommend_freelancers", "candidates": len(freelancer_list),
+                    **measure(score_freelancers, repeats)})
+    results.append({"mode": "isolated", "target": "recommend_projects", "candidates": len(project_list),
+                    **measure(score_projects, repeats)})
+    return results
+
+
+def run_endpoint(client, freelancers: SyntheticPool, projects: SyntheticPool, names: List[str],
+                 repeats: int) -> List[Dict[str, Any]]:
+    from app.core.config import settings
+    from app.database import SessionLocal, engine
+    from app.ml.cache import project_ranking_cache, recommendation_cache
+    from app.ml.candidates import freelancer_index
+
+    seed_started = time.perf_counter()
+    seed_database(engine, freelancers, projects, names)
+    seed_seconds = time.perf_counter() - seed_started
+
+    db = SessionLocal()
+    try:
+        freelancer_index.load_from_db(db)
+    finally:
+        db.close()
+
+    def login(username):
+        response = client.post(
+            f"{settings.API_V1_STR}/auth/login", data={"username": username, "password": BENCH_PASSWORD}
+        )
+        response.raise_for_status()
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    client_headers = login("bench_client")
+    freelancer_headers = login("bench_f0")
+
+    def recommend_freelancers(i):
+        recommendation_cache.clear()
+        project_id = i % len(projects) + 1
+        response = client.get(f"{settings.API_V1_STR}/projects/recommendations/{project_id}", headers=client_headers)
+        response.raise_for_status()
+
+    def recommend_projects(i):
+        project_ranking_cache.clear()
+        response = client.get(f"{settings.API_V1_STR}/projects/recommended", headers=freelancer_headers)
+        response.raise_for_status()
+
+    common = {"mode": "endpoint", "seed_seconds": seed_seconds}
+    return [
+        {**common, "target": "GET /projects/recommendations/{project_id}", "candidates": len(freelancers),
+         **measure(recommend_freelancers, repeats)},
+        {**common, "target": "GET /projects/recommended", "candidates": len(projects),
+         **measure(recommend_projects, repeats)},
+    ]
+
+
+def git_commit() -> Any:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=BACKEND_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Benchmark del recomendador sobre conjuntos sintéticos")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000],
+                        help="Tamaños del conjunto de freelancers")
+    parser.add_argument("--modes", nargs="+", choices=["isolated", "endpoint"], default=["isolated", "endpoint"])
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--top-n", type=int, default=5)
+    parser.add_argument("--projects-ratio", type=float, default=0.1,
+                        help="Proyectos abiertos por freelancer en el conjunto (mínimo 100)")
+    parser.add_argument("--n-skills", type=int, default=200)
+    parser.add_argument("--zipf-exponent", type=float, default=1.1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--model-path", help="Pickle del modelo a usar (por defecto el del registro)")
+    parser.add_argument("--compiled-dir", help="Directorio del modelo compilado a usar")
+    parser.add_argument("--workdir", help="Directorio donde se crea la base de datos SQLite del benchmark")
+    parser.add_argument("--output", default="benchmark_recommender.json")
+    args = parser.parse_args(argv)
+
+    output = os.path.abspath(args.output)
+    workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix="bench_recommender_"))
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    # seed_database borra todas las tablas: el motor global de app.database debe apuntar a
+    # una SQLite propia del benchmark y nunca a la DATABASE_URL del entorno (p. ej. PostgreSQL)
+    database_url = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["DATABASE_URL"] = database_url
+
+    from app.core.config import settings
+    from app.database import SQLALCHEMY_DATABASE_URL
+    from app.ml.registry import model_registry
+
+    if SQLALCHEMY_DATABASE_URL != database_url:
+        raise RuntimeError(
+            f"app.database ya estaba importado con {SQLALCHEMY_DATABASE_URL}; "
+            "ejecute el benchmark en un proceso nuevo (python -m benchmarks.recommender)"
+        )
+
+    if args.model_path:
+        model_registry.model_path = os.path.abspath(args.model_path)
+    if args.compiled_dir:
+        model_registry.compiled_dir = os.path.abspath(args.compiled_dir)
+    model_registry.reload()
+    recommender = model_registry.get_recommender()
+
+    client = None
+    if "endpoint" in args.modes:
+        from fastapi.testclient import TestClient
+        import app.main
+
+        client = TestClient(app.main.app)
+
+    names = skill_names(args.n_skills)
+    results = []
+    for size in args.sizes:
+        rng = np.random.default_rng([args.seed, size])
+        freelancers = generate_freelancers(rng, size, args.n_skills, args.zipf_exponent)
+        projects = generate_projects(rng, max(100, int(size * args.projects_ratio)), args.n_skills, args.zipf_exponent)
+
+        if "isolated" in args.modes:
+            for result in run_isolated(recommender, freelancers, projects, names, args.repeats, args.top_n):
+                results.append({"pool_size": size, **result})
+                print(f"[{size}] {result['target']}: p50={result['p50_ms']:.1f} ms p99={result['p99_ms']:.1f} ms "
+                      f"pico={result['peak_memory_mb']:.1f} MB")
+        if "endpoint" in args.modes:
+            for result in run_endpoint(client, freelancers, projects, names, args.repeats):
+                results.append({"pool_size": size, **result})
+                print(f"[{size}] {result['target']}: p50={result['p50_ms']:.1f} ms p99={result['p99_ms']:.1f} ms "
+                      f"pico={result['peak_memory_mb']:.1f} MB")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "model": {key: model_registry.info()[key] for key in ("source", "version", "file_size")},
+            "settings": {
+                key: getattr(settings, key) for key in (
+                    "RECOMMENDER_CANDIDATE_LIMIT", "RECOMMENDER_SCORING_CHUNK_SIZE",
+                    "RECOMMENDER_BATCH_WAIT_MS", "PROJECT_RECOMMENDATIONS_TOP_K",
+                )
+            },
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"Resultados guardados en {output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
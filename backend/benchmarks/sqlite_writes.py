@@ -0,0 +1,243 @@
+# benchmarks/sqlite_writes.py
+"""
+Benchmark de escrituras concurrentes sobre SQLite.
+
+Compara la configuración por defecto (una conexión nueva por sesión, journal
+por defecto) con el modo de alta concurrencia (WAL + pragmas + una única
+conexión de escritura en cola, SQLITE_HIGH_CONCURRENCY=true). En cada modo,
+`--writers` hilos repiten las escrituras de la API (create_message,
+purchase_credits y la aceptación de una postulación) mientras `--readers`
+hilos leen mensajes y transacciones, durante `--seconds` segundos.
+
+Se informa el rendimiento (escrituras por segundo), la latencia p50/p99 de
+cada escritura y cuántas fallaron (por ejemplo, con "database is locked").
+
+Uso (desde backend/):
+    python -m benchmarks.sqlite_writes --writers 16 --readers 4 --seconds 10
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.recommender import git_commit  # noqa: E402
+
+MODES = {"default": False, "high_concurrency": True}
+
+
+def seed(engine, n_pairs: int) -> None:
+    """Un cliente con créditos, un freelancer y un proyecto asignado por par (ids 2i+1, 2i+2 e i+1)."""
+    from app.database import Base
+    from app.models.models import ApplicationStatus, Project, ProjectApplication, ProjectStatus, User
+
+    Base.metadata.create_all(bind=engine)
+    users, projects, applications = [], [], []
+    for i in range(n_pairs):
+        client_id, freelancer_id = 2 * i + 1, 2 * i + 2
+        users.append(dict(id=client_id, email=f"c{i}@example.com", username=f"c{i}", hashed_password="x",
+                          is_active=True, is_client=True, is_freelancer=False, credits_balance=1e6))
+        users.append(dict(id=freelancer_id, email=f"f{i}@example.com", username=f"f{i}", hashed_password="x",
+                          is_active=True, is_client=False, is_freelancer=True, credits_balance=0.0))
+        projects.append(dict(id=i + 1, title=f"p{i}", description="d", client_id=client_id, budget=100.0,
+                             status=ProjectStatus.OPEN.value, area="Economía"))
+        applications.append(dict(id=i + 1, project_id=i + 1, freelancer_id=freelancer_id,
+                                 status=ApplicationStatus.PENDING.value))
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), users)
+        conn.execute(Project.__table__.insert(), projects)
+        conn.execute(ProjectApplication.__table__.insert(), applications)
+
+
+def write_operations(n_pairs: int):
+    """Escrituras de la API, con la misma sesión y commit que usan los endpoints."""
+    from app.crud.application import update_application_status
+    from app.crud.chat import create_message
+    from app.crud.transaction import purchase_credits
+    from app.schemas.chat import ChatMessageCreate
+    from app.schemas.transaction import CreditPurchase
+
+    def message(db, i):
+        pair = i % n_pairs
+        create_message(db, ChatMessageCreate(project_id=pair + 1, receiver_id=2 * pair + 2, message="hola"),
+                       sender_id=2 * pair + 1)
+
+    def credits(db, i):
+        purchase_credits(db, user_id=2 * (i % n_pairs) + 1,
+                         credit_purchase=CreditPurchase(amount=10.0, description="Compra de créditos"))
+
+    def accept(db, i):
+        # Igual que accept_application: estado de la postulación y asignación del proyecto
+        from app.models.models import Project
+        pair = i % n_pairs
+        project = db.query(Project).filter(Project.id == pair + 1).first()
+        project.freelancer_id = 2 * pair + 2
+        project.status = "assigned"
+        update_application_status(db, application_id=pair + 1, status="accepted")
+
+    return {"create_message": message, "purchase_credits": credits, "accept_application": accept}
+
+
+def read_operations(n_pairs: int):
+    from app.crud.chat import get_project_messages
+    from app.crud.transaction import get_user_transactions
+
+    return [
+        lambda db, i: get_project_messages(db, project_id=i % n_pairs + 1, limit=20),
+        lambda db, i: get_user_transactions(db, user_id=2 * (i % n_pairs) + 1, limit=20),
+    ]
+
+
+def run_mode(mode: str, workdir: str, writers: int, readers: int, seconds: float, n_pairs: int) -> Dict[str, Any]:
+    from sqlalchemy.orm import sessionmaker
+
+    from app.database import create_engines
+
+    path = os.path.join(workdir, f"{mode}.db")
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    engine, writer_engine = create_engines(f"sqlite:///{path}", sqlite_high_concurrency=MODES[mode])
+    seed(writer_engine, n_pairs)
+    ReadSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    WriteSession = sessionmaker(autocommit=False, autoflush=False, bind=writer_engine)
+
+    operations = list(write_operations(n_pairs).items())
+    reads = read_operations(n_pairs)
+    latencies: Dict[str, List[float]] = {name: [] for name, _ in operations}
+    errors: Counter = Counter()
+    read_count = [0]
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + seconds
+
+    def writer(worker: int) -> None:
+        i = worker
+        while time.perf_counter() < stop_at:
+            name, operation = operations[i % len(operations)]
+            db = WriteSession()
+            started = time.perf_counter()
+            try:
+                operation(db, i)
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies[name].append(elapsed)
+            except Exception as e:
+                db.rollback()
+                with lock:
+                    errors[f"{name}: {type(e).__name__}: {str(e).splitlines()[0][:80]}"] += 1
+            finally:
+                db.close()
+            i += writers
+
+    def reader(worker: int) -> None:
+        i = worker
+        while time.perf_counter() < stop_at:
+            db = ReadSession()
+            try:
+                reads[i % len(reads)](db, i)
+                with lock:
+                    read_count[0] += 1
+            except Exception as e:
+                with lock:
+                    errors[f"read: {type(e).__name__}"] += 1
+            finally:
+                db.close()
+            i += readers
+
+    threads = [threading.Thread(target=writer, args=(w,)) for w in range(writers)]
+    threads += [threading.Thread(target=reader, args=(r,)) for r in range(readers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    all_latencies = np.array([value for values in latencies.values() for value in values]) * 1e3
+    result = {
+        "mode": mode,
+        "writes": len(all_latencies),
+        "writes_per_second": len(all_latencies) / elapsed,
+        "reads_per_second": read_count[0] / elapsed,
+        "failed_writes": sum(count for key, count in errors.items() if not key.startswith("read")),
+        "errors": dict(errors),
+        "p50_ms": float(np.percentile(all_latencies, 50)) if len(all_latencies) else None,
+        "p99_ms": float(np.percentile(all_latencies, 99)) if len(all_latencies) else None,
+        "per_operation": {
+            name: {
+                "count": len(values),
+                "p50_ms": float(np.percentile(values, 50) * 1e3) if values else None,
+                "p99_ms": float(np.percentile(values, 99) * 1e3) if values else None,
+            }
+            for name, values in latencies.items()
+        },
+    }
+    engine.dispose()
+    writer_engine.dispose()
+    return result
+
+
+def main(argv=None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Benchmark de escrituras concurrentes sobre SQLite")
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--pairs", type=int, default=100, help="Pares cliente/freelancer/proyecto sembrados")
+    parser.add_argument("--workdir", help="Directorio de las bases de datos del benchmark")
+    parser.add_argument("--output", default="benchmark_sqlite_writes.json")
+    args = parser.parse_args(argv)
+
+    output = os.path.abspath(args.output)
+    workdir = args.workdir or tempfile.mkdtemp(prefix="bench_sqlite_writes_")
+    os.makedirs(workdir, exist_ok=True)
+
+    from app.core.config import settings
+
+    results = []
+    for mode in args.modes:
+        result = run_mode(mode, workdir, args.writers, args.readers, args.seconds, args.pairs)
+        results.append(result)
+        print(f"[{mode}] {result['writes_per_second']:.0f} escrituras/s, {result['reads_per_second']:.0f} lecturas/s, "
+              f"p50={result['p50_ms'] or 0:.1f} ms p99={result['p99_ms'] or 0:.1f} ms, "
+              f"{result['failed_writes']} escrituras fallidas")
+        for error, count in result["errors"].items():
+            print(f"    {count} x {error}")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "settings": {
+                key: getattr(settings, key) for key in (
+                    "SQLITE_BUSY_TIMEOUT_MS", "SQLITE_MMAP_SIZE_BYTES", "SQLITE_CACHE_SIZE_KB",
+                    "SQLITE_WRITER_TIMEOUT_SECONDS", "DB_POOL_SIZE", "DB_MAX_OVERFLOW",
+                )
+            },
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"Resultados guardados en {output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+# Base de datos propia de las pruebas; debe fijarse antes de importar app.*
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='tests_'), 'test.db')}"
+os.environ["DB_QUERY_COUNT_HEADER"] = "true"
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    import app.main
+
+    with TestClient(app.main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client):
+    # Usuario creado al arrancar por app.core.init_admin
+    response = client.post("/api/v1/auth/login", data={"username": "admin", "password": "tesis1234"})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture(scope="session")
+def make_user(client):
+    """Registra un usuario por la API y devuelve (id, headers) ya autenticado."""
+    def make(username, **flags):
+        response = client.post("/api/v1/auth/register", json={
+            "email": f"{username}@example.com", "username": username, "password": "secreta123", **flags,
+        })
+        assert response.status_code == 200, response.text
+        login = client.post("/api/v1/auth/login", data={"username": username, "password": "secreta123"})
+        assert login.status_code == 200, login.text
+        return response.json()["id"], {"Authorization": f"Bearer {login.json()['access_token']}"}
+    return make
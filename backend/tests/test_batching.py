@@ -0,0 +1,56 @@
+"""
+Servicio de micro-lotes: cada petición recibe sus filas y un error en un
+lote no detiene el hilo que atiende la cola.
+"""
+import time
+
+import numpy as np
+import pytest
+
+from app.ml.batching import InferenceBatcher
+
+
+class SumModel:
+    def predict_proba(self, features):
+        total = np.asarray(features, dtype=float).sum(axis=1)
+        return np.column_stack([-total, total])
+
+
+class BrokenFeatures:
+    """Características cuyo tamaño no se puede calcular (falla al armar el lote)."""
+
+    def __len__(self):
+        raise TypeError("sin tamaño")
+
+
+@pytest.fixture
+def batcher():
+    return InferenceBatcher(max_wait_ms=1, max_batch_rows=1000, timeout=5)
+
+
+def test_each_job_gets_its_rows(batcher):
+    features = np.arange(12, dtype=float).reshape(6, 2)
+    probabilities = batcher.predict_proba(SumModel(), features)
+    np.testing.assert_array_equal(probabilities, SumModel().predict_proba(features))
+
+
+def test_errors_outside_the_model_fail_the_job_and_keep_the_worker(batcher):
+    started = time.monotonic()
+    with pytest.raises(TypeError):
+        batcher.predict_proba(SumModel(), BrokenFeatures())
+    # El error llega de inmediato, no al vencer el timeout
+    assert time.monotonic() - started < batcher.timeout
+
+    features = np.ones((3, 2))
+    np.testing.assert_array_equal(batcher.predict_proba(SumModel(), features)[:, 1], [2.0, 2.0, 2.0])
+    assert batcher._thread.is_alive()
+
+
+def test_model_errors_reach_the_caller(batcher):
+    class FailingModel:
+        def predict_proba(self, features):
+            raise ValueError("modelo roto")
+
+    with pytest.raises(ValueError, match="modelo roto"):
+        batcher.predict_proba(FailingModel(), np.ones((2, 2)))
+    assert batcher.predict_proba(SumModel(), np.ones((1, 2))).shape == (1, 2)
@@ -0,0 +1,78 @@
+"""
+Sesiones con motores de lectura y escritura separados (modo de alta
+concurrencia de SQLite): la conexión de escritura se toma solo durante la
+transacción que escribe.
+"""
+import os
+import tempfile
+
+import pytest
+
+from app.database import Base, RoutingSession, create_engines
+from app.models.models import User
+
+
+@pytest.fixture
+def session_class():
+    path = os.path.join(tempfile.mkdtemp(prefix="routing_"), "routing.db")
+    engine, writer_engine = create_engines(f"sqlite:///{path}", sqlite_high_concurrency=True)
+    assert engine is not writer_engine
+    Base.metadata.create_all(bind=writer_engine)
+    yield type("TestRoutingSession", (RoutingSession,), {"reader_engine": engine, "writer_engine": writer_engine})
+    engine.dispose()
+    writer_engine.dispose()
+
+
+def writer_checked_out(session_class) -> int:
+    return session_class.writer_engine.pool.checkedout()
+
+
+def test_reads_do_not_take_the_writer(session_class):
+    db = session_class()
+    try:
+        db.query(User).all()
+        assert writer_checked_out(session_class) == 0
+    finally:
+        db.close()
+
+
+def test_writer_is_held_only_until_commit(session_class):
+    db = session_class()
+    try:
+        db.add(User(email="routing@example.com", username="routing", hashed_password="x"))
+        db.flush()
+        assert writer_checked_out(session_class) == 1
+        # Después de escribir, la transacción lee por la misma conexión y ve lo propio
+        assert db.query(User).filter(User.username == "routing").count() == 1
+        db.commit()
+        assert writer_checked_out(session_class) == 0
+        # Lo confirmado se lee por el pool de lectura
+        assert db.query(User).filter(User.username == "routing").count() == 1
+        assert writer_checked_out(session_class) == 0
+    finally:
+        db.close()
+
+
+def test_bulk_update_goes_to_the_writer(session_class):
+    db = session_class()
+    try:
+        db.add(User(email="bulk@example.com", username="bulk", hashed_password="x"))
+        db.commit()
+        db.query(User).filter(User.username == "bulk").update({"full_name": "Bulk"}, synchronize_session=False)
+        assert writer_checked_out(session_class) == 1
+        db.commit()
+        assert writer_checked_out(session_class) == 0
+    finally:
+        db.close()
+
+
+def test_use_writer_reads_through_the_writer(session_class):
+    db = session_class()
+    try:
+        db.use_writer()
+        db.query(User).all()
+        assert writer_checked_out(session_class) == 1
+        db.rollback()
+        assert writer_checked_out(session_class) == 0
+    finally:
+        db.close()
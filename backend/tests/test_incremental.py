@@ -0,0 +1,96 @@
+"""
+Actualización incremental del modelo: cada extracción vuelve a leer una
+ventana antes de la marca de agua para recuperar empates y confirmaciones
+tardías, y las postulaciones ya usadas se descartan gracias al checkpoint.
+"""
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.ml.features import FEATURE_COLUMNS
+from app.ml.training.incremental import update_model
+from app.ml.training.train_model import publish_model
+from app.models.models import Project, ProjectApplication, User
+
+WATERMARK = datetime(2024, 3, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def env(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'incremental.db'}")
+    Base.metadata.create_all(bind=engine)
+    # Inserciones con Core: estos usuarios no deben pasar al índice en memoria del servidor
+    with engine.begin() as connection:
+        connection.execute(User.__table__.insert(), [
+            {"id": i, "email": f"f{i}@example.com", "username": f"f{i}", "hashed_password": "x",
+             "is_freelancer": True, "experience_years": i % 7, "hourly_rate": 10.0 + i, "rating": i % 5,
+             "area_expertise": "Economía" if i % 2 else "Sociología"}
+            for i in range(1, 11)
+        ])
+        connection.execute(Project.__table__.insert(), [
+            {"id": i, "title": f"p{i}", "description": "p", "client_id": 1, "budget": 100.0 * i,
+             "area": "Economía", "status": "completed"}
+            for i in range(1, 11)
+        ])
+
+    rng = np.random.default_rng(5)
+    X = pd.DataFrame(rng.random((100, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+    model = RandomForestClassifier(n_estimators=3, random_state=5).fit(X, (X.iloc[:, 0] > 0.5).astype(int))
+    model_path, compiled_dir = str(tmp_path / "trained_model.pkl"), str(tmp_path / "compiled")
+    publish_model(model, model_path, compiled_dir)
+
+    def add_applications(first_id, updated_ats):
+        with engine.begin() as connection:
+            connection.execute(ProjectApplication.__table__.insert(), [
+                {"id": first_id + n, "project_id": n % 10 + 1, "freelancer_id": (n * 3) % 10 + 1,
+                 "status": "accepted" if n % 2 else "rejected", "updated_at": updated_at}
+                for n, updated_at in enumerate(updated_ats)
+            ])
+
+    def run():
+        db = sessionmaker(bind=engine)()
+        try:
+            return update_model(
+                db, trees_per_update=2, min_new_rows=4, model_path=model_path, compiled_dir=compiled_dir,
+                checkpoint_path=str(tmp_path / "checkpoint.json"), chunk_size=7, overlap_seconds=300.0,
+            )
+        finally:
+            db.close()
+
+    def checkpoint():
+        with open(tmp_path / "checkpoint.json") as f:
+            return json.load(f)
+
+    yield add_applications, run, checkpoint
+    engine.dispose()
+
+
+def test_overlap_window_catches_ties_and_late_rows_once(env):
+    add_applications, run, checkpoint = env
+    add_applications(1, [WATERMARK - timedelta(seconds=30 - i) for i in range(30)] + [WATERMARK])
+    assert run() is not None
+    assert checkpoint()["rows"] == 31
+    assert checkpoint()["last_updated_at"] == WATERMARK.isoformat()
+
+    # Sin cambios: la ventana vuelve a leer filas ya usadas y se descartan todas
+    assert run() is None
+
+    # Empates con la marca de agua y confirmaciones tardías dentro de la ventana se recuperan;
+    # las más antiguas que la ventana no (por diseño)
+    add_applications(100, [WATERMARK] * 3 + [WATERMARK - timedelta(seconds=60)] * 3
+                     + [WATERMARK - timedelta(seconds=1000)])
+    assert run() is not None
+    assert checkpoint()["rows"] == 6
+    assert checkpoint()["n_estimators"] == 3 + 2 + 2
+
+    # El checkpoint solo recuerda lo que la próxima extracción volverá a leer
+    window_start = (WATERMARK - timedelta(seconds=300) - datetime(1970, 1, 1)).total_seconds()
+    assert all(updated_at >= window_start for _, updated_at in checkpoint()["seen"])
+    assert run() is None
@@ -0,0 +1,64 @@
+"""
+Migraciones versionadas: cada una se aplica una sola vez, queda registrada
+y correr el ejecutor otra vez no cambia nada.
+"""
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from app.core.migrations import MIGRATIONS, Migration, applied_versions, run_migrations
+from app.database import Base
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migraciones.db'}")
+    yield engine
+    engine.dispose()
+
+
+def index_names(engine, table):
+    return {index["name"] for index in inspect(engine).get_indexes(table)}
+
+
+def test_fresh_database_records_every_version_once(engine):
+    Base.metadata.create_all(bind=engine)
+    versions = [migration.version for migration in MIGRATIONS]
+
+    assert run_migrations(engine) == versions
+    assert applied_versions(engine) == versions
+    assert run_migrations(engine) == []
+    assert applied_versions(engine) == versions
+
+
+def test_existing_database_gets_the_missing_indexes(engine):
+    # Base creada antes de las migraciones: tablas sin los índices nuevos
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_chat_messages_project_id_created_at"))
+        connection.execute(text("DROP INDEX ix_credit_requests_created_at"))
+    assert "ix_chat_messages_project_id_created_at" not in index_names(engine, "chat_messages")
+
+    run_migrations(engine)
+    assert "ix_chat_messages_project_id_created_at" in index_names(engine, "chat_messages")
+    assert "ix_credit_requests_created_at" in index_names(engine, "credit_requests")
+    assert run_migrations(engine) == []
+
+
+def test_failed_migration_is_not_recorded(engine):
+    calls = []
+
+    def create_table(connection):
+        calls.append("tabla")
+        connection.execute(text("CREATE TABLE IF NOT EXISTS ejemplo (id INTEGER)"))
+
+    def broken(connection):
+        raise RuntimeError("migración rota")
+
+    migrations = [Migration(1, "tabla", create_table), Migration(2, "rota", broken)]
+    with pytest.raises(RuntimeError):
+        run_migrations(engine, migrations)
+    assert applied_versions(engine) == [1]
+
+    fixed = [Migration(1, "tabla", create_table), Migration(2, "arreglada", lambda connection: None)]
+    assert run_migrations(engine, fixed) == [2]
+    assert calls == ["tabla"]
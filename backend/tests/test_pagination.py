@@ -0,0 +1,170 @@
+"""
+Paginación por cursor (keyset) de las listas del API.
+
+Las páginas se recorren siguiendo la cabecera X-Next-Cursor, como lo hace el
+frontend, y el resultado debe coincidir con una sola página grande: mismo
+orden (created_at descendente, id como desempate), sin duplicados ni huecos.
+"""
+from datetime import datetime
+
+import pytest
+
+from app.api.deps import NEXT_CURSOR_HEADER
+from app.database import SessionLocal
+from app.models.models import ChatMessage, CreditRequest, Project, ProjectStatus, Transaction
+
+
+def walk(client, url, headers, limit):
+    """Recorre todas las páginas de `url` y devuelve los ids en el orden recibido."""
+    ids, cursor = [], None
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(url, headers=headers, params=params)
+        assert response.status_code == 200, response.text
+        page = [item["id"] for item in response.json()]
+        assert len(page) <= limit
+        ids.extend(page)
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            return ids
+
+
+def add_ties(model, user_id, n, **values):
+    """Inserta n filas con el mismo created_at para ejercitar el desempate por id."""
+    created_at = datetime(2024, 1, 1, 12, 0, 0)
+    db = SessionLocal()
+    try:
+        db.add_all([model(user_id=user_id, amount=1.0, created_at=created_at, **values) for _ in range(n)])
+        db.commit()
+    finally:
+        db.close()
+
+
+def expected_order(model, **filters):
+    db = SessionLocal()
+    try:
+        rows = db.query(model.id, model.created_at).filter_by(**filters).all()
+    finally:
+        db.close()
+    return [row.id for row in sorted(rows, key=lambda row: (row.created_at, row.id), reverse=True)]
+
+
+def test_transactions_cursor_pages(client, make_user):
+    user_id, headers = make_user("pagina_transacciones", is_client=True)
+    for i in range(7):
+        response = client.post(
+            "/api/v1/transactions/purchase-credits", headers=headers,
+            json={"amount": 10.0 + i, "description": f"compra {i}"},
+        )
+        assert response.status_code == 200, response.text
+        assert response.json()["user_id"] == user_id
+    add_ties(Transaction, user_id, 5, transaction_type="credit_purchase", description="empate")
+
+    expected = expected_order(Transaction, user_id=user_id)
+    assert len(expected) == 12
+
+    single = client.get("/api/v1/transactions/transactions", headers=headers, params={"limit": 100})
+    assert single.status_code == 200, single.text
+    assert [item["id"] for item in single.json()] == expected
+    assert NEXT_CURSOR_HEADER not in single.headers
+
+    for limit in (1, 3, 5, 12):
+        assert walk(client, "/api/v1/transactions/transactions", headers, limit) == expected
+
+
+def test_credit_requests_cursor_pages(client, admin_headers, make_user):
+    user_id, headers = make_user("pagina_creditos", is_client=True)
+    for i in range(6):
+        response = client.post(
+            "/api/v1/credit-requests/", headers=headers,
+            json={"amount": 50.0 + i, "description": f"solicitud {i}"},
+        )
+        assert response.status_code == 200, response.text
+    add_ties(CreditRequest, user_id, 4, status="pending")
+
+    expected = expected_order(CreditRequest)
+    assert len(expected) >= 10
+
+    for limit in (1, 4, 100):
+        assert walk(client, "/api/v1/credit-requests/admin/all", admin_headers, limit) == expected
+
+
+def test_rows_added_mid_scroll_are_not_repeated(client, make_user):
+    user_id, headers = make_user("pagina_insercion", is_client=True)
+    for i in range(6):
+        client.post("/api/v1/transactions/purchase-credits", headers=headers, json={"amount": 1.0, "description": str(i)})
+    expected = expected_order(Transaction, user_id=user_id)
+
+    first = client.get("/api/v1/transactions/transactions", headers=headers, params={"limit": 3})
+    cursor = first.headers[NEXT_CURSOR_HEADER]
+    # Una compra nueva queda antes del cursor (más reciente) y no desplaza la página siguiente
+    client.post("/api/v1/transactions/purchase-credits", headers=headers, json={"amount": 1.0, "description": "nueva"})
+    second = client.get("/api/v1/transactions/transactions", headers=headers, params={"limit": 3, "cursor": cursor})
+    assert [item["id"] for item in first.json() + second.json()] == expected
+
+
+@pytest.mark.parametrize("url", ["/api/v1/projects/", "/api/v1/projects/open", "/api/v1/users/"])
+def test_id_ordered_lists_cursor_pages(client, admin_headers, make_user, url):
+    make_user(f"pagina_lista_{len(url)}", is_freelancer=True)
+    admin_id = client.get("/api/v1/users/me", headers=admin_headers).json()["id"]
+    db = SessionLocal()
+    try:
+        db.add_all([
+            Project(title=f"Lista {i}", description="Lista", client_id=admin_id, budget=10.0, area="Lista",
+                    status=ProjectStatus.OPEN.value if i % 2 else ProjectStatus.COMPLETED.value)
+            for i in range(8)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+    single = client.get(url, headers=admin_headers, params={"limit": 100000})
+    assert single.status_code == 200, single.text
+    expected = [item["id"] for item in single.json()]
+    assert expected == sorted(set(expected))
+    assert len(expected) >= 2
+
+    for limit in (1, 3, len(expected)):
+        assert walk(client, url, admin_headers, limit) == expected
+
+
+def test_project_messages_cursor_pages(client, admin_headers, make_user):
+    user_id, headers = make_user("pagina_chat", is_client=True)
+    admin_id = client.get("/api/v1/users/me", headers=admin_headers).json()["id"]
+    db = SessionLocal()
+    try:
+        project = Project(title="Chat", description="Chat", client_id=user_id, budget=10.0, area="Chat",
+                          status=ProjectStatus.OPEN.value)
+        db.add(project)
+        db.commit()
+        project_id = project.id
+        tie = datetime(2024, 1, 1, 12, 0, 0)
+        db.add_all(
+            [ChatMessage(project_id=project_id, sender_id=admin_id, receiver_id=user_id, message=f"m{i}",
+                         created_at=datetime(2024, 1, 1, 11, 0, i)) for i in range(4)]
+            + [ChatMessage(project_id=project_id, sender_id=admin_id, receiver_id=user_id, message=f"empate {i}",
+                           created_at=tie) for i in range(5)]
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    expected = list(reversed(expected_order(ChatMessage, project_id=project_id)))
+    assert len(expected) == 9
+    for limit in (1, 2, 4, 9):
+        assert walk(client, f"/api/v1/chat/project/{project_id}", headers, limit) == expected
+
+    # Leer el chat (un GET) marca los mensajes como leídos
+    db = SessionLocal()
+    try:
+        statuses = {row.status for row in db.query(ChatMessage.status).filter(ChatMessage.project_id == project_id)}
+    finally:
+        db.close()
+    assert statuses == {"read"}
+
+
+def test_invalid_cursor_is_rejected(client, admin_headers):
+    response = client.get("/api/v1/credit-requests/admin/all", headers=admin_headers, params={"cursor": "no-es-un-cursor"})
+    assert response.status_code == 400
@@ -0,0 +1,63 @@
+import pytest
+
+from app.database import SessionLocal, count_queries
+from app.models.models import Project, ProjectStatus, Skill, User, project_skills, user_skills
+
+SKILLS = ["Python", "R", "SPSS", "Excel avanzado", "Economía"]
+
+
+def reset_and_seed(n: int) -> None:
+    """Deja `n` proyectos abiertos y `n` usuarios además del admin, cada uno con varias habilidades."""
+    db = SessionLocal()
+    try:
+        db.execute(project_skills.delete())
+        db.execute(user_skills.delete())
+        db.query(Project).delete()
+        db.query(User).filter(User.username != "admin").delete()
+        skills = {skill.name: skill for skill in db.query(Skill).all()}
+        for name in SKILLS:
+            if name not in skills:
+                skills[name] = Skill(name=name)
+                db.add(skills[name])
+        db.flush()
+
+        admin = db.query(User).filter(User.username == "admin").one()
+        for i in range(n):
+            user = User(email=f"u{i}@example.com", username=f"u{i}", hashed_password="x",
+                        is_freelancer=True, skills=[skills[SKILLS[i % 5]], skills[SKILLS[(i + 1) % 5]]])
+            project = Project(title=f"p{i}", description="d", client_id=admin.id, budget=100.0, area="Economía",
+                              status=ProjectStatus.OPEN.value,
+                              skills_required=[skills[SKILLS[(i + k) % 5]] for k in range(3)])
+            db.add_all([user, project])
+        db.commit()
+    finally:
+        db.close()
+
+
+def queries_for(client, headers, url: str, expected_items: int) -> int:
+    with count_queries() as counter:
+        response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.text
+    assert len(response.json()) == expected_items
+    return counter.count
+
+
+@pytest.mark.parametrize("url, extra_items", [
+    ("/api/v1/projects/?limit=100", 0),
+    ("/api/v1/projects/open?limit=100", 0),
+    # El admin también aparece en el listado de usuarios
+    ("/api/v1/users/?limit=101", 1),
+])
+def test_list_endpoints_issue_constant_number_of_queries(client, admin_headers, url, extra_items):
+    reset_and_seed(10)
+    small_page = queries_for(client, admin_headers, url, 10 + extra_items)
+    reset_and_seed(100)
+    large_page = queries_for(client, admin_headers, url, 100 + extra_items)
+    assert small_page == large_page
+
+
+def test_query_count_header_matches_counter(client, admin_headers):
+    reset_and_seed(10)
+    with count_queries() as counter:
+        response = client.get("/api/v1/projects/?limit=100", headers=admin_headers)
+    assert int(response.headers["X-Query-Count"]) == counter.count
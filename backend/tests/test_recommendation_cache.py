@@ -0,0 +1,124 @@
+"""
+Cachés de recomendaciones: una petición repetida se sirve desde la caché y
+cualquier cambio confirmado en los proyectos o en los freelancers la invalida.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from app.crud.user import get_user, update_user
+from app.database import SessionLocal
+from app.ml.cache import project_ranking_cache, recommendation_cache
+from app.ml.features import FEATURE_COLUMNS
+from app.ml.registry import model_registry
+from app.ml.training.train_model import publish_model
+from app.schemas.user import UserUpdate
+
+
+@pytest.fixture(scope="module")
+def serving_model(client, tmp_path_factory):
+    """Publica un modelo pequeño y lo sirve desde el registro durante las pruebas del módulo."""
+    rng = np.random.default_rng(3)
+    X = pd.DataFrame(rng.random((300, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+    y = (X["skill_match_pct"] + 0.5 * X["area_match"] > 0.7).astype(int)
+    model = RandomForestClassifier(n_estimators=5, random_state=3).fit(X, y)
+
+    directory = tmp_path_factory.mktemp("modelo")
+    previous = (model_registry.model_path, model_registry.compiled_dir, model_registry._current)
+    model_registry.model_path = str(directory / "trained_model.pkl")
+    model_registry.compiled_dir = str(directory / "compiled")
+    publish_model(model, model_registry.model_path, model_registry.compiled_dir)
+    model_registry.reload()
+    yield
+    model_registry.model_path, model_registry.compiled_dir, model_registry._current = previous
+
+
+@pytest.fixture(scope="module")
+def marketplace(client, make_user, serving_model):
+    client_id, client_headers = make_user("cache_cliente", is_client=True)
+    freelancer_id, freelancer_headers = make_user(
+        "cache_freelancer", is_freelancer=True, area_expertise="Caché", skills=["CacheSkill"]
+    )
+    purchase = client.post("/api/v1/transactions/purchase-credits", headers=client_headers,
+                           json={"amount": 10000.0, "description": "fondos"})
+    assert purchase.status_code == 200, purchase.text
+    return client_headers, freelancer_id, freelancer_headers
+
+
+def create_project(client, headers, title):
+    response = client.post("/api/v1/projects/", headers=headers, json={
+        "title": title, "description": title, "budget": 500.0, "area": "Caché", "skills_required": ["CacheSkill"],
+    })
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def misses_after(client, url, headers, cache):
+    """Hace la petición y devuelve (respuesta, fallos de la caché que provocó)."""
+    misses = cache.stats()["misses"]
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json(), cache.stats()["misses"] - misses
+
+
+def test_freelancer_recommendations_follow_project_and_freelancer_changes(client, make_user, marketplace):
+    client_headers, freelancer_id, _ = marketplace
+    project_id = create_project(client, client_headers, "Proyecto caché")
+    url = f"/api/v1/projects/recommendations/{project_id}"
+
+    first, misses = misses_after(client, url, client_headers, recommendation_cache)
+    assert misses >= 1
+    assert freelancer_id in [user["id"] for user in first]
+    again, misses = misses_after(client, url, client_headers, recommendation_cache)
+    assert misses == 0
+    assert again == first
+
+    # Editar el proyecto
+    response = client.put(f"/api/v1/projects/{project_id}", headers=client_headers, json={"budget": 900.0})
+    assert response.status_code == 200, response.text
+    _, misses = misses_after(client, url, client_headers, recommendation_cache)
+    assert misses >= 1
+
+    # Un freelancer nuevo
+    new_id, _ = make_user("cache_nuevo", is_freelancer=True, area_expertise="Caché", skills=["CacheSkill"])
+    after_new, misses = misses_after(client, url, client_headers, recommendation_cache)
+    assert misses >= 1
+
+    # Un freelancer que deja de serlo desaparece de las recomendaciones
+    db = SessionLocal()
+    try:
+        update_user(db, db_user=get_user(db, new_id), user_in=UserUpdate(
+            email="cache_nuevo@example.com", username="cache_nuevo", is_freelancer=False
+        ))
+    finally:
+        db.close()
+    after_update, misses = misses_after(client, url, client_headers, recommendation_cache)
+    assert misses >= 1
+    assert new_id not in [user["id"] for user in after_update]
+
+    # Asignar el proyecto también cambia el conjunto de proyectos abiertos
+    response = client.post(f"/api/v1/projects/{project_id}/assign/{freelancer_id}", headers=client_headers)
+    assert response.status_code == 200, response.text
+    _, misses = misses_after(client, url, client_headers, recommendation_cache)
+    assert misses >= 1
+
+
+def test_project_ranking_follows_open_projects(client, marketplace):
+    client_headers, _, freelancer_headers = marketplace
+    url = "/api/v1/projects/recommended?limit=100"
+
+    project_id = create_project(client, client_headers, "Proyecto ranking")
+    page, misses = misses_after(client, url, freelancer_headers, project_ranking_cache)
+    assert misses >= 1
+    assert project_id in [item["id"] for item in page["items"]]
+    again, misses = misses_after(client, url, freelancer_headers, project_ranking_cache)
+    assert misses == 0
+    assert again["items"] == page["items"]
+
+    # Borrar el proyecto invalida el ranking: no vuelve a aparecer
+    response = client.delete(f"/api/v1/projects/{project_id}", headers=client_headers)
+    assert response.status_code == 200, response.text
+    page, misses = misses_after(client, url, freelancer_headers, project_ranking_cache)
+    assert misses >= 1
+    assert project_id not in [item["id"] for item in page["items"]]
@@ -0,0 +1,121 @@
+"""
+Puntuación por lotes del recomendador y bosque compilado: deben dar los
+mismos resultados que evaluar cada par por separado y que scikit-learn.
+"""
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from app.ml.features import FEATURE_COLUMNS, pair_features
+from app.ml.forest import CompiledForest, export_forest
+from app.ml.recommender import FreelancerRecommender
+
+SKILLS = ["Python", "SQL", "R", "Stata", "Excel", "Redacción", "Encuestas", "GIS"]
+AREAS = ["Economía", "Sociología", "Educación", None]
+
+
+def random_freelancer(rng, user_id):
+    return {
+        "id": user_id,
+        "skills": rng.sample(SKILLS, rng.randint(0, 4)),
+        "experience_years": rng.choice([None, rng.randint(0, 20)]),
+        "hourly_rate": rng.choice([None, round(rng.uniform(5, 80), 1)]),
+        "rating": rng.choice([0.0, 3.0, 4.5, 5.0]),
+        "area_expertise": rng.choice(AREAS),
+    }
+
+
+def random_project(rng, project_id):
+    return {
+        "id": project_id,
+        "skills_required": rng.sample(SKILLS, rng.randint(0, 4)),
+        "budget": rng.choice([None, rng.randint(100, 5000)]),
+        "area": rng.choice(AREAS),
+    }
+
+
+@pytest.fixture(scope="module")
+def pairs():
+    rng = random.Random(7)
+    return [random_freelancer(rng, i) for i in range(1, 81)], [random_project(rng, i) for i in range(1, 31)]
+
+
+@pytest.fixture(scope="module")
+def model(pairs):
+    freelancers, projects = pairs
+    X = pd.concat([pair_features(freelancers, [project]) for project in projects], ignore_index=True)
+    # Etiqueta que depende de varias columnas, con ruido, para que los árboles tengan cortes en todas
+    noise = np.random.default_rng(7).random(len(X))
+    y = ((X["skill_match_pct"] + 0.3 * X["area_match"] + 0.2 * noise) > 0.6).astype(int)
+    return RandomForestClassifier(n_estimators=15, max_depth=6, random_state=7).fit(X, y)
+
+
+@pytest.fixture(scope="module")
+def single_scores(pairs, model):
+    """Probabilidades evaluando cada par por separado: por proyecto (los primeros) y para el primer freelancer."""
+    freelancers, projects = pairs
+    recommender = FreelancerRecommender(model=model)
+    by_project = {
+        project["id"]: [recommender.predict_match(freelancer, project) for freelancer in freelancers]
+        for project in projects[:4]
+    }
+    for_freelancer = [recommender.predict_match(freelancers[0], project) for project in projects]
+    return by_project, for_freelancer
+
+
+def test_batch_scores_match_per_pair(pairs, model, single_scores):
+    freelancers, projects = pairs
+    by_project, for_freelancer = single_scores
+    recommender = FreelancerRecommender(model=model)
+    for project in projects[:4]:
+        np.testing.assert_array_equal(recommender.predict_matches(freelancers, [project]), by_project[project["id"]])
+    np.testing.assert_array_equal(recommender.predict_matches([freelancers[0]], projects), for_freelancer)
+
+
+@pytest.mark.parametrize("top_n", [1, 5, 50, 500])
+def test_batch_ranking_matches_per_pair_ranking(pairs, model, single_scores, top_n):
+    freelancers, projects = pairs
+    by_project, for_freelancer = single_scores
+    recommender = FreelancerRecommender(model=model)
+    for project in projects[:4]:
+        scores = by_project[project["id"]]
+        # Orden descendente estable: ante empates, el que aparece primero
+        expected = sorted(range(len(freelancers)), key=lambda i: -scores[i])[:top_n]
+
+        ranked = recommender.recommend_freelancers(project, freelancers, top_n=top_n)
+        assert [rec["freelancer"]["id"] for rec in ranked] == [freelancers[i]["id"] for i in expected]
+        assert [rec["match_probability"] for rec in ranked] == [scores[i] for i in expected]
+
+        chunks = [freelancers[start:start + 17] for start in range(0, len(freelancers), 17)]
+        streamed = recommender.recommend_freelancers_streaming(project, iter(chunks), top_n=top_n)
+        assert streamed == ranked
+
+    expected = sorted(range(len(projects)), key=lambda i: -for_freelancer[i])[:top_n]
+    ranked = recommender.recommend_projects(freelancers[0], projects, top_n=top_n)
+    assert [rec["project"]["id"] for rec in ranked] == [projects[i]["id"] for i in expected]
+
+
+def test_compiled_forest_matches_sklearn(model, tmp_path):
+    export_forest(model, str(tmp_path), version="prueba")
+    forest = CompiledForest.load(str(tmp_path))
+    assert forest.version == "prueba"
+
+    rng = np.random.default_rng(7)
+    X = pd.DataFrame(rng.uniform(0, 10, (500, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+    # Valores justo en los umbrales de corte, donde importa el <= de scikit-learn
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        for node in np.flatnonzero(tree.children_left != -1)[:5]:
+            row = X.iloc[len(X) - 1].copy()
+            row.iloc[tree.feature[node]] = tree.threshold[node]
+            X.loc[len(X)] = row
+    # Columnas en otro orden: se reordenan por nombre como en scikit-learn
+    shuffled = X[list(reversed(FEATURE_COLUMNS))]
+
+    expected = model.predict_proba(X)
+    np.testing.assert_allclose(forest.predict_proba(shuffled), expected, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(forest.predict_proba(X, chunk_size=64), expected, rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(forest.predict(X), model.predict(X))
@@ -0,0 +1,59 @@
+"""
+Registro del modelo: elige entre el modelo compilado y el pickle según cuál
+sea más reciente, y recarga al cambiar los archivos.
+"""
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from app.ml.features import FEATURE_COLUMNS
+from app.ml.registry import ModelRegistry
+from app.ml.training.train_model import publish_model
+
+
+def train(seed):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.random((200, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+    y = (X[FEATURE_COLUMNS[seed % len(FEATURE_COLUMNS)]] > 0.5).astype(int)
+    return RandomForestClassifier(n_estimators=5, random_state=seed).fit(X, y)
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / "trained_model.pkl"), str(tmp_path / "compiled")
+
+
+def test_published_model_is_served_compiled(paths):
+    model_path, compiled_dir = paths
+    version = publish_model(train(0), model_path, compiled_dir)
+
+    loaded = ModelRegistry(model_path, compiled_dir, check_interval=0).get()
+    assert loaded.source == "compiled"
+    assert loaded.version == version
+
+
+def test_newer_pickle_wins_over_stale_compiled_model(paths):
+    model_path, compiled_dir = paths
+    old_version = publish_model(train(0), model_path, compiled_dir)
+    registry = ModelRegistry(model_path, compiled_dir, check_interval=0)
+    assert registry.get().version == old_version
+
+    # Reentrenado y guardado solo como pickle: el compilado queda desactualizado
+    with open(model_path, "wb") as f:
+        pickle.dump(train(1), f)
+    manifest_mtime = os.stat(os.path.join(compiled_dir, "manifest.json")).st_mtime
+    os.utime(model_path, (manifest_mtime + 10, manifest_mtime + 10))
+
+    loaded = registry.get()
+    assert loaded.source == "pickle"
+    assert loaded.version != old_version
+
+    # Al volver a publicar, se sirve otra vez el compilado con la versión nueva
+    new_version = publish_model(train(2), model_path, compiled_dir)
+    loaded = registry.get()
+    assert loaded.source == "compiled"
+    assert loaded.version == new_version
@@ -0,0 +1,131 @@
+"""
+Sincronización del recomendador con la base: el índice de candidatos, el
+almacén de características y las generaciones de las cachés cambian solo
+cuando se confirma una transacción que toca lo que usa el recomendador.
+"""
+import pytest
+
+from app.crud.project import assign_project
+from app.crud.user import create_user
+from app.database import SessionLocal
+from app.ml.cache import freelancer_pool_generation, open_projects_generation
+from app.ml.candidates import freelancer_index
+from app.ml.feature_store import freelancer_features
+from app.models.models import Project, ProjectStatus, Skill, User
+from app.schemas.user import UserCreate
+
+
+@pytest.fixture
+def db(client, decoy):
+    session = SessionLocal()
+    freelancer_index.ensure_loaded(session)
+    freelancer_features.ensure_loaded(session)
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="module")
+def decoy(client):
+    # Freelancer con id menor que los de las pruebas: es el primero del relleno de candidatos
+    session = SessionLocal()
+    try:
+        yield new_freelancer(session, "sync_relleno", []).id
+    finally:
+        session.close()
+
+
+def new_freelancer(db, username, skills):
+    return create_user(db, user=UserCreate(
+        email=f"{username}@example.com", username=username, password="secreta123",
+        is_freelancer=True, area_expertise="Sync", experience_years=3, skills=skills,
+    ))
+
+
+def indexed(user_id, skill_id):
+    # Con una habilidad propia del usuario, es el primer candidato solo si la tiene indexada
+    return freelancer_index.candidates([skill_id], None, limit=1) == [user_id]
+
+
+def stored(user_id):
+    ids, _ = freelancer_features.pair_features({"skills_required": [], "area": "Sync"}, user_ids=[user_id])
+    return user_id in ids
+
+
+def test_new_freelancer_is_indexed_on_commit(db):
+    generation = freelancer_pool_generation.value
+    user = new_freelancer(db, "sync_nuevo", ["SyncSkillA"])
+    skill = db.query(Skill).filter(Skill.name == "SyncSkillA").one()
+
+    assert freelancer_pool_generation.value > generation
+    assert indexed(user.id, skill.id)
+    assert stored(user.id)
+
+
+def test_skill_change_waits_for_commit(db):
+    user = new_freelancer(db, "sync_habilidades", ["SyncSkillB"])
+    skill = Skill(name="SyncSkillC")
+    db.add(skill)
+    db.commit()
+
+    generation = freelancer_pool_generation.value
+    user.skills.append(skill)
+    db.flush()
+    assert not indexed(user.id, skill.id)
+    assert freelancer_pool_generation.value == generation
+
+    db.commit()
+    assert indexed(user.id, skill.id)
+    assert freelancer_pool_generation.value > generation
+
+
+def test_rollback_discards_changes(db):
+    user = new_freelancer(db, "sync_rollback", ["SyncSkillD"])
+    skill = db.query(Skill).filter(Skill.name == "SyncSkillD").one()
+
+    generation = freelancer_pool_generation.value
+    user.is_freelancer = False
+    db.flush()
+    db.rollback()
+    assert freelancer_pool_generation.value == generation
+    assert indexed(user.id, skill.id)
+
+    # Dejar de ser freelancer, confirmado, lo saca del índice y de las características
+    user.is_freelancer = False
+    db.commit()
+    assert not indexed(user.id, skill.id)
+    assert not stored(user.id)
+
+
+def test_unrelated_user_changes_keep_the_caches(db):
+    user = new_freelancer(db, "sync_saldo", ["SyncSkillE"])
+    generation = freelancer_pool_generation.value
+    user.credits_balance = 100.0
+    db.commit()
+    assert freelancer_pool_generation.value == generation
+
+
+def test_project_status_changes_bump_open_projects(db):
+    admin = db.query(User).filter(User.username == "admin").one()
+    freelancer = new_freelancer(db, "sync_asignado", ["SyncSkillF"])
+    project = Project(title="Sync", description="Sync", client_id=admin.id, budget=100.0,
+                      area="Sync", status=ProjectStatus.OPEN.value)
+    generation = open_projects_generation.value
+    db.add(project)
+    db.commit()
+    assert open_projects_generation.value == generation + 1
+
+    assign_project(db, project_id=project.id, freelancer_id=freelancer.id)
+    assert open_projects_generation.value == generation + 2
+
+    project.status = ProjectStatus.COMPLETED.value
+    db.commit()
+    assert open_projects_generation.value == generation + 3
+
+    # Campos que no usa el ranking no invalidan
+    project.is_paid = True
+    db.commit()
+    assert open_projects_generation.value == generation + 3
+
+    db.delete(project)
+    db.commit()
+    assert open_projects_generation.value == generation + 4